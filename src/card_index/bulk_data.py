@@ -0,0 +1,120 @@
+import codecs
+import json
+import re
+import unicodedata
+
+from config.constants import SCRYFALL_BULK_DATA_URL, BULK_DATA_CHUNK_SIZE
+from network import http_client
+
+# Card fields kept in the offline index. Everything the app reads from a Scryfall card is in here.
+CARD_FIELDS = (
+    "id", "oracle_id", "name", "layout", "mana_cost", "cmc", "type_line", "oracle_text", "power", "toughness",
+    "colors", "color_identity", "keywords", "edhrec_rank", "image_uris", "related_uris", "card_faces",
+)
+FACE_FIELDS = ("name", "mana_cost", "type_line", "oracle_text", "colors", "power", "toughness", "image_uris")
+
+# Layouts of objects that can never be a commander.
+_EXCLUDED_LAYOUTS = {"token", "double_faced_token", "emblem", "art_series", "vanguard", "planar", "scheme"}
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+
+
+def fetch_bulk_metadata():
+    """Returns Scryfall's description of the current oracle cards bulk file (download_uri, updated_at, size)."""
+    response = http_client.get(SCRYFALL_BULK_DATA_URL, use_cache=False)
+    response.raise_for_status()
+    return response.json()
+
+
+def stream_bulk_cards(download_uri):
+    """Downloads a bulk file and yields its cards one by one without loading the whole file."""
+    response = http_client.get(download_uri, use_cache=False, stream=True)
+    try:
+        response.raise_for_status()
+        yield from iter_json_array(response.iter_content(chunk_size=BULK_DATA_CHUNK_SIZE))
+    finally:
+        response.close()
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally decodes a top-level JSON array from an iterable of byte chunks
+    and yields its elements. Only one element (plus one chunk) is held in memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer, pos = "", 0
+    chunks = iter(chunks)
+    started = False
+    exhausted = False
+
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer):
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("Bulk data is not a JSON array")
+                started = True
+                pos += 1
+                continue
+            if char == "]":
+                return
+            if char == ",":
+                pos += 1
+                continue
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if exhausted:
+                    raise
+                # The element continues in the next chunk
+            else:
+                pos = end
+                yield value
+                continue
+        elif exhausted:
+            raise ValueError("Bulk data ended unexpectedly")
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            exhausted = True
+            buffer = buffer[pos:] + decoder.decode(b"", final=True)
+        else:
+            buffer = buffer[pos:] + decoder.decode(chunk)
+        pos = 0
+
+
+def _faces(card):
+    return card.get("card_faces") or [card]
+
+
+def is_commander_candidate(card):
+    """
+    Approximates Scryfall's `is:commander game:paper`: legendary creatures and
+    backgrounds, plus cards whose text says they can be your commander.
+    """
+    if card.get("layout") in _EXCLUDED_LAYOUTS or "paper" not in card.get("games", ["paper"]):
+        return False
+    if card.get("legalities", {}).get("commander") == "not_legal":
+        return False
+    front_type = (_faces(card)[0].get("type_line") or card.get("type_line") or "").split(" // ")[0]
+    if "Legendary" in front_type and ("Creature" in front_type or "Background" in front_type):
+        return True
+    return any("can be your commander" in (face.get("oracle_text") or "") for face in _faces(card))
+
+
+def compact_card(card):
+    """Returns the subset of a Scryfall card that is stored in the index."""
+    compact = {field: card[field] for field in CARD_FIELDS if field in card}
+    if "card_faces" in compact:
+        compact["card_faces"] = [
+            {field: face[field] for field in FACE_FIELDS if field in face} for face in card["card_faces"]
+        ]
+    return compact
+
+
+def normalize_text(text):
+    """Lower-cases text and strips accents and punctuation, the way Scryfall compares names."""
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+    return re.sub(r"[^a-z0-9+/\s-]", "", text)
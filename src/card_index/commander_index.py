@@ -0,0 +1,201 @@
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+from card_index.bulk_data import (
+    compact_card, fetch_bulk_metadata, is_commander_candidate, normalize_text, stream_bulk_cards
+)
+from card_index.query import QueryEngine, UnsupportedQuery
+from config.constants import COMMANDER_INDEX_FILE_NAME, COMMANDER_INDEX_REFRESH_INTERVAL
+from utils.file_helpers import user_cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS commanders (
+    oracle_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    search_name TEXT NOT NULL,
+    oracle_text TEXT NOT NULL,
+    edhrec_rank INTEGER,
+    card TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS commanders_edhrec_rank ON commanders (edhrec_rank);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Cards without an EDHRec rank are listed after all ranked ones, like Scryfall's order=edhrec.
+_ORDER_BY = "ORDER BY edhrec_rank IS NULL, edhrec_rank, name"
+
+
+class CommanderIndex:
+    """
+    Offline index of every card that can be a commander in paper, built from
+    Scryfall's oracle cards bulk file and stored in SQLite.
+
+    Cards are stored in the compact form of bulk_data.compact_card together with
+    their EDHRec rank, so searches are ordered like Scryfall's order=edhrec.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), COMMANDER_INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._engine = None  # QueryEngine over all cards, built on the first query
+
+    # --- Building --- #
+
+    def _meta(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    @property
+    def is_built(self):
+        return self._meta("bulk_updated_at") is not None
+
+    @property
+    def bulk_updated_at(self):
+        return self._meta("bulk_updated_at")
+
+    def needs_refresh_check(self):
+        """True if the index was never built or Scryfall was last asked for a new bulk file a while ago."""
+        checked_at = self._meta("checked_at")
+        return checked_at is None or time.time() - float(checked_at) > COMMANDER_INDEX_REFRESH_INTERVAL
+
+    def refresh(self, progress=None, force=False):
+        """
+        Downloads the current bulk file if Scryfall released a new one since the
+        index was built. Unchanged cards are left alone; changed ones are replaced
+        and cards that disappeared are removed. Returns True if the bulk file was read.
+        """
+        progress = progress or (lambda message: None)
+        progress("Checking for new Scryfall card data...")
+        metadata = fetch_bulk_metadata()
+        updated_at = metadata.get("updated_at")
+        if not force and updated_at and updated_at == self.bulk_updated_at:
+            with self._lock:
+                self._set_meta("checked_at", time.time())
+                self._db.commit()
+            return False
+
+        progress("Downloading Scryfall card data for the offline index...")
+        self._store_cards(stream_bulk_cards(metadata["download_uri"]), progress)
+        with self._lock:
+            self._set_meta("bulk_updated_at", updated_at or time.time())
+            self._set_meta("checked_at", time.time())
+            self._db.commit()
+        return True
+
+    def _store_cards(self, cards, progress):
+        """Upserts the commanders among `cards` in one transaction and drops the ones no longer listed."""
+        with self._lock:
+            existing = dict(self._db.execute("SELECT oracle_id, card FROM commanders"))
+        seen = set()
+        rows = []
+        for card in cards:
+            if not is_commander_candidate(card):
+                continue
+            compact = compact_card(card)
+            key = compact.get("oracle_id") or compact.get("id")
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            encoded = json.dumps(compact, separators=(",", ":"), sort_keys=True)
+            if existing.get(key) != encoded:
+                rows.append(self._row(key, compact, encoded))
+            if len(seen) % 500 == 0:
+                progress(f"Indexing commanders... ({len(seen)})")
+
+        removed = [(key,) for key in existing if key not in seen]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO commanders VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._db.executemany("DELETE FROM commanders WHERE oracle_id = ?", removed)
+            self._db.commit()
+            self._engine = None
+
+    @staticmethod
+    def _row(key, card, encoded):
+        faces = card.get("card_faces") or [card]
+        oracle_text = "\n".join(face.get("oracle_text") or "" for face in faces)
+        return (key, card["name"], normalize_text(card["name"]), oracle_text.lower(), card.get("edhrec_rank"), encoded)
+
+    # --- Searching --- #
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM commanders").fetchone()[0]
+
+    def names(self):
+        """Returns the names of all indexed commanders, best EDHRec rank first."""
+        with self._lock:
+            return [row[0] for row in self._db.execute(f"SELECT name FROM commanders {_ORDER_BY}")]
+
+    def card_by_name(self, name):
+        """Returns the commander with exactly this name (case-insensitive), or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT card FROM commanders WHERE name = ? COLLATE NOCASE OR name LIKE ? COLLATE NOCASE LIMIT 1",
+                (name, f"{name} // %")
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query_engine(self):
+        """Returns the QueryEngine over all indexed cards, loading them on first use."""
+        engine = self._engine
+        if engine is None:
+            with self._lock:
+                rows = self._db.execute(f"SELECT card FROM commanders {_ORDER_BY}").fetchall()
+            cards = [json.loads(row[0]) for row in rows]
+            engine = self._engine = QueryEngine(cards)
+        return engine
+
+    def query(self, query):
+        """
+        Returns all commanders matching a query in the supported subset of Scryfall's
+        syntax (see card_index.query), best EDHRec rank first. Raises UnsupportedQuery otherwise.
+        """
+        return self.query_engine().search(query)
+
+    def lookup(self, query, random_card=False):
+        """
+        Answers a query from the search bar with the best (or a random) match, or
+        None. Raises UnsupportedQuery if the query has to go to the Scryfall API.
+        """
+        cards = self.query(query)
+        if not cards:
+            return None
+        return random.choice(cards) if random_card else cards[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_commander_index():
+    """Returns the process-wide commander index, opening it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = CommanderIndex()
+    return _index
+
+
+def close_commander_index():
+    global _index
+    with _index_lock:
+        if _index is not None:
+            _index.close()
+            _index = None
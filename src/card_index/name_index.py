@@ -0,0 +1,93 @@
+import bisect
+import heapq
+import json
+import os
+import threading
+
+from card_index.bulk_data import normalize_text
+from config.constants import AUTOCOMPLETE_MAX_SUGGESTIONS, COMMANDER_NAMES_FILE_NAME
+from utils.file_helpers import user_cache_dir
+
+
+def _name_key(text):
+    return " ".join(normalize_text(text).split())
+
+
+class CommanderNameIndex:
+    """
+    Completes commander names from a sorted array of name keys, so a prefix is
+    found with two binary searches instead of a scan over all names.
+
+    Every name is listed once per word it contains, starting at that word, so
+    "mob b" completes "Krenko, Mob Boss" just like "kren" does. Names that
+    start with the typed text come first, then best EDHRec rank first.
+    """
+    def __init__(self, names, keys=None, positions=None):
+        self.names = list(names)  # best EDHRec rank first
+        if keys is None or positions is None:
+            entries = []
+            for position, name in enumerate(self.names):
+                words = _name_key(name).split()
+                for start in range(len(words)):
+                    # Matches at the start of the name are stored with a negative position
+                    entries.append((" ".join(words[start:]), position if start else -position - 1))
+            entries.sort()
+            keys = [key for key, _ in entries]
+            positions = [position for _, position in entries]
+        self._keys = keys
+        self._positions = positions
+
+    def __len__(self):
+        return len(self.names)
+
+    def complete(self, text, limit=AUTOCOMPLETE_MAX_SUGGESTIONS):
+        """Returns up to `limit` names containing a word that starts with the (normalized) text."""
+        prefix = _name_key(text)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\x7f", start)
+        best = {}
+        for position in self._positions[start:end]:
+            rank = (False, -position - 1) if position < 0 else (True, position)
+            if best.get(rank[1], rank) >= rank:
+                best[rank[1]] = rank
+        return [self.names[position] for _, position in heapq.nsmallest(limit, best.values())]
+
+    # --- Persistence --- #
+
+    def save(self, path, bulk_updated_at):
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"bulk_updated_at": bulk_updated_at, "names": self.names,
+                       "keys": self._keys, "positions": self._positions}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, bulk_updated_at):
+        """Returns the index saved at `path` if it was built from the same bulk file, else None."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["bulk_updated_at"] != bulk_updated_at:
+                return None
+            return cls(data["names"], data["keys"], data["positions"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def load_name_index(commander_index, path=None):
+    """
+    Returns the name index of a built commander index. It is read from disk if it
+    was saved for the same Scryfall bulk file, otherwise it is rebuilt and saved.
+    """
+    path = path or os.path.join(user_cache_dir(), COMMANDER_NAMES_FILE_NAME)
+    bulk_updated_at = commander_index.bulk_updated_at
+    name_index = CommanderNameIndex.load(path, bulk_updated_at)
+    if name_index is None:
+        name_index = CommanderNameIndex(commander_index.names())
+        try:
+            name_index.save(path, bulk_updated_at)
+        except OSError as e:
+            print(f"Could not save commander name index: {e}")
+    return name_index
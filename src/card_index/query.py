@@ -0,0 +1,314 @@
+import operator
+import re
+
+from card_index.bulk_data import normalize_text
+
+
+class UnsupportedQuery(Exception):
+    """Raised for queries the offline index cannot answer. They have to go to the Scryfall API."""
+
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<lparen>\()
+      | (?P<rparen>\))
+      | (?P<negate>-)(?=[^\s)])
+      | (?P<exact>!"[^"]*"|![^\s()]+)
+      | (?P<key>[A-Za-z]+)(?P<op><=|>=|!=|:|=|<|>)(?P<value>"[^"]*"|[^\s()]+)
+      | (?P<quoted>"[^"]*")
+      | (?P<word>[^\s()"]+)
+    )""", re.VERBOSE)
+
+_TEXT_FIELDS = {"o": "oracle", "oracle": "oracle", "t": "type", "type": "type", "name": "name"}
+_COLOR_FIELDS = {"c": "colors", "color": "colors", "colors": "colors",
+                 "id": "identity", "identity": "identity", "ci": "identity", "commander": "identity"}
+_NUMBER_FIELDS = {"cmc": "cmc", "mv": "cmc", "manavalue": "cmc"}
+# Terms that hold for every card in the index, as it only contains paper commanders.
+_IMPLIED = {("is", "commander"), ("game", "paper")}
+
+_COLOR_BITS = {"w": 1, "u": 2, "b": 4, "r": 8, "g": 16}
+_COLOR_NAMES = {
+    "white": "w", "blue": "u", "black": "b", "red": "r", "green": "g", "colorless": "",
+    "azorius": "wu", "dimir": "ub", "rakdos": "br", "gruul": "rg", "selesnya": "gw",
+    "orzhov": "wb", "izzet": "ur", "golgari": "bg", "boros": "rw", "simic": "gu",
+    "bant": "gwu", "esper": "wub", "grixis": "ubr", "jund": "brg", "naya": "rgw",
+    "abzan": "wbg", "jeskai": "urw", "sultai": "bgu", "mardu": "rwb", "temur": "gur",
+}
+_COMPARISONS = {
+    "=": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+# --- Parsing --- #
+# The syntax tree is made of tuples: ("and", [nodes]), ("or", [nodes]), ("not", node),
+# ("all",) and (field, op, value) leaves for "name", "exact", "oracle", "type",
+# "colors", "identity" and "cmc".
+
+def tokenize(query):
+    tokens, pos = [], 0
+    query = query.strip()
+    while pos < len(query):
+        match = _TOKEN.match(query, pos)
+        if match is None or match.end() == pos:
+            raise UnsupportedQuery(query[pos:])
+        pos = match.end()
+        tokens.append(match)
+    return tokens
+
+
+def parse_query(query):
+    """Parses the supported subset of Scryfall's search syntax. Raises UnsupportedQuery for anything else."""
+    parser = _Parser(tokenize(query))
+    tree = parser.parse_or()
+    if parser.pos != len(parser.tokens):
+        raise UnsupportedQuery("Unbalanced parentheses")
+    return tree
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    @staticmethod
+    def _is_word(token, word):
+        return token is not None and token.group("word") is not None and token.group("word").lower() == word
+
+    def parse_or(self):
+        branches = [self.parse_and()]
+        while self._is_word(self._peek(), "or"):
+            self.pos += 1
+            branches.append(self.parse_and())
+        return branches[0] if len(branches) == 1 else ("or", branches)
+
+    def parse_and(self):
+        terms = []
+        while True:
+            token = self._peek()
+            if token is None or token.group("rparen") or self._is_word(token, "or"):
+                break
+            if self._is_word(token, "and"):
+                self.pos += 1
+                continue
+            terms.append(self.parse_unary())
+        if not terms:
+            raise UnsupportedQuery("Empty expression")
+        return terms[0] if len(terms) == 1 else ("and", terms)
+
+    def parse_unary(self):
+        token = self._peek()
+        if token.group("negate"):
+            self.pos += 1
+            if self._peek() is None:
+                raise UnsupportedQuery("Dangling '-'")
+            return ("not", self.parse_unary())
+        if token.group("lparen"):
+            self.pos += 1
+            tree = self.parse_or()
+            if self._peek() is None or not self._peek().group("rparen"):
+                raise UnsupportedQuery("Unbalanced parentheses")
+            self.pos += 1
+            return tree
+        self.pos += 1
+        return _term(token)
+
+
+def _unquote(value):
+    return value[1:-1] if len(value) >= 2 and value[0] == value[-1] == '"' else value
+
+
+def _text_term(field, value):
+    """
+    Returns a text leaf. Scryfall's regexes (/.../) and "~" (the card's own name)
+    can't be answered by word lookups, and neither can values without any word.
+    """
+    if "~" in value or (len(value) >= 2 and value[0] == value[-1] == "/"):
+        raise UnsupportedQuery(value)
+    if not _words(normalize_text(value) if field == "name" else value.lower()):
+        raise UnsupportedQuery(value)
+    return (field, ":", value)
+
+
+def _term(token):
+    if token.group("word") is not None:
+        return _text_term("name", token.group("word"))
+    if token.group("quoted") is not None:
+        return _text_term("name", _unquote(token.group("quoted")))
+    if token.group("exact") is not None:
+        return ("exact", "=", _unquote(token.group("exact")[1:]))
+
+    key, op, value = token.group("key").lower(), token.group("op"), _unquote(token.group("value"))
+    if (key, value.lower()) in _IMPLIED and op in (":", "="):
+        return ("all",)
+    if key in _TEXT_FIELDS and op in (":", "="):
+        return _text_term(_TEXT_FIELDS[key], value)
+    if key in _COLOR_FIELDS:
+        return (_COLOR_FIELDS[key], op, _color_value(value))
+    if key in _NUMBER_FIELDS:
+        try:
+            return (_NUMBER_FIELDS[key], "=" if op == ":" else op, float(value))
+        except ValueError:
+            raise UnsupportedQuery(token.group()) from None
+    raise UnsupportedQuery(token.group())
+
+
+def _color_value(value):
+    """Returns a color bitmask, or "m" for multicolored."""
+    value = value.lower()
+    if value in ("m", "multicolor", "multicolored"):
+        return "m"
+    letters = _COLOR_NAMES.get(value, value)
+    if letters == "c":
+        letters = ""
+    if any(letter not in _COLOR_BITS for letter in letters):
+        raise UnsupportedQuery(value)
+    mask = 0
+    for letter in letters:
+        mask |= _COLOR_BITS[letter]
+    return mask
+
+
+def color_mask(colors):
+    mask = 0
+    for color in colors or ():
+        mask |= _COLOR_BITS.get(color.lower(), 0)
+    return mask
+
+
+# --- Evaluation --- #
+
+def _words(text):
+    return re.findall(r"[a-z0-9+/'-]+", text)
+
+
+class _TextField:
+    """
+    A text column with an inverted index from word to card rows. A query phrase
+    first narrows the rows to those containing every word (as part of a longer
+    word, too), then the phrase itself is checked on the remaining candidates.
+    """
+    def __init__(self, texts):
+        self.texts = texts
+        self.postings = {}
+        for row, text in enumerate(texts):
+            for word in set(_words(text)):
+                self.postings.setdefault(word, set()).add(row)
+        self._fragment_rows = {}
+
+    def _rows_with_fragment(self, fragment):
+        rows = self._fragment_rows.get(fragment)
+        if rows is None:
+            rows = set()
+            for word, postings in self.postings.items():
+                if fragment in word:
+                    rows |= postings
+            self._fragment_rows[fragment] = rows
+        return rows
+
+    def match(self, phrase):
+        words = _words(phrase)
+        if not words:
+            raise UnsupportedQuery(phrase)  # would match every card
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):
+            rows = self._rows_with_fragment(word)
+            candidates = rows if candidates is None else candidates & rows
+            if not candidates:
+                return set()
+        if len(words) == 1 and words[0] == phrase:
+            return set(candidates)
+        return {row for row in candidates if phrase in self.texts[row]}
+
+
+class QueryEngine:
+    """
+    Evaluates parsed queries against a list of cards (best EDHRec rank first)
+    using per-field inverted indexes. Results keep the order of the card list.
+    """
+    def __init__(self, cards):
+        self.cards = cards
+        self.all_rows = frozenset(range(len(cards)))
+        self.fields = {
+            "name": _TextField([normalize_text(card.get("name", "")) for card in cards]),
+            "oracle": _TextField([self._faces_text(card, "oracle_text").lower() for card in cards]),
+            "type": _TextField([self._faces_text(card, "type_line").lower() for card in cards]),
+        }
+        self.exact_names = {}
+        for row, card in enumerate(cards):
+            for name in {card.get("name", ""), card.get("name", "").split(" // ")[0]}:
+                self.exact_names.setdefault(normalize_text(name), set()).add(row)
+        self.colors = [color_mask(card.get("colors") or self._face_colors(card)) for card in cards]
+        self.identities = [color_mask(card.get("color_identity")) for card in cards]
+        self.cmcs = [card.get("cmc", 0.0) for card in cards]
+
+    @staticmethod
+    def _faces_text(card, field):
+        faces = card.get("card_faces") or [card]
+        return "\n".join(face.get(field) or "" for face in faces) or card.get(field) or ""
+
+    @staticmethod
+    def _face_colors(card):
+        colors = []
+        for face in card.get("card_faces") or ():
+            colors.extend(face.get("colors") or ())
+        return colors
+
+    def search(self, query):
+        """Returns the cards matching a query string in index order."""
+        rows = self.evaluate(parse_query(query)) if query.strip() else self.all_rows
+        return [self.cards[row] for row in sorted(rows)]
+
+    def evaluate(self, node):
+        kind = node[0]
+        if kind == "all":
+            return self.all_rows
+        if kind == "and":
+            rows = self.all_rows
+            for child in node[1]:
+                rows = rows & self.evaluate(child)
+                if not rows:
+                    break
+            return rows
+        if kind == "or":
+            rows = set()
+            for child in node[1]:
+                rows |= self.evaluate(child)
+            return rows
+        if kind == "not":
+            return self.all_rows - self.evaluate(node[1])
+
+        field, op, value = node
+        if field == "exact":
+            return self.exact_names.get(normalize_text(value), set())
+        if field == "name":
+            return self.fields["name"].match(normalize_text(value))
+        if field in ("oracle", "type"):
+            return self.fields[field].match(value.lower())
+        if field == "cmc":
+            compare = _COMPARISONS[op]
+            return {row for row, cmc in enumerate(self.cmcs) if compare(cmc, value)}
+        return self._match_colors(self.colors if field == "colors" else self.identities, field, op, value)
+
+    @staticmethod
+    def _match_colors(masks, field, op, value):
+        if value == "m":
+            return {row for row, mask in enumerate(masks) if bin(mask).count("1") >= 2}
+        if op == ":":
+            # c:rg means "at least red and green", id:rg "playable in a red-green deck".
+            op = "<=" if field == "identity" else ">="
+            if value == 0 and field == "colors":
+                op = "="
+        if op == "=":
+            return {row for row, mask in enumerate(masks) if mask == value}
+        if op == "!=":
+            return {row for row, mask in enumerate(masks) if mask != value}
+        if op == ">=":
+            return {row for row, mask in enumerate(masks) if mask & value == value}
+        if op == ">":
+            return {row for row, mask in enumerate(masks) if mask & value == value and mask != value}
+        if op == "<=":
+            return {row for row, mask in enumerate(masks) if mask | value == value}
+        return {row for row, mask in enumerate(masks) if mask | value == value and mask != value}
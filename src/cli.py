@@ -0,0 +1,110 @@
+import argparse
+import sys
+
+from config.constants import BATCH_MAX_WORKERS, DECK_EXPORT_FORMATS, DECK_SORT_ORDERS
+from card_index.commander_index import close_commander_index, get_commander_index
+from core.batch import read_batch_file, run_batch, write_deck_files, write_jsonl
+from network import http_client
+from scraping.driver_pool import shutdown_driver_pool
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="qtcommanderfinder batch",
+        description="Finds and scrapes EDHRec decklists for every commander in a file, without the GUI."
+    )
+    parser.add_argument("file", help='commanders, one per line: "query [| budget [| tags [| salt]]]"; "-" reads stdin')
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("-o", "--out-dir", help="write each decklist to a text file in this directory")
+    output.add_argument("-j", "--jsonl", help='write one JSON line per commander to this file ("-" for stdout)')
+    parser.add_argument("-f", "--format", choices=list(DECK_EXPORT_FORMATS), default="moxfield",
+                        help="format of the decklist files written to --out-dir (default: moxfield)")
+    parser.add_argument("--budget", default="", help="default budget filter, e.g. <100 or 50-150")
+    parser.add_argument("--tags", default="", help="default tag filter, e.g. tokens, budget")
+    parser.add_argument("--salt", default="", help="default salt score filter, e.g. <30")
+    parser.add_argument("-n", "--count", type=positive_int, default=1, help="decklists per commander (default: 1)")
+    parser.add_argument("--sort", choices=list(DECK_SORT_ORDERS), default="edhrec",
+                        help="which matching decks are taken first (default: edhrec)")
+    parser.add_argument("--partner", action="store_true", help="pair every commander with its most popular partner")
+    parser.add_argument("--offline", action="store_true", help="answer commander searches from the offline card index")
+    parser.add_argument("-w", "--workers", type=positive_int, default=BATCH_MAX_WORKERS,
+                        help=f"commanders processed at the same time (default: {BATCH_MAX_WORKERS})")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only report errors")
+    return parser
+
+
+def _read_jobs(args):
+    if args.file == "-":
+        return read_batch_file(sys.stdin, args.budget, args.tags, args.salt)
+    with open(args.file, "r", encoding="utf-8") as f:
+        return read_batch_file(f, args.budget, args.tags, args.salt)
+
+
+def _offline_index(quiet):
+    """Returns the offline commander index, built or updated first if needed, or None if it is unavailable."""
+    index = get_commander_index()
+    if index.needs_refresh_check():
+        try:
+            index.refresh(progress=None if quiet else lambda message: print(message, file=sys.stderr))
+        except Exception as e:
+            print(f"Could not refresh the offline card index: {e}", file=sys.stderr)
+    if not index.is_built:
+        print("The offline card index is not available, using the Scryfall API.", file=sys.stderr)
+        return None
+    return index
+
+
+def main(argv=None):
+    """Runs a batch from the command line. Returns 0 if a decklist was found for every commander, else 1."""
+    args = build_parser().parse_args(argv)
+    try:
+        jobs = _read_jobs(args)
+    except (OSError, ValueError) as e:
+        print(f"Could not read {args.file}: {e}", file=sys.stderr)
+        return 1
+
+    def progress(job, message):
+        if not args.quiet:
+            print(f"[{job['query']}] {message}", file=sys.stderr)
+
+    stream = None
+    failures = 0
+    try:
+        local_index = _offline_index(args.quiet) if args.offline else None
+        if args.jsonl:
+            stream = sys.stdout if args.jsonl == "-" else open(args.jsonl, "w", encoding="utf-8")
+
+        results = run_batch(jobs, count=args.count, sort_order=args.sort, partner=args.partner,
+                            local_index=local_index, workers=args.workers, progress=progress)
+        for result in results:
+            if "error" in result:
+                print(f"[{result['query']}] Failed: {result['error']}", file=sys.stderr)
+            else:
+                for deck in result["decks"]:
+                    if "error" in deck:
+                        print(f"[{result['query']}] Deck {deck['rank']} failed: {deck['error']}", file=sys.stderr)
+            if "error" in result or not any("decklist" in deck for deck in result["decks"]):
+                failures += 1
+
+            if stream is not None:
+                write_jsonl(result, stream)
+            else:
+                for path in write_deck_files(result, args.out_dir, args.format):
+                    progress(result, f"Wrote {path}")
+    finally:
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+        http_client.close()
+        close_commander_index()
+        shutdown_driver_pool()
+
+    if not args.quiet:
+        print(f"Done: {len(jobs) - failures} of {len(jobs)} commanders have decklists.", file=sys.stderr)
+    return 1 if failures else 0
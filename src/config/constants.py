@@ -1,8 +1,17 @@
+# --- Application --- #
+APP_NAME = "QTCommanderFinder"
+CACHE_DIR_ENV_VAR = "QTCOMMANDERFINDER_CACHE_DIR"
+
+# --- Startup --- #
+# Modules kept out of the startup imports and loaded on a background thread once the window is shown
+WARM_UP_MODULES = (
+    "requests", "bs4", "pyperclip",
+    "selenium.webdriver", "selenium.webdriver.support.ui", "selenium.webdriver.support.expected_conditions",
+    "selenium_stealth",
+)
+WARM_UP_DELAY_MS = 500  # lets the window paint before the imports compete with it for the GIL
+
 # --- File Paths --- #
-COMMANDER_IMG_PATH = "commander.png"
-COMMANDER_FRONT_IMG_PATH = "commander_front.png"
-COMMANDER_BACK_IMG_PATH = "commander_back.png"
-PARTNER_IMG_PATH = "partner.png"
 DEBUG_SCREENSHOT_PATH_TPL = "debug_screenshot_{site}.png"
 DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH = "debug_screenshot_unexpected_error.png"
 
@@ -10,10 +19,16 @@ DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH = "debug_screenshot_unexpected_error.png"
 SCRYFALL_API_BASE_URL = "https://api.scryfall.com"
 SCRYFALL_API_CARD_SEARCH_URL = f"{SCRYFALL_API_BASE_URL}/cards/search"
 SCRYFALL_API_CARD_RANDOM_URL = f"{SCRYFALL_API_BASE_URL}/cards/random"
+SCRYFALL_API_AUTOCOMPLETE_URL = f"{SCRYFALL_API_BASE_URL}/cards/autocomplete"
 SCRYFALL_SYNTAX_GUIDE_URL = "https://scryfall.com/docs/syntax"
+SCRYFALL_BULK_DATA_URL = f"{SCRYFALL_API_BASE_URL}/bulk-data/oracle-cards"
 EDHREC_PARTNERS_URL_TPL = "https://edhrec.com/partners/{slug}"
 EDHREC_DECKS_URL_TPL = "https://edhrec.com/decks/{slug}"
 EDHREC_DECK_PREVIEW_URL_TPL = "https://edhrec.com/deckpreview/{hash}"
+EDHREC_SLUG_MAP_FILE_NAME = "edhrec_slugs.json"  # card id -> EDHRec slug, in the user cache dir
+MOXFIELD_DECK_API_URL_TPL = "https://api2.moxfield.com/v3/decks/all/{public_id}"
+
+SCRYFALL_MIN_REQUEST_INTERVAL = 0.1  # seconds between Scryfall API requests, as Scryfall asks for
 
 # --- Headers --- #
 HTTP_HEADERS = {
@@ -21,6 +36,116 @@ HTTP_HEADERS = {
     "Accept": "application/json;q=0.9,*/*;q=0.8"
 }
 
+# --- HTTP Client --- #
+HTTP_TIMEOUT = 15  # seconds
+HTTP_POOL_CONNECTIONS = 8  # number of hosts to keep a connection pool for
+HTTP_POOL_MAXSIZE = 8  # connections kept alive per host
+
+# --- Image Cache --- #
+IMAGE_CACHE_DIR_NAME = "images"
+IMAGE_CACHE_MAX_PIXMAPS = 32  # decoded card faces kept in memory
+IMAGE_CACHE_MAX_DISK_BYTES = 300 * 1024 * 1024
+
+# --- Card Images --- #
+# Scryfall image_uris keys from smallest to largest with their pixel height.
+SCRYFALL_IMAGE_SIZES = [("small", 204), ("normal", 680), ("large", 936), ("png", 1040)]
+# Show the smallest image that fits first and swap in the full PNG once it has arrived.
+PROGRESSIVE_IMAGE_LOADING = True
+SCALED_PIXMAP_CACHE_SIZE = 16  # smoothly scaled pixmaps kept per (image, height)
+RESIZE_SETTLE_MS = 150  # the smooth scaling pass runs once resizing paused this long
+
+# --- HTTP Cache --- #
+HTTP_CACHE_DIR_NAME = "http"
+HTTP_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# Seconds a response stays fresh, matched by longest URL prefix. Stale entries are
+# revalidated with ETag/Last-Modified. URLs without a prefix here are never cached.
+HTTP_CACHE_TTLS = {
+    SCRYFALL_API_CARD_SEARCH_URL: 24 * 60 * 60,
+    SCRYFALL_API_AUTOCOMPLETE_URL: 24 * 60 * 60,
+    "https://edhrec.com/partners/": 24 * 60 * 60,
+    "https://edhrec.com/decks/": 6 * 60 * 60,
+    "https://edhrec.com/deckpreview/": 7 * 24 * 60 * 60,
+}
+
+# --- Selenium Driver Pool --- #
+DRIVER_POOL_SIZE = 2  # browsers that may run at the same time
+DRIVER_MAX_USES = 20  # scrapes before a browser is replaced by a fresh one
+DRIVER_MAX_JS_HEAP_MB = 512  # browsers whose page heap grew beyond this are replaced
+DRIVER_LEASE_TIMEOUT = 120  # seconds to wait for a free browser
+DRIVER_IDLE_TIMEOUT = 5 * 60  # seconds an unused browser is kept before it is quit to free its memory
+# Start a browser before a scrape needs one. Most decks are read without a browser, so by
+# default only once a site answered with a bot check ("after_bot_check"). Also: "after_search"
+# (once a commander is shown), "idle" (once the app was idle for BROWSER_PREWARM_IDLE_MS) or None.
+BROWSER_PREWARM = "after_bot_check"
+BROWSER_PREWARM_IDLE_MS = 15000
+
+# --- Lean Browser Profile --- #
+# "eager" returns from driver.get() once the DOM is ready instead of after every
+# image and script loaded; the scrapers wait for their elements anyway.
+DRIVER_PAGE_LOAD_STRATEGY = "eager"
+# Requests the scraping browser never sends (Network.setBlockedURLs wildcards).
+# Cloudflare's challenge scripts must stay allowed, or the bot check never passes.
+SCRAPER_BLOCKED_URL_PATTERNS = (
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Ads and analytics
+    "*google-analytics.com*", "*googletagmanager.com*", "*googlesyndication.com*", "*doubleclick.net*",
+    "*adservice.google.com*", "*amazon-adsystem.com*", "*facebook.net*", "*hotjar.com*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*nitropay.com*", "*cloudflareinsights.com*",
+)
+# Blocked patterns a site still needs, by scraper site
+SCRAPER_SITE_ALLOWLISTS = {
+    # The "More" button is an icon; without its svg it has no size and never becomes clickable
+    "moxfield": ("*.svg",),
+    "archidekt": (),
+}
+
+# --- Offline Commander Index --- #
+COMMANDER_INDEX_FILE_NAME = "commanders.sqlite3"  # in the user cache dir
+COMMANDER_INDEX_REFRESH_INTERVAL = 24 * 60 * 60  # seconds between checks for a new Scryfall bulk file
+BULK_DATA_CHUNK_SIZE = 1024 * 1024  # bytes read at a time while streaming the bulk file
+
+# --- Commander Name Completion --- #
+COMMANDER_NAMES_FILE_NAME = "commander_names.json"  # sorted name index, in the user cache dir
+AUTOCOMPLETE_MAX_SUGGESTIONS = 10
+AUTOCOMPLETE_DEBOUNCE_MS = 250  # typing pause before Scryfall is asked, when there is no offline index
+AUTOCOMPLETE_MIN_CHARS = 2  # Scryfall's autocomplete answers nothing for shorter texts
+
+# --- Tag Completion --- #
+TAG_COMPLETION_MAX_SUGGESTIONS = 15
+TAG_FUZZY_MIN_SIMILARITY = 0.5  # share of a misspelled query's trigrams a tag needs to be suggested
+
+# --- Deck Fetching --- #
+BATCH_MAX_WORKERS = 4  # deck pages resolved and scraped at the same time
+BATCH_DEFAULT_DECK_COUNT = 5
+BATCH_MAX_DECK_COUNT = 25
+DECK_TABLE_PREFETCH = True  # fetch the EDHRec deck table in the background as soon as a commander is shown
+
+# --- Deck Ranking --- #
+# Sort orders offered for matching decks, by deck_filter ranking name.
+DECK_SORT_ORDERS = {
+    "edhrec": "EDHRec order",
+    "cheapest": "Cheapest",
+    "lowest_salt": "Lowest salt",
+    "closest_to_ceiling": "Closest to budget",
+    "most_tag_overlap": "Most matching tags",
+    "most_recent": "Most recent",
+}
+
+# --- Decklist Export --- #
+# Formats a decklist is copied or written in, see scraping.decklist.EXPORTERS
+DECK_EXPORT_FORMATS = {
+    "moxfield": "Moxfield text",
+    "mtgo": "MTGO",
+    "arena": "MTG Arena",
+    "csv": "CSV",
+    "json": "JSON",
+}
+DECK_EXPORT_FILE_EXTENSIONS = {"csv": ".csv", "json": ".json"}  # others are written as .txt
+
 # --- EDHRec Tags --- #
 EDHREC_TAGS = [
     "+1/+1 Counters", "Ad Nauseam", "Advisors", "Adventure", "Adventures", "Affinity", "Aggro", "Aikido",
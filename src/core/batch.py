@@ -0,0 +1,100 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config.constants import BATCH_MAX_WORKERS, DECK_EXPORT_FILE_EXTENSIONS
+from core.deck_finder import find_decklists
+from network.slug_resolver import slug_from_name
+from scraping.decklist import export_decklist
+
+# Per-line filter fields of a batch file, after the commander query
+BATCH_FILE_FIELDS = ("budget", "tags", "salt")
+
+
+def read_batch_file(lines, budget="", tags="", salt=""):
+    """
+    Parses a batch file into jobs. Every line holds a commander query (a name or
+    any Scryfall query), optionally followed by its own budget, tags and salt
+    filters separated by "|", e.g. "Krenko, Mob Boss | <50 | tokens | <30".
+    Missing or empty filters fall back to the given defaults. Blank lines and
+    lines starting with "#" are skipped.
+    """
+    defaults = {"budget": budget, "tags": tags, "salt": salt}
+    jobs = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        query, *filters = [field.strip() for field in line.split("|")]
+        if len(filters) > len(BATCH_FILE_FIELDS):
+            raise ValueError(f"Too many fields in batch line: {line}")
+        job = dict(defaults, query=query)
+        for field, value in zip(BATCH_FILE_FIELDS, filters):
+            if value:
+                job[field] = value
+        jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs, count=1, sort_order="edhrec", partner=False, local_index=None, workers=BATCH_MAX_WORKERS,
+              progress=None):
+    """
+    Runs find_decklists for every job on a thread pool and yields the results in
+    the order they finish, each with the job's 1-based position under "job". A
+    commander that failed as a whole yields {"job": ..., "query": ..., "error": ...}
+    instead. `progress` is called with the job and a message, from the worker threads.
+    """
+    def run(number, job):
+        job_progress = (lambda message: progress(job, message)) if progress else None
+        result = find_decklists(
+            job["query"], job["budget"], job["tags"], job["salt"], count=count, sort_order=sort_order,
+            partner=partner, local_index=local_index, progress=job_progress
+        )
+        return dict(result, job=number)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run, number, job): (number, job) for number, job in enumerate(jobs, start=1)}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                number, job = futures[future]
+                yield {"job": number, "query": job["query"], "error": str(e)}
+
+
+def _json_default(value):
+    if hasattr(value, "to_dict"):  # Decklist
+        return value.to_dict()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def write_jsonl(result, stream):
+    """Writes one batch result as a line of JSON. Decklists are written card by card, see Decklist.to_dict."""
+    stream.write(json.dumps(result, ensure_ascii=False, default=_json_default) + "\n")
+    stream.flush()
+
+
+def write_deck_files(result, directory, export_format="moxfield"):
+    """
+    Writes every scraped decklist of a batch result to `<job>-<commander>-<rank>.txt`
+    (or .csv/.json) in a directory, in one of the export formats. Partners are
+    appended to the commander's name; the job number keeps jobs for the same
+    commander apart. Returns the paths.
+    """
+    if "error" in result:
+        return []
+    os.makedirs(directory, exist_ok=True)
+    names = [result["commander"]] + ([result["partner"]] if result.get("partner") else [])
+    prefix = "-".join(slug_from_name(name) for name in names)
+    if result.get("job") is not None:
+        prefix = f"{result['job']}-{prefix}"
+    paths = []
+    for deck in result["decks"]:
+        if "decklist" not in deck:
+            continue
+        extension = DECK_EXPORT_FILE_EXTENSIONS.get(export_format, ".txt")
+        path = os.path.join(directory, f"{prefix}-{deck['rank']}{extension}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(export_decklist(deck["decklist"], export_format).rstrip("\n") + "\n")
+        paths.append(path)
+    return paths
@@ -0,0 +1,231 @@
+import re
+
+from card_index.commander_index import UnsupportedQuery
+from config.constants import (
+    SCRYFALL_API_CARD_SEARCH_URL, SCRYFALL_API_CARD_RANDOM_URL,
+    EDHREC_PARTNERS_URL_TPL, EDHREC_DECKS_URL_TPL, EDHREC_DECK_PREVIEW_URL_TPL
+)
+from network import http_client
+from network.slug_resolver import get_slug_resolver
+from scraping.deck_scraper import scrape_decklist
+from scraping.http_scrapers import ScrapeError
+from utils.deck_filter import DeckTable, find_matching_decks
+from utils.next_data import find_next_data, json_value_at, next_data_value
+
+# Locations of the deck table and the hosted deck link inside EDHRec's __NEXT_DATA__
+EDHREC_DECK_TABLE_PATH = ("props", "pageProps", "data", "table")
+EDHREC_DECK_LINK_PATH = ("props", "pageProps", "data", "url")
+
+# Deck hosting sites the scraper supports
+SUPPORTED_DECK_SITES = ("moxfield.com", "archidekt.com")
+
+
+class SearchError(Exception):
+    """Raised with a message meant for the user, e.g. the status label or the CLI's error output."""
+
+
+def _no_progress(message):
+    pass
+
+
+# --- Scryfall --- #
+
+def build_scryfall_query(text, partner=False):
+    """Restricts a search bar query to paper commanders (with partner, if asked for)."""
+    query = text.strip()
+    if "is:commander" not in query.lower():
+        query += " is:commander"
+    if "game:paper" not in query.lower():
+        query += " game:paper"
+    if partner and "o:partner" not in query.lower():
+        query += " o:partner"
+    return query
+
+
+def lookup_local_commander(local_index, query, random_card=False):
+    """
+    Answers a commander query from the offline index. Returns None if there is no
+    index or the query needs the Scryfall API, and False if nothing matched.
+    """
+    if local_index is None:
+        return None
+    try:
+        return local_index.lookup(query, random_card=random_card) or False
+    except UnsupportedQuery:
+        return None
+
+
+def find_commander(query, random_card=False, local_index=None):
+    """
+    Returns the best (or a random) commander matching a Scryfall query, from the
+    offline `local_index` if it can answer the query. Raises SearchError if none matched.
+    """
+    commander = lookup_local_commander(local_index, query, random_card)
+    if commander is None:
+        if random_card:
+            commander = http_client.get_scryfall(SCRYFALL_API_CARD_RANDOM_URL, {"q": query}).json()
+        else:
+            response = http_client.get_scryfall(SCRYFALL_API_CARD_SEARCH_URL, {"order": "edhrec", "q": query})
+            commander = (response.json().get('data') or [None])[0]
+    if not commander:
+        raise SearchError("Commander not found.")
+    return commander
+
+
+def fetch_partner(commander, progress=None, local_index=None):
+    """Finds the most popular partner of a commander on EDHRec."""
+    # Not imported at startup; BeautifulSoup is only needed for partner pages
+    import bs4
+    import requests
+
+    progress = progress or _no_progress
+    progress(f"Looking up most popular partner for {commander.get('name')}...")
+
+    try:
+        deck_slug = get_slug_resolver().resolve(commander)
+        if not deck_slug:
+            raise SearchError(f"No EDHRec link found for {commander.get('name')}.")
+
+        partner_page_url = EDHREC_PARTNERS_URL_TPL.format(slug=deck_slug)
+        response = http_client.get(partner_page_url)
+        response.raise_for_status()
+
+        soup = bs4.BeautifulSoup(response.text, 'html.parser')
+        partner_list = soup.find("div", class_=re.compile("cardlist"))
+        if not partner_list:
+            raise SearchError(f"Could not find partner list for {commander.get('name')}.")
+
+        first_partner_span = partner_list.find("span", class_=re.compile("Card_name"))
+        if not first_partner_span:
+            raise SearchError(f"Could not find a partner for {commander.get('name')}.")
+
+        partner_name = first_partner_span.get_text()
+        progress(f"Most popular partner: {partner_name}. Fetching image...")
+
+        if local_index is not None:
+            partner = local_index.card_by_name(partner_name)
+            if partner:
+                return partner
+
+        # Fetch partner card data from Scryfall
+        payload = {"order": "edhrec", "q": f'"{partner_name}" is:commander game:paper'}
+        json_data = http_client.get_scryfall(SCRYFALL_API_CARD_SEARCH_URL, payload).json().get('data')
+        if not json_data:
+            raise SearchError(f"Could not find card data for partner: {partner_name}")
+        return json_data[0]
+
+    except SearchError:
+        raise
+    except requests.exceptions.RequestException as e:
+        raise SearchError(f"API request error during partner search: {e}") from e
+    except Exception as e:
+        raise SearchError(f"An error occurred during partner search: {e}") from e
+
+
+# --- EDHRec --- #
+
+def fetch_deck_table(commander, partner=None, progress=None):
+    """
+    Downloads the EDHRec deck table of a commander (and partner) and returns it
+    as a DeckTable, so its columns are extracted once for every filter run on it.
+    """
+    progress = progress or _no_progress
+    progress("Fetching decks from EDHRec...")
+    slug_resolver = get_slug_resolver()
+    if partner is not None:
+        comm_slug = slug_resolver.resolve(commander)
+        part_slug = slug_resolver.resolve(partner)
+        if not comm_slug or not part_slug:
+            raise SearchError("EDHRec links missing for commander or partner.")
+
+        decks_site_url = EDHREC_DECKS_URL_TPL.format(slug=f"{comm_slug}-{part_slug}")
+    else:
+        name_slug = slug_resolver.resolve(commander)
+        if not name_slug:
+            raise SearchError("No EDHRec link found for commander.")
+        decks_site_url = EDHREC_DECKS_URL_TPL.format(slug=name_slug)
+
+    # Fetch the decks page and decode only the deck table from __NEXT_DATA__
+    response = http_client.get(decks_site_url)
+    response.raise_for_status()
+
+    next_data = find_next_data(response.content)
+    if next_data is None:
+        raise SearchError("Could not find deck data on the page.")
+
+    deck_table = json_value_at(next_data, EDHREC_DECK_TABLE_PATH, [])
+    if not deck_table:
+        raise SearchError("No decks found in the data.")
+
+    return DeckTable(deck_table)
+
+
+def deck_page_url(deck):
+    """Returns the EDHRec deck preview page of a deck table row."""
+    return EDHREC_DECK_PREVIEW_URL_TPL.format(hash=deck.get("urlhash"))
+
+
+def fetch_deck_link(deck_page, progress=None):
+    """Reads the link to the hosting site from an EDHRec deck preview page."""
+    response = http_client.get(deck_page)
+    response.raise_for_status()
+    return next_data_value(response.content, EDHREC_DECK_LINK_PATH, "")
+
+
+def is_supported_deck_link(deck_link):
+    return any(site in deck_link for site in SUPPORTED_DECK_SITES)
+
+
+def scrape_deck(deck_page, progress=None):
+    """Resolves an EDHRec deck preview page to its hosting site and scrapes the Decklist from there."""
+    deck_link = fetch_deck_link(deck_page, progress)
+    if not is_supported_deck_link(deck_link):
+        raise SearchError(f"Unsupported site for scraping: {deck_link or deck_page}")
+    try:
+        return scrape_decklist(deck_link)
+    except ScrapeError as e:
+        raise SearchError(str(e)) from e
+
+
+# --- Whole Pipeline --- #
+
+def find_decklists(query, budget="", tags="", salt="", count=1, sort_order="edhrec", partner=False,
+                   local_index=None, progress=None):
+    """
+    Runs the whole search for one commander without any UI: finds the commander
+    (and its most popular partner), filters its EDHRec decks and scrapes the top
+    `count` matches one after another. Returns a dict with the commander and
+    partner names and one entry per deck, holding either its Decklist or the
+    error that kept it from being scraped. Raises SearchError if no deck could
+    be looked at at all.
+    """
+    progress = progress or _no_progress
+    commander = find_commander(build_scryfall_query(query, partner), local_index=local_index)
+    progress(f"Commander found: {commander.get('name')}")
+    partner_card = fetch_partner(commander, progress, local_index) if partner else None
+
+    deck_table = fetch_deck_table(commander, partner_card, progress)
+    try:
+        decks = find_matching_decks(deck_table, budget, tags.lower(), salt, limit=count, sort_order=sort_order)
+    except (ValueError, IndexError) as e:
+        raise SearchError(f"Invalid budget or salt filter: {e}") from e
+    if not decks:
+        raise SearchError("No decks found matching your filters.")
+
+    results = []
+    for rank, deck in enumerate(decks, start=1):
+        entry = {"rank": rank, "url": deck_page_url(deck), "price": deck.get("price"),
+                 "tags": deck.get("tags") or [], "salt": deck.get("salt")}
+        progress(f"Scraping deck {rank} of {len(decks)}...")
+        try:
+            entry["decklist"] = scrape_deck(entry["url"], progress)
+        except Exception as e:
+            entry["error"] = str(e)
+        results.append(entry)
+
+    return {
+        "query": query,
+        "commander": commander.get("name"),
+        "partner": partner_card.get("name") if partner_card else None,
+        "decks": results,
+    }
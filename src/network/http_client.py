@@ -0,0 +1,94 @@
+import sys
+import threading
+import time
+
+from config.constants import (
+    HTTP_HEADERS, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_TIMEOUT, SCRYFALL_MIN_REQUEST_INTERVAL
+)
+from network import response_cache
+
+_session = None
+_session_lock = threading.Lock()
+
+_scryfall_lock = threading.Lock()
+_last_scryfall_request = 0.0
+
+
+def _create_session():
+    """Builds a keep-alive session with one connection pool per host."""
+    # requests is imported with the first request, not at startup
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """Returns the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+
+def get(url, use_cache=True, **kwargs):
+    """
+    Same as requests.get, but reuses pooled connections and sends HTTP_HEADERS by default.
+    Responses of endpoints listed in HTTP_CACHE_TTLS are served from the on-disk cache.
+    """
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    if use_cache:
+        return response_cache.get_cache().get(get_session(), url, **kwargs)
+    return get_session().get(url, **kwargs)
+
+
+def head(url, **kwargs):
+    """Same as requests.head, through the pooled session. Never cached, redirects are not followed by default."""
+    kwargs.setdefault("timeout", HTTP_TIMEOUT)
+    return get_session().head(url, **kwargs)
+
+
+def is_request_error(error):
+    """True for connection and HTTP errors raised by requests. Does not import requests if it was never used."""
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(error, requests.exceptions.RequestException)
+
+
+def get_scryfall(url, params):
+    """
+    Sends a Scryfall API request, keeping Scryfall's requested gap between requests
+    across all threads (searches, random commanders and autocomplete alike).
+    """
+    global _last_scryfall_request
+    with _scryfall_lock:
+        wait = _last_scryfall_request + SCRYFALL_MIN_REQUEST_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_scryfall_request = time.monotonic()
+    response = get(url, params=params)
+    response.raise_for_status()
+    return response
+
+
+def get_bytes(url):
+    """Downloads a binary resource (e.g. a card image) and returns its content."""
+    response = get(url)
+    response.raise_for_status()
+    return response.content
+
+
+def close():
+    """Closes all pooled connections and the response cache. Both are reopened on the next request."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+    response_cache.close_cache()
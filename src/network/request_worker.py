@@ -0,0 +1,109 @@
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+
+class RequestSignals(QObject):
+    """
+    Signals emitted by a RequestWorker. They are delivered to the GUI thread
+    as queued connections, so connected slots may safely touch widgets.
+    """
+    progress = pyqtSignal(str)
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    finished = pyqtSignal()
+
+
+class RequestWorker(QRunnable):
+    """
+    Runs a blocking callable (usually a chain of HTTP requests) on a
+    QThreadPool thread. The callable receives a `progress` keyword argument
+    it can call with status messages.
+
+    The pool does not delete the worker when it is done; the RequestPipeline
+    holds it until its signals are delivered, so it can always be cancelled safely.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = RequestSignals()
+        self._lock = threading.Lock()
+        self.started = False
+        self.cancelled = False
+
+    def try_cancel(self):
+        """Marks the job as cancelled unless it has started. Returns True if it will not run."""
+        with self._lock:
+            if not self.started:
+                self.cancelled = True
+            return self.cancelled
+
+    @pyqtSlot()
+    def run(self):
+        with self._lock:
+            if self.cancelled:
+                self.signals.finished.emit()
+                return
+            self.started = True
+        try:
+            result = self.fn(*self.args, progress=self.signals.progress.emit, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class RequestPipeline(QObject):
+    """
+    Submits blocking jobs to a private thread pool and routes their outcome
+    back to the GUI thread through the given callbacks.
+    """
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # Keeps workers (and their signal objects) alive until their queued
+        # signals have been delivered.
+        self._active = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None, **kwargs):
+        """Queues `fn(*args, **kwargs)` and returns the worker."""
+        worker = RequestWorker(fn, *args, **kwargs)
+        if on_result:
+            worker.signals.result.connect(on_result)
+        if on_error:
+            worker.signals.error.connect(on_error)
+        if on_progress:
+            worker.signals.progress.connect(on_progress)
+        worker.signals.finished.connect(lambda: self._active.discard(worker))
+        self._active.add(worker)
+        self.pool.start(worker)
+        return worker
+
+    def cancel(self, worker):
+        """Drops a job that has not started yet. Returns False if it is already running or done."""
+        if worker not in self._active or not worker.try_cancel():
+            return False
+        try:
+            taken = self.pool.tryTake(worker)
+        except RuntimeError:  # the runnable is already gone
+            taken = False
+        if taken:
+            self._active.discard(worker)
+        # Otherwise the pool has dequeued it already; run() then only emits finished
+        return True
+
+    def cancel_pending(self):
+        """Drops all jobs that have not started yet. Running and finished jobs are left alone."""
+        for worker in list(self._active):
+            if not worker.started:
+                self.cancel(worker)
+
+    def wait_for_done(self, msecs=-1):
+        """Blocks until all queued jobs have finished. Mainly useful in tests and on shutdown."""
+        return self.pool.waitForDone(msecs)
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from config.constants import HTTP_CACHE_DIR_NAME, HTTP_CACHE_MAX_BYTES, HTTP_CACHE_TTLS
+from utils.file_helpers import user_cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    final_url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    encoding TEXT,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+"""
+
+# Response headers that are kept with a cached body.
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+
+def ttl_for_url(url, ttls=None):
+    """Returns the freshness lifetime for a URL (longest matching prefix wins), 0 if it is not cacheable."""
+    ttls = HTTP_CACHE_TTLS if ttls is None else ttls
+    matches = [prefix for prefix in ttls if url.startswith(prefix)]
+    if not matches:
+        return 0
+    return ttls[max(matches, key=len)]
+
+
+class ResponseCache:
+    """
+    Size-bounded on-disk cache for GET responses.
+
+    Bodies are stored content-addressed (named by their SHA-256) so identical
+    pages are only kept once. A SQLite index maps each request URL to its body
+    and validators and tracks access times for LRU eviction.
+    """
+    def __init__(self, directory=None, max_bytes=HTTP_CACHE_MAX_BYTES, ttls=None):
+        self.directory = directory or user_cache_dir(HTTP_CACHE_DIR_NAME)
+        self.max_bytes = max_bytes
+        self.ttls = HTTP_CACHE_TTLS if ttls is None else ttls
+        self._blob_dir = os.path.join(self.directory, "blobs")
+        os.makedirs(self._blob_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._counters = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0, "evicted": 0}
+
+    # --- Public API --- #
+
+    def get(self, session, url, params=None, **kwargs):
+        """
+        Serves a GET request from the cache when the entry is fresh, revalidates
+        it with a conditional request when stale, and fetches it otherwise.
+        """
+        import requests  # already loaded by the session, kept out of the startup imports
+
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        ttl = ttl_for_url(full_url, self.ttls)
+        if ttl <= 0:
+            return session.get(url, params=params, **kwargs)
+
+        key = hashlib.sha256(full_url.encode("utf-8")).hexdigest()
+        entry = self._lookup(key)
+        cached = self._build_response(entry) if entry else None
+        if entry and cached is None:
+            # The body went missing, so a 304 would leave nothing to serve
+            self._delete(key)
+        now = time.time()
+
+        if cached is not None and now - entry["stored_at"] < ttl:
+            self._touch(key, now, refresh=False)
+            self._count("hits")
+            return cached
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if cached is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = session.get(url, params=params, headers=headers or None, **kwargs)
+
+        if cached is not None and response.status_code == 304:
+            self._touch(key, now, refresh=True)
+            self._count("revalidated")
+            return cached
+
+        self._count("misses")
+        if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+            self._store(key, full_url, response, now)
+        return response
+
+    def stats(self):
+        """Returns hit/miss counters of this session plus the current size of the cache."""
+        with self._lock:
+            entries, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            stats = dict(self._counters)
+        stats.update({"entries": entries, "bytes": total, "max_bytes": self.max_bytes})
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Removes every cached response."""
+        with self._lock:
+            hashes = [row[0] for row in self._db.execute("SELECT DISTINCT content_hash FROM entries")]
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            for content_hash in hashes:
+                self._remove_blob(content_hash)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # --- Internals --- #
+
+    def _count(self, counter, amount=1):
+        with self._lock:
+            self._counters[counter] += amount
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self._blob_dir, content_hash[:2], content_hash)
+
+    def _remove_blob(self, content_hash):
+        try:
+            os.remove(self._blob_path(content_hash))
+        except FileNotFoundError:
+            pass
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT final_url, status, headers, encoding, content_hash, stored_at FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if not row:
+            return None
+        final_url, status, headers, encoding, content_hash, stored_at = row
+        return {
+            "final_url": final_url, "status": status, "headers": json.loads(headers),
+            "encoding": encoding, "content_hash": content_hash, "stored_at": stored_at
+        }
+
+    def _build_response(self, entry):
+        """Recreates a requests.Response from a cache entry, or None if its body went missing."""
+        import requests
+        from requests.structures import CaseInsensitiveDict
+
+        try:
+            with open(self._blob_path(entry["content_hash"]), "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+        response = requests.Response()
+        response._content = content
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response.encoding = entry["encoding"]
+        response.url = entry["final_url"]
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+
+    def _delete(self, key):
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+
+    def _touch(self, key, now, refresh):
+        with self._lock:
+            if refresh:
+                self._db.execute("UPDATE entries SET accessed_at = ?, stored_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _store(self, key, full_url, response, now):
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(content_hash)
+        headers = {name: response.headers[name] for name in _STORED_HEADERS if name in response.headers}
+        # Bodies are shared between entries, so writing one, indexing it and
+        # releasing the previous one must not interleave with another thread's.
+        with self._lock:
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_path, blob_path)
+            previous = self._db.execute("SELECT content_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, full_url, response.url or full_url, response.status_code, json.dumps(headers),
+                 response.encoding, content_hash, len(content), now, now)
+            )
+            self._db.commit()
+            if previous and previous[0] != content_hash:
+                self._release_blob(previous[0])
+            self._counters["stored"] += 1
+        self._evict()
+
+    def _release_blob(self, content_hash):
+        """Deletes a body file once no entry references it anymore. Called with self._lock held."""
+        in_use = self._db.execute("SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone()
+        if not in_use:
+            self._remove_blob(content_hash)
+
+    def _evict(self):
+        """Drops least recently used entries until the cache fits into max_bytes."""
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            victims = []
+            for key, content_hash, size in self._db.execute(
+                    "SELECT key, content_hash, size FROM entries ORDER BY accessed_at"):
+                if total <= self.max_bytes:
+                    break
+                victims.append((key, content_hash))
+                total -= size
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+            self._db.commit()
+            self._counters["evicted"] += len(victims)
+            for content_hash in {content_hash for _, content_hash in victims}:
+                self._release_blob(content_hash)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Returns the process-wide response cache, opening it on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
+
+
+def close_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is not None:
+            _cache.close()
+            _cache = None
@@ -0,0 +1,132 @@
+import json
+import os
+import re
+import threading
+import unicodedata
+from urllib.parse import urljoin, urlsplit
+
+from config.constants import EDHREC_SLUG_MAP_FILE_NAME
+from network import http_client
+from utils.file_helpers import user_cache_dir
+
+# Names made only of these characters have a predictable EDHRec slug.
+_SIMPLE_NAME = re.compile(r"^[A-Za-z0-9 ,'-]+$")
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+def slug_from_name(name):
+    """
+    Builds the EDHRec slug of a card name the way EDHRec does, e.g.
+    "Atraxa, Praetors' Voice" -> "atraxa-praetors-voice". Only the front face
+    of double-faced cards is used.
+    """
+    name = name.split(" // ")[0]
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    name = name.lower().replace("'", "")
+    return re.sub(r"[^a-z0-9]+", "-", name).strip("-")
+
+
+def slug_from_url(url):
+    """Returns the last path segment of an EDHRec page URL."""
+    return urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+
+
+class SlugResolver:
+    """
+    Resolves Scryfall cards to their EDHRec slugs without downloading EDHRec pages.
+
+    Slugs of plainly named cards are computed locally. For all others, the
+    redirect of the card's EDHRec link is read from a HEAD request (or a GET
+    whose body is never downloaded). Every resolution is kept in a persistent
+    card id -> slug map, so each card is resolved only once.
+    """
+    def __init__(self, path=None):
+        self.path = path or os.path.join(user_cache_dir(), EDHREC_SLUG_MAP_FILE_NAME)
+        self._lock = threading.Lock()
+        self._slugs = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                slugs = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return slugs if isinstance(slugs, dict) else {}
+
+    def _save(self):
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._slugs, f)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _card_key(card):
+        # The oracle id is shared by all printings of a card, the printing id is not.
+        return card.get("oracle_id") or card.get("id") or card.get("name")
+
+    def resolve(self, card):
+        """Returns the EDHRec slug of a Scryfall card, or None if it has neither a usable name nor an EDHRec link."""
+        key = self._card_key(card)
+        with self._lock:
+            slug = self._slugs.get(key)
+        if slug:
+            return slug
+
+        name = card.get("name") or ""
+        if name and _SIMPLE_NAME.match(name.split(" // ")[0]):
+            slug = slug_from_name(name)
+        else:
+            slug = self._resolve_remotely(card)
+        if not slug:
+            return None
+
+        if key:
+            with self._lock:
+                self._slugs[key] = slug
+                try:
+                    self._save()
+                except OSError as e:
+                    print(f"Could not save EDHRec slug map: {e}")
+        return slug
+
+    @staticmethod
+    def _resolve_remotely(card):
+        """Reads the slug from the redirect target of the card's EDHRec link."""
+        edhrec_link = card.get("related_uris", {}).get("edhrec")
+        if not edhrec_link:
+            return None
+
+        response = http_client.head(edhrec_link, allow_redirects=False)
+        if response.status_code not in _REDIRECT_STATUSES:
+            # Some servers don't answer HEAD requests properly; a streamed GET
+            # returns the headers without downloading the body.
+            response = http_client.get(edhrec_link, use_cache=False, allow_redirects=False, stream=True)
+            response.close()
+
+        location = response.headers.get("Location")
+        if response.status_code in _REDIRECT_STATUSES and location:
+            return slug_from_url(urljoin(edhrec_link, location))
+        response.raise_for_status()
+        # Not redirected: the link already points at the commander page
+        return (response.url or edhrec_link).rsplit("/", 1)[-1].replace("?cc=", "")
+
+
+_resolver = None
+_resolver_lock = threading.Lock()
+
+
+def get_slug_resolver():
+    """Returns the process-wide slug resolver, loading its map on first use."""
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                _resolver = SlugResolver()
+    return _resolver
+
+
+def reset_slug_resolver():
+    """Forgets the process-wide resolver, e.g. after the cache directory changed."""
+    global _resolver
+    with _resolver_lock:
+        _resolver = None
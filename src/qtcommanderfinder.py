@@ -1,9 +1,24 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import MainWindow
 
-if __name__ == "__main__":
+
+def run_gui():
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from config.constants import WARM_UP_DELAY_MS
+    from ui.main_window import MainWindow
+    from utils.warm_up import start_import_warm_up
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec())
+    # Heavy modules are imported lazily; load them in the background before they are needed
+    QTimer.singleShot(WARM_UP_DELAY_MS, start_import_warm_up)
+    return app.exec()
+
+
+if __name__ == "__main__":
+    # "qtcommanderfinder batch ..." runs headless, see cli.py
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        from cli import main
+        sys.exit(main(sys.argv[2:]))
+    sys.exit(run_gui())
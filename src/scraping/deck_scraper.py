@@ -0,0 +1,130 @@
+from config.constants import DEBUG_SCREENSHOT_PATH_TPL, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
+from scraping.decklist import Decklist
+from scraping.driver_pool import block_resources, get_driver_pool
+from scraping.http_scrapers import BotChallengeError, ScrapeError, archidekt_decklist_from_next_data, \
+    fetch_archidekt_decklist, fetch_moxfield_decklist
+from utils.next_data import load_next_data
+
+# Browserless scrapers tried before a browser is launched.
+HTTP_SCRAPERS = {
+    "moxfield": fetch_moxfield_decklist,
+    "archidekt": fetch_archidekt_decklist,
+}
+
+
+def site_for_url(url):
+    """Returns the scraper site of a deck URL: "moxfield", "archidekt" or "unknown"."""
+    if "moxfield.com" in url:
+        return "moxfield"
+    if "archidekt.com" in url:
+        return "archidekt"
+    return "unknown"
+
+
+def scrape_decklist(url, driver_pool=None):
+    """
+    Scrapes a Moxfield or Archidekt deck and returns it as a Decklist. The site
+    is tried without a browser first; only a bot check makes it fall back to a
+    browser leased from the shared DriverPool, and Selenium is only imported
+    then. Raises ScrapeError with a message for the user if it fails.
+    Blocks, and is safe to call from any thread.
+    """
+    site = site_for_url(url)
+    if site not in HTTP_SCRAPERS:
+        raise ScrapeError(f"Unsupported website for scraping: {url}")
+    decklist = _scrape_without_browser(site, url)
+    if decklist is not None:
+        return decklist
+
+    from selenium.common.exceptions import TimeoutException
+
+    pool = driver_pool or get_driver_pool()
+    try:
+        driver = pool.acquire()
+    except Exception as e:
+        raise ScrapeError(f"Could not start the browser: {e}") from e
+
+    broken = False
+    try:
+        block_resources(driver, site)
+        driver.get(url)
+        if site == "moxfield":
+            return _scrape_moxfield(driver, url)
+        return _scrape_archidekt(driver, url)
+
+    except ScrapeError:
+        raise
+    except TimeoutException as e: # Specific exception for timeouts
+        error_message = f"Timed out on {site.capitalize()}. Check selectors or page load."
+        print(f"--- SELENIUM DEBUG: TIMEOUT ---")
+        print(f"Error message: {e}")
+        driver.save_screenshot(DEBUG_SCREENSHOT_PATH_TPL.format(site=site))
+        print(f"Screenshot saved to {DEBUG_SCREENSHOT_PATH_TPL.format(site=site)}")
+        raise ScrapeError(error_message) from e
+    except Exception as e: # Catch-all for any other unexpected errors
+        broken = True # Don't hand a browser in an unknown state to the next scrape
+        error_message = f"An unexpected error occurred: {type(e).__name__}: {e}"
+        print(f"--- SELENIUM DEBUG: UNEXPECTED ERROR ---")
+        print(error_message)
+        try:
+            driver.save_screenshot(DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH)
+            print(f"Screenshot saved to {DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH}")
+        except Exception:
+            pass
+        raise ScrapeError(error_message) from e
+    finally:
+        pool.release(driver, discard=broken)
+
+
+def _scrape_without_browser(site, url):
+    """
+    Tries the plain HTTP path for the site. Returns the decklist, or None if
+    a bot check requires falling back to Selenium.
+    """
+    try:
+        return HTTP_SCRAPERS[site](url)
+    except BotChallengeError as e:
+        print(f"{e} Falling back to Selenium.")
+        return None
+    except ScrapeError:
+        raise
+    except Exception as e:
+        raise ScrapeError(f"Could not load the {site.capitalize()} deck: {type(e).__name__}: {e}") from e
+
+
+def _scrape_moxfield(driver, url):
+    """Scrapes the decklist from a Moxfield page."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    more_button = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.ID, "subheader-more"))
+    )
+    driver.execute_script("arguments[0].click();", more_button)
+
+    export_link = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.LINK_TEXT, "Export"))
+    )
+    driver.execute_script("arguments[0].click();", export_link)
+
+    textarea = WebDriverWait(driver, 10).until(
+        EC.visibility_of_element_located((By.CLASS_NAME, "form-control"))
+    )
+    decklist = Decklist.from_text(textarea.get_attribute('value') or "", url)
+    if not decklist:
+        raise ScrapeError("Moxfield's export dialog was empty.")
+    return decklist
+
+
+def _scrape_archidekt(driver, url):
+    """Scrapes an Archidekt decklist by parsing the embedded __NEXT_DATA__ JSON."""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "__NEXT_DATA__")))
+    data = load_next_data(driver.page_source)
+    if data is None:
+        raise ScrapeError("Could not find __NEXT_DATA__ script tag on Archidekt.")
+    return archidekt_decklist_from_next_data(data, url)
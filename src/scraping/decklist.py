@@ -0,0 +1,194 @@
+import csv
+import io
+import json
+import re
+
+# Sections of a deck, in the order they are exported
+BOARDS = ("commander", "companion", "mainboard", "sideboard")
+
+# Section headers of exported decklists, e.g. "SIDEBOARD:" in Moxfield's or "Deck" in Arena's format
+_TEXT_HEADERS = {
+    "commander": "commander", "commanders": "commander", "companion": "companion",
+    "deck": "mainboard", "mainboard": "mainboard", "sideboard": "sideboard",
+}
+
+# "1 Sol Ring (CMM) 410 *F*", "1x Sol Ring" or just "Sol Ring"
+_TEXT_LINE = re.compile(
+    r"^(?:(?P<quantity>\d+)x?\s+)?(?P<name>.+?)"
+    r"(?:\s+\((?P<set_code>[^()]+)\)(?:\s+(?P<collector_number>[^\s*]+))?)?(?P<foil>\s+\*F\*)?$"
+)
+
+
+class DeckEntry:
+    """One card of a decklist: how many, which printing and in which board."""
+    __slots__ = ("quantity", "name", "set_code", "collector_number", "board", "foil")
+
+    def __init__(self, quantity, name, set_code=None, collector_number=None, board="mainboard", foil=False):
+        self.quantity = quantity
+        self.name = name
+        self.set_code = set_code
+        self.collector_number = collector_number
+        self.board = board
+        self.foil = foil
+
+    def __eq__(self, other):
+        if not isinstance(other, DeckEntry):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"DeckEntry({self.quantity}, {self.name!r}, {self.set_code!r}, {self.collector_number!r}, {self.board!r})"
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{slot: data[slot] for slot in cls.__slots__ if slot in data})
+
+
+class Decklist:
+    """
+    A scraped deck as a list of DeckEntry objects. Both scrapers build it from
+    the site's deck data, so consumers never have to parse decklist text; the
+    text formats are produced by export_decklist().
+    """
+    __slots__ = ("entries", "source_url")
+
+    def __init__(self, entries=(), source_url=None):
+        self.entries = list(entries)
+        self.source_url = source_url
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __eq__(self, other):
+        if not isinstance(other, Decklist):
+            return NotImplemented
+        return self.entries == other.entries and self.source_url == other.source_url
+
+    def __repr__(self):
+        return f"Decklist({len(self.entries)} entries, source_url={self.source_url!r})"
+
+    def board(self, board):
+        """Returns the entries of one board, in deck order."""
+        return [entry for entry in self.entries if entry.board == board]
+
+    @property
+    def card_count(self):
+        return sum(entry.quantity for entry in self.entries)
+
+    @property
+    def commanders(self):
+        return [entry.name for entry in self.board("commander")]
+
+    def to_dict(self):
+        return {"source_url": self.source_url, "cards": [entry.to_dict() for entry in self.entries]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls((DeckEntry.from_dict(card) for card in data.get("cards", ())), data.get("source_url"))
+
+    @classmethod
+    def from_text(cls, text, source_url=None):
+        """
+        Parses a text decklist such as Moxfield's export or the Arena format.
+        Cards are in the mainboard unless a section header says otherwise, so
+        plain Moxfield exports don't tell their commanders apart.
+        """
+        entries = []
+        board = "mainboard"
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            header = _TEXT_HEADERS.get(line.rstrip(":").lower())
+            if header:
+                board = header
+                continue
+            match = _TEXT_LINE.match(line)
+            entries.append(DeckEntry(
+                int(match.group("quantity") or 1), match.group("name"), match.group("set_code"),
+                match.group("collector_number"), board, bool(match.group("foil"))
+            ))
+        return cls(entries, source_url)
+
+
+# --- Exporters --- #
+
+def _ordered(decklist, boards=BOARDS):
+    return [entry for board in boards for entry in decklist.board(board)]
+
+
+def _printing_line(entry, upper_set=False):
+    line = f"{entry.quantity} {entry.name}"
+    if entry.set_code:
+        line += f" ({entry.set_code.upper() if upper_set else entry.set_code})"
+        if entry.collector_number:
+            line += f" {entry.collector_number}"
+    return line
+
+
+def to_moxfield_text(decklist):
+    """Moxfield's export format: commanders first, the sideboard after a "SIDEBOARD:" header."""
+    lines = []
+    for entry in _ordered(decklist, ("commander", "companion", "mainboard")):
+        lines.append(_printing_line(entry) + (" *F*" if entry.foil else ""))
+    sideboard = [_printing_line(entry) + (" *F*" if entry.foil else "") for entry in decklist.board("sideboard")]
+    if sideboard:
+        lines += ["", "SIDEBOARD:"] + sideboard
+    return "\n".join(lines)
+
+
+def to_mtgo_text(decklist):
+    """MTGO's .txt format: names only, the commander goes into the sideboard after a blank line."""
+    main = [f"{entry.quantity} {entry.name}" for entry in decklist.board("mainboard")]
+    side = [f"{entry.quantity} {entry.name}" for entry in _ordered(decklist, ("commander", "companion", "sideboard"))]
+    return "\n".join(main + ([""] + side if side else []))
+
+
+def to_arena_text(decklist):
+    """MTG Arena's import format, with a header above each section."""
+    sections = []
+    for board, header in (("commander", "Commander"), ("companion", "Companion"),
+                          ("mainboard", "Deck"), ("sideboard", "Sideboard")):
+        entries = decklist.board(board)
+        if entries:
+            sections.append("\n".join([header] + [_printing_line(entry, upper_set=True) for entry in entries]))
+    return "\n\n".join(sections)
+
+
+def to_csv(decklist):
+    """One row per card with a header row."""
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator="\n")
+    writer.writerow(["quantity", "name", "set", "collector_number", "board", "foil"])
+    for entry in _ordered(decklist):
+        writer.writerow([entry.quantity, entry.name, entry.set_code or "", entry.collector_number or "",
+                         entry.board, "foil" if entry.foil else ""])
+    return output.getvalue()
+
+
+def to_json(decklist):
+    return json.dumps(decklist.to_dict(), ensure_ascii=False, indent=2)
+
+
+EXPORTERS = {
+    "moxfield": to_moxfield_text,
+    "mtgo": to_mtgo_text,
+    "arena": to_arena_text,
+    "csv": to_csv,
+    "json": to_json,
+}
+
+
+def export_decklist(decklist, export_format="moxfield"):
+    """Renders a decklist in one of the EXPORTERS formats."""
+    try:
+        exporter = EXPORTERS[export_format]
+    except KeyError:
+        raise ValueError(f"Unknown decklist format: {export_format}") from None
+    return exporter(decklist)
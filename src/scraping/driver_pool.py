@@ -0,0 +1,313 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from config.constants import (
+    DRIVER_POOL_SIZE, DRIVER_MAX_USES, DRIVER_MAX_JS_HEAP_MB, DRIVER_LEASE_TIMEOUT, DRIVER_IDLE_TIMEOUT,
+    DRIVER_PAGE_LOAD_STRATEGY, SCRAPER_BLOCKED_URL_PATTERNS, SCRAPER_SITE_ALLOWLISTS
+)
+
+
+def create_stealth_driver():
+    """Starts a headless Chrome instance configured with selenium-stealth."""
+    # Imported here, as Selenium takes a while to import and most sessions never start a browser
+    from selenium import webdriver
+    from selenium_stealth import stealth
+
+    options = webdriver.ChromeOptions()
+    options.page_load_strategy = DRIVER_PAGE_LOAD_STRATEGY
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")  # Absolutely necessary for running as root/in a container
+    options.add_argument("--disable-dev-shm-usage")  # Overcomes limited resource problems
+    options.add_argument("--disable-gpu")  # Applicable to headless browser
+    options.add_argument("start-maximized")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--mute-audio")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+
+    driver = webdriver.Chrome(options=options)
+
+    stealth(driver,
+          languages=["en-US", "en"],
+          vendor="Google Inc.",
+          platform="Win32",
+          webgl_vendor="Intel Inc.",
+          renderer="Intel Iris OpenGL Engine",
+          fix_hairline=True,
+          )
+    return driver
+
+
+def blocked_url_patterns(site):
+    """Returns the URL patterns the browser should not load while scraping a site."""
+    allowed = SCRAPER_SITE_ALLOWLISTS.get(site, ())
+    return [pattern for pattern in SCRAPER_BLOCKED_URL_PATTERNS if pattern not in allowed]
+
+
+def block_resources(driver, site):
+    """
+    Stops the browser from loading images, media, fonts and trackers the scraper
+    of `site` doesn't need. Pooled browsers move between sites, so this is set
+    before every scrape. Failing to set it only costs speed and is not raised.
+    """
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_url_patterns(site)})
+    except Exception as e:
+        print(f"Could not block resources for {site}: {e}")
+
+
+class _PooledDriver:
+    """A browser instance together with its bookkeeping."""
+    __slots__ = ("driver", "uses", "idle_since")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.idle_since = None
+
+
+class DriverPool:
+    """
+    Keeps warm, stealth-configured headless browsers and leases them to
+    scraper workers, so only the first scrape pays for the browser launch.
+
+    Browsers are health-checked before they are handed out and recycled after
+    `max_uses` scrapes or once the page's JS heap grows beyond `max_js_heap_mb`.
+    At most `max_drivers` browsers exist at a time; further leases wait.
+    Browsers can be started ahead of the first lease with prewarm(), and
+    browsers left idle for `idle_timeout` seconds are quit to free their memory.
+    """
+    def __init__(self, max_drivers=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES,
+                 max_js_heap_mb=DRIVER_MAX_JS_HEAP_MB, driver_factory=create_stealth_driver,
+                 idle_timeout=DRIVER_IDLE_TIMEOUT):
+        self.max_drivers = max_drivers
+        self.max_uses = max_uses
+        self.max_js_heap_mb = max_js_heap_mb
+        self.driver_factory = driver_factory
+        self.idle_timeout = idle_timeout
+        self._reaper = None  # timer quitting browsers once they were idle for too long
+        self._idle = []
+        self._leased = {}  # id(driver) -> _PooledDriver
+        self._starting = 0  # browsers being launched outside the lock
+        self._condition = threading.Condition()
+        self._closed = False
+
+    @contextmanager
+    def lease(self, timeout=DRIVER_LEASE_TIMEOUT):
+        """
+        Context manager handing out a driver. If the block raises, the driver is
+        assumed to be in a bad state and is discarded instead of being reused.
+        """
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def acquire(self, timeout=DRIVER_LEASE_TIMEOUT):
+        """Returns a healthy driver, launching one if none is idle. Raises TimeoutError if the pool stays exhausted."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("The driver pool has been shut down.")
+                    if self._idle:
+                        pooled = self._idle.pop()
+                        break
+                    if len(self._leased) + self._starting < self.max_drivers:
+                        pooled = None
+                        self._starting += 1
+                        break
+                    remaining = deadline - time.monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("No browser became available in time.")
+                    self._condition.wait(remaining)
+
+            if pooled is None:
+                try:
+                    pooled = _PooledDriver(self.driver_factory())
+                finally:
+                    with self._condition:
+                        self._starting -= 1
+                        self._condition.notify()
+            elif not self._is_healthy(pooled.driver):
+                self._quit(pooled.driver)
+                continue
+
+            with self._condition:
+                if self._closed:
+                    self._quit(pooled.driver)
+                    raise RuntimeError("The driver pool has been shut down.")
+                pooled.uses += 1
+                self._leased[id(pooled.driver)] = pooled
+            return pooled.driver
+
+    def release(self, driver, discard=False):
+        """Returns a leased driver to the pool, or quits it if it is broken or due for recycling."""
+        with self._condition:
+            pooled = self._leased.pop(id(driver), None)
+        if pooled is None:
+            return
+
+        recycle = discard or self._closed or pooled.uses >= self.max_uses or self._exceeds_memory(driver)
+        if not recycle:
+            try:
+                # Drop the page (and its memory) but keep the browser and its cookies warm
+                driver.get("about:blank")
+            except Exception:
+                recycle = True
+
+        if recycle:
+            self._quit(driver)
+        with self._condition:
+            if not recycle:
+                pooled.idle_since = time.monotonic()
+                self._idle.append(pooled)
+            self._condition.notify()
+        self._schedule_reaper()
+
+    def prewarm(self, count=1):
+        """
+        Launches browsers until `count` of them are idle, so the next scrapes don't
+        wait for a launch. Never exceeds `max_drivers`. Blocks while launching;
+        returns how many browsers were started.
+        """
+        launched = 0
+        while True:
+            with self._condition:
+                ready = len(self._idle) + self._starting
+                if self._closed or ready >= count or ready + len(self._leased) >= self.max_drivers:
+                    return launched
+                self._starting += 1
+
+            try:
+                pooled = _PooledDriver(self.driver_factory())
+            finally:
+                with self._condition:
+                    self._starting -= 1
+                    self._condition.notify()
+
+            with self._condition:
+                closed = self._closed
+                if not closed:
+                    pooled.idle_since = time.monotonic()
+                    self._idle.append(pooled)
+                    self._condition.notify()
+            if closed:
+                self._quit(pooled.driver)
+                return launched
+            launched += 1
+            self._schedule_reaper()
+
+    def prewarm_in_background(self, count=1):
+        """
+        Runs prewarm() on a daemon thread, so neither the GUI nor a request thread
+        waits for the launch. A failure is only logged. Returns the thread.
+        """
+        def run():
+            try:
+                self.prewarm(count)
+            except Exception as e:
+                print(f"Could not pre-start the browser: {e}")
+
+        thread = threading.Thread(target=run, name="driver-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def reap_idle(self):
+        """Quits the browsers that have been idle for `idle_timeout` seconds. Returns how many were quit."""
+        if not self.idle_timeout:
+            return 0
+        now = time.monotonic()
+        with self._condition:
+            expired = [pooled for pooled in self._idle if now - pooled.idle_since >= self.idle_timeout]
+            self._idle = [pooled for pooled in self._idle if pooled not in expired]
+        for pooled in expired:
+            self._quit(pooled.driver)
+        self._schedule_reaper()
+        return len(expired)
+
+    def _schedule_reaper(self):
+        """Arms a timer for when the longest idle browser reaches the idle timeout."""
+        with self._condition:
+            if not self.idle_timeout or self._closed or self._reaper is not None or not self._idle:
+                return
+            oldest = min(pooled.idle_since for pooled in self._idle)
+            delay = max(oldest + self.idle_timeout - time.monotonic(), 0)
+            self._reaper = threading.Timer(delay, self._on_reaper_timeout)
+            self._reaper.daemon = True
+            self._reaper.start()
+
+    def _on_reaper_timeout(self):
+        with self._condition:
+            self._reaper = None
+        self.reap_idle()
+
+    def shutdown(self):
+        """Quits all idle browsers. Leased ones are quit when they are released."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            reaper, self._reaper = self._reaper, None
+            self._condition.notify_all()
+        if reaper is not None:
+            reaper.cancel()
+        for pooled in idle:
+            self._quit(pooled.driver)
+
+    @property
+    def idle_count(self):
+        with self._condition:
+            return len(self._idle)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def _exceeds_memory(self, driver):
+        """Chrome exposes the page's JS heap size; an unknown size never triggers recycling."""
+        if not self.max_js_heap_mb:
+            return False
+        try:
+            heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null;")
+        except Exception:
+            return True
+        return isinstance(heap, (int, float)) and heap > self.max_js_heap_mb * 1024 * 1024
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Could not quit browser cleanly: {e}")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Returns the process-wide driver pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = DriverPool()
+        return _pool
+
+
+def shutdown_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
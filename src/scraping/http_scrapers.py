@@ -0,0 +1,126 @@
+import re
+import threading
+
+from config.constants import MOXFIELD_DECK_API_URL_TPL
+from network import http_client
+from scraping.decklist import DeckEntry, Decklist
+from utils.next_data import load_next_data
+
+# Markers of Cloudflare's and similar interstitial bot checks.
+_CHALLENGE_MARKERS = ("<title>Just a moment...</title>", "challenge-platform", "cf-browser-verification", "cf_chl_")
+
+
+class BotChallengeError(Exception):
+    """Raised when a site answers a plain HTTP request with a bot check. A real browser is needed then."""
+
+
+class ScrapeError(Exception):
+    """Raised when a page was loaded but does not contain a decklist."""
+
+
+# Set once any site answered with a bot check in this session; see bot_challenge_seen()
+_bot_challenge_seen = threading.Event()
+
+
+def bot_challenge_seen():
+    """Returns True if a site has required a real browser in this session."""
+    return _bot_challenge_seen.is_set()
+
+
+def _get_checked(url):
+    """Fetches a page or API resource without a browser, detecting bot challenges."""
+    response = http_client.get(url)
+    if response.status_code in (403, 429, 503) or any(marker in response.text for marker in _CHALLENGE_MARKERS):
+        _bot_challenge_seen.set()
+        raise BotChallengeError(f"{url} answered with a bot check (HTTP {response.status_code}).")
+    response.raise_for_status()
+    return response
+
+
+def _archidekt_board(categories):
+    if "Commander" in categories:
+        return "commander"
+    if "Sideboard" in categories:
+        return "sideboard"
+    return "mainboard"
+
+
+def archidekt_decklist_from_next_data(data, url=None):
+    """Reads the cardMap of an Archidekt page into a Decklist, sorted by name. The maybeboard is left out."""
+    card_map = data.get('props', {}).get('pageProps', {}).get('redux', {}).get('deck', {}).get("cardMap", {})
+    if not card_map:
+        raise ScrapeError("Could not find card list (cardMap) in Archidekt's page data.")
+    entries = []
+    for card_item in sorted(card_map.values(), key=lambda c: c.get('name', '')):
+        categories = card_item.get('categories') or []
+        if "Maybeboard" not in categories:
+            entries.append(DeckEntry(
+                card_item.get('qty'), card_item.get('name'), card_item.get('setCode'),
+                card_item.get('collectorNumber'), _archidekt_board(categories)
+            ))
+    return Decklist(entries, url)
+
+
+def fetch_archidekt_decklist(url):
+    """
+    Scrapes an Archidekt decklist with a single HTTP request. Archidekt renders
+    the whole deck into the page's __NEXT_DATA__, so no browser is needed unless
+    a bot check gets in the way (BotChallengeError).
+    """
+    data = load_next_data(_get_checked(url).text)
+    if data is None:
+        raise ScrapeError("Could not find __NEXT_DATA__ script tag on Archidekt.")
+    return archidekt_decklist_from_next_data(data, url)
+
+
+# Moxfield's deck JSON boards and the Decklist boards they are read into
+_MOXFIELD_BOARDS = (
+    ("commanders", "commander"), ("companions", "companion"), ("mainboard", "mainboard"), ("sideboard", "sideboard")
+)
+
+
+def _moxfield_entry(entry, board):
+    card = entry.get("card", {})
+    return DeckEntry(
+        entry.get("quantity"), card.get("name"), (card.get("set") or "").upper(), card.get("cn"), board,
+        bool(entry.get("isFoil") or entry.get("finish") == "foil")
+    )
+
+
+def _moxfield_board(deck, board):
+    """Returns the card entries of a board for both the v3 ("boards") and the older v2 layout."""
+    cards = deck.get("boards", {}).get(board, {}).get("cards")
+    if cards is None:
+        cards = deck.get(board, {})
+    return sorted(cards.values(), key=lambda entry: entry.get("card", {}).get("name", ""))
+
+
+def moxfield_decklist_from_json(deck, url=None):
+    """Reads Moxfield's deck JSON into a Decklist. The maybeboard is left out."""
+    entries = [_moxfield_entry(entry, board) for moxfield_board, board in _MOXFIELD_BOARDS
+               for entry in _moxfield_board(deck, moxfield_board)]
+    if not any(entry.board != "sideboard" for entry in entries):
+        raise ScrapeError("Could not find any cards in Moxfield's deck data.")
+    return Decklist(entries, url)
+
+
+def moxfield_public_id(url):
+    """Extracts the public deck id from a moxfield.com/decks/<id> URL."""
+    match = re.search(r"moxfield\.com/decks/([A-Za-z0-9_-]+)", url)
+    if not match:
+        raise ScrapeError(f"Not a Moxfield deck URL: {url}")
+    return match.group(1)
+
+
+def fetch_moxfield_decklist(url):
+    """
+    Scrapes a Moxfield decklist with a single request to Moxfield's deck API
+    instead of clicking through the export dialog in a browser. Raises
+    BotChallengeError if the API refuses plain HTTP clients.
+    """
+    api_url = MOXFIELD_DECK_API_URL_TPL.format(public_id=moxfield_public_id(url))
+    try:
+        deck = _get_checked(api_url).json()
+    except ValueError as e:
+        raise ScrapeError(f"Moxfield returned invalid deck data: {e}") from e
+    return moxfield_decklist_from_json(deck, url)
@@ -1,5 +1,19 @@
+import re
+
+from PyQt5.QtCore import QStringListModel, Qt, QTimer
 from PyQt5.QtWidgets import QCompleter
 
+from card_index.name_index import load_name_index
+from config.constants import (
+    AUTOCOMPLETE_DEBOUNCE_MS, AUTOCOMPLETE_MAX_SUGGESTIONS, AUTOCOMPLETE_MIN_CHARS, SCRYFALL_API_AUTOCOMPLETE_URL,
+    TAG_COMPLETION_MAX_SUGGESTIONS
+)
+from network import http_client
+from utils.trigram_index import TrigramIndex
+
+# Texts with search syntax in them are queries, not names.
+_QUERY_SYNTAX = re.compile(r"""[:<>=!"()]|(^|\s)-""")
+
 
 class MultiTagCompleter(QCompleter):
     """
@@ -30,4 +44,133 @@ class MultiTagCompleter(QCompleter):
         last_comma_pos = path.rfind(',')
         if last_comma_pos != -1:
             return [path[last_comma_pos + 1:].lstrip()]
-        return [path]
\ No newline at end of file
+        return [path]
+
+
+class FuzzyTagCompleter(MultiTagCompleter):
+    """
+    A MultiTagCompleter whose suggestions come from a trigram index instead of
+    Qt's contains-scan over the whole tag list. Misspelled tags are suggested,
+    too, and tags found in fetched decks can be added at any time.
+    """
+    def __init__(self, tags, line_edit, parent=None):
+        model = QStringListModel()
+        super().__init__(model, parent)
+        model.setParent(self)
+        self.tag_index = TrigramIndex(tags)
+        # The model only ever holds the suggestions for the tag being typed
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        line_edit.setCompleter(self)
+        # Delivered before the line edit asks the completer to update its popup
+        line_edit.textEdited.connect(self.update_suggestions)
+
+    def add_tags(self, tags):
+        """Makes more tags available for completion. Returns how many were new."""
+        return sum(self.tag_index.add(tag) for tag in tags)
+
+    def update_suggestions(self, text):
+        segment = self.splitPath(text)[0]
+        self.model().setStringList(self.tag_index.search(segment, TAG_COMPLETION_MAX_SUGGESTIONS))
+
+
+class CommanderNameCompleter(QCompleter):
+    """
+    Suggests commander names while the user types into a QLineEdit.
+
+    With a built offline commander index, suggestions come from its name index
+    right away on every keystroke. The name index is loaded (or built) on a
+    pool thread the first time it is needed. Without it, Scryfall's autocomplete
+    endpoint is asked once typing pauses; it knows all cards, not only commanders.
+    """
+    def __init__(self, line_edit, pipeline, parent=None):
+        super().__init__(parent)
+        self.pipeline = pipeline
+        self._model = QStringListModel(self)
+        self.setModel(self._model)
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        # The model only ever holds the suggestions for the current text
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.setMaxVisibleItems(AUTOCOMPLETE_MAX_SUGGESTIONS)
+        self.setWidget(line_edit)
+        self.activated[str].connect(line_edit.setText)
+        line_edit.textEdited.connect(self.update_suggestions)
+
+        self._source = None  # commander index the names come from
+        self.name_index = None
+        self._name_index_loading = False
+        self._remote_timer = QTimer(self)
+        self._remote_timer.setSingleShot(True)
+        self._remote_timer.setInterval(AUTOCOMPLETE_DEBOUNCE_MS)
+        self._remote_timer.timeout.connect(self._complete_remotely)
+
+    def set_name_source(self, commander_index):
+        """Completes from a built commander index from now on, or from Scryfall if it is None."""
+        self._source = commander_index
+        self.name_index = None
+
+    def update_suggestions(self, text):
+        self._remote_timer.stop()
+        if not text.strip() or _QUERY_SYNTAX.search(text):
+            self._show([])
+            return
+        if self.name_index is not None:
+            self._show(self.name_index.complete(text))
+            return
+        if self._source is not None:
+            self._load_name_index()
+        if len(text.strip()) >= AUTOCOMPLETE_MIN_CHARS:
+            self._remote_timer.start()
+
+    def _show(self, names):
+        self._model.setStringList(names)
+        if names:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    # --- Offline Name Index --- #
+
+    def _load_name_index(self):
+        if self._name_index_loading:
+            return
+        self._name_index_loading = True
+        source = self._source
+        self.pipeline.submit(
+            lambda progress: load_name_index(source),
+            on_result=lambda name_index: self._on_name_index_loaded(source, name_index),
+            on_error=self._on_name_index_error
+        )
+
+    def _on_name_index_loaded(self, source, name_index):
+        self._name_index_loading = False
+        if source is not self._source:
+            return  # The source changed while loading
+        self.name_index = name_index
+        self._remote_timer.stop()
+        if self.widget().hasFocus():
+            self.update_suggestions(self.widget().text())
+
+    def _on_name_index_error(self, error):
+        self._name_index_loading = False
+        print(f"Could not load commander names: {error}")
+
+    # --- Scryfall Autocomplete --- #
+
+    @staticmethod
+    def _fetch_suggestions(text, progress):
+        """Asks Scryfall for card names starting with the text. Runs on a pool thread."""
+        return http_client.get_scryfall(SCRYFALL_API_AUTOCOMPLETE_URL, {"q": text}).json().get("data") or []
+
+    def _complete_remotely(self):
+        text = self.widget().text()
+        self.pipeline.submit(
+            self._fetch_suggestions, text,
+            on_result=lambda names: self._on_remote_suggestions(text, names),
+            on_error=lambda error: print(f"Could not fetch name suggestions: {error}")
+        )
+
+    def _on_remote_suggestions(self, text, names):
+        # Drop answers for text that has been edited since, or if the offline names arrived meanwhile
+        if text == self.widget().text() and self.name_index is None:
+            self._show(names[:AUTOCOMPLETE_MAX_SUGGESTIONS])
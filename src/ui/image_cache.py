@@ -0,0 +1,204 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+
+from config.constants import (
+    IMAGE_CACHE_DIR_NAME, IMAGE_CACHE_MAX_PIXMAPS, IMAGE_CACHE_MAX_DISK_BYTES, SCRYFALL_IMAGE_SIZES,
+    SCALED_PIXMAP_CACHE_SIZE
+)
+from network import http_client
+from utils.file_helpers import user_cache_dir
+
+_SIZE_NAMES = [size for size, _ in SCRYFALL_IMAGE_SIZES]
+
+
+def select_image_size(target_height):
+    """Returns the smallest Scryfall image size that is at least target_height pixels high."""
+    for size, height in SCRYFALL_IMAGE_SIZES:
+        if height >= target_height:
+            return size
+    return SCRYFALL_IMAGE_SIZES[-1][0]
+
+
+def image_size_rank(size):
+    """Position of an image size in SCRYFALL_IMAGE_SIZES, -1 for None."""
+    return _SIZE_NAMES.index(size) if size in _SIZE_NAMES else -1
+
+
+def resolve_card_image(card_data, face=0, size="png"):
+    """
+    Returns (cache key, url) of a card face image in the requested size. Falls
+    back to the next larger size, then to smaller ones, if Scryfall does not
+    list the requested one. Returns (None, None) if the card has no image.
+
+    The key is (card id, face, size). Scryfall ids are stable per printing;
+    cards without one (e.g. in tests) fall back to a hash of the image URL.
+    """
+    image_uris = card_data.get("image_uris")
+    if not image_uris:
+        faces = card_data.get("card_faces") or []
+        image_uris = faces[face].get("image_uris") if len(faces) > face else None
+    if not image_uris:
+        return None, None
+
+    rank = max(image_size_rank(size), 0)
+    for candidate in _SIZE_NAMES[rank:] + _SIZE_NAMES[:rank][::-1]:
+        url = image_uris.get(candidate)
+        if url:
+            card_id = card_data.get("id") or hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+            return (card_id, face, candidate), url
+    return None, None
+
+
+class CardImageCache:
+    """
+    Two-tier card image cache.
+
+    Original image files (of every size that was requested) are kept on disk so
+    they survive restarts. Decoded QPixmaps are kept in a small in-memory LRU so
+    flipping a card or searching it again does not decode the image a second time.
+
+    load_bytes() may be called from worker threads, pixmap() only from the GUI thread.
+    """
+    def __init__(self, directory=None, max_pixmaps=IMAGE_CACHE_MAX_PIXMAPS, max_disk_bytes=IMAGE_CACHE_MAX_DISK_BYTES):
+        self.directory = directory or user_cache_dir(IMAGE_CACHE_DIR_NAME)
+        self.max_pixmaps = max_pixmaps
+        self.max_disk_bytes = max_disk_bytes
+        self._pixmaps = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = None  # size of the disk tier, known after the first scan
+
+    def _path(self, key):
+        card_id, face, size = key
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "", str(card_id))
+        extension = "png" if size == "png" else "jpg"
+        return os.path.join(self.directory, f"{safe_id}-{face}-{size}.{extension}")
+
+    def has_pixmap(self, key):
+        with self._lock:
+            return key in self._pixmaps
+
+    def load_bytes(self, key, url):
+        """
+        Returns the original image bytes for a card face from the disk tier,
+        downloading and storing them first if needed. Returns None if the
+        decoded pixmap is still held in memory, as there is nothing to decode then.
+        """
+        if self.has_pixmap(key):
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            pass
+        else:
+            self._touch(path)
+            return data
+
+        data = http_client.get_bytes(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._stored(len(data))
+        return data
+
+    def pixmap(self, key, data=None):
+        """
+        Returns the decoded pixmap for a card face. Looks in memory first, then
+        decodes `data` or the file from the disk tier. Returns None if neither is available.
+        """
+        with self._lock:
+            pixmap = self._pixmaps.get(key)
+            if pixmap is not None:
+                self._pixmaps.move_to_end(key)
+                return pixmap
+
+        if data is None:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                return None
+            self._touch(path)
+
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return None
+
+        with self._lock:
+            self._pixmaps[key] = pixmap
+            while len(self._pixmaps) > self.max_pixmaps:
+                self._pixmaps.popitem(last=False)
+        return pixmap
+
+    @staticmethod
+    def _touch(path):
+        """Marks a disk tier file as used. Pruning goes by mtime, as atime is often not updated."""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _stored(self, size):
+        """Adds a written file to the running total and prunes the disk tier once it goes over the limit."""
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += size
+                if self._disk_bytes <= self.max_disk_bytes:
+                    return
+            self._disk_bytes = self._prune_disk()
+
+    def _prune_disk(self):
+        """Deletes the oldest image files until the disk tier fits its limit. Returns the remaining size."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        return total
+
+
+class ScaledPixmapCache:
+    """
+    LRU of smoothly scaled pixmaps keyed by (source image, height), so redrawing
+    an image at a height it was already shown at costs nothing.
+    Fast (non-smooth) scaling is cheap enough to not be cached.
+    """
+    def __init__(self, max_entries=SCALED_PIXMAP_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._scaled = OrderedDict()
+
+    def scaled(self, pixmap, height, smooth=True):
+        """Returns `pixmap` scaled to `height`, smoothly (cached) or fast."""
+        if not smooth:
+            return pixmap.scaledToHeight(height, Qt.FastTransformation)
+
+        key = (pixmap.cacheKey(), height)
+        scaled = self._scaled.get(key)
+        if scaled is not None:
+            self._scaled.move_to_end(key)
+            return scaled
+
+        scaled = pixmap.scaledToHeight(height, Qt.SmoothTransformation)
+        self._scaled[key] = scaled
+        while len(self._scaled) > self.max_entries:
+            self._scaled.popitem(last=False)
+        return scaled
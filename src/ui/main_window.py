@@ -1,30 +1,54 @@
 import os
-import re
 import sys
-import json
-import urllib.request
 import webbrowser
-import pyperclip
-import requests
-from PyQt5.QtCore import Qt, QThread
-import bs4
-import time
-from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, \
+from PyQt5.QtCore import Qt, QThread, QTimer
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QCheckBox, QLabel, \
     QLineEdit, \
-    QPushButton, QMessageBox, QGridLayout
-from PyQt5.QtGui import QPixmap, QIcon
+    QPushButton, QMessageBox, QGridLayout, QSpinBox, QListWidget, QListWidgetItem, QComboBox
+from PyQt5.QtGui import QIcon
 
 from config.constants import (
-    EDHREC_TAGS, COMMANDER_IMG_PATH, COMMANDER_FRONT_IMG_PATH, COMMANDER_BACK_IMG_PATH, PARTNER_IMG_PATH,
-    SCRYFALL_API_CARD_SEARCH_URL, SCRYFALL_API_CARD_RANDOM_URL, HTTP_HEADERS, EDHREC_PARTNERS_URL_TPL,
-    EDHREC_DECKS_URL_TPL, EDHREC_DECK_PREVIEW_URL_TPL, SCRYFALL_SYNTAX_GUIDE_URL, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
+    EDHREC_TAGS, PROGRESSIVE_IMAGE_LOADING, RESIZE_SETTLE_MS, BATCH_MAX_WORKERS, BATCH_DEFAULT_DECK_COUNT,
+    BATCH_MAX_DECK_COUNT, DECK_EXPORT_FORMATS, DECK_SORT_ORDERS, DECK_TABLE_PREFETCH, BROWSER_PREWARM, BROWSER_PREWARM_IDLE_MS,
+    SCRYFALL_SYNTAX_GUIDE_URL, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
 )
+from card_index.commander_index import close_commander_index, get_commander_index
+from core.deck_finder import (
+    SearchError, build_scryfall_query, deck_page_url, fetch_deck_link, fetch_deck_table, fetch_partner,
+    find_commander, is_supported_deck_link, scrape_deck
+)
+from network import http_client, response_cache
+from network.request_worker import RequestPipeline
+from scraping.decklist import export_decklist
+from scraping.driver_pool import get_driver_pool, shutdown_driver_pool
+from scraping.http_scrapers import bot_challenge_seen
 from scraping.scraper_worker import DecklistScraperWorker
-from ui.completer import MultiTagCompleter
-from utils.deck_filter import filter_decks
+from ui.completer import CommanderNameCompleter, FuzzyTagCompleter
+from ui.image_cache import CardImageCache, ScaledPixmapCache, image_size_rank, resolve_card_image, select_image_size
+from utils.deck_filter import filter_decks, find_matching_decks
 from utils.file_helpers import resource_path
 
 
+def copy_to_clipboard(text):
+    # Imported with the first copied decklist, not at startup
+    import pyperclip
+    pyperclip.copy(text)
+
+
+class DeckTablePrefetch:
+    """A deck table fetch started speculatively for the commander (and partner) on screen."""
+    def __init__(self, owner):
+        self.owner = owner
+        self.worker = None
+        self.table = None
+        self.failed = False
+        self.waiters = []  # (on_result, on_error) of deck fetches waiting for this one
+
+    @property
+    def done(self):
+        return self.table is not None or self.failed
+
+
 class MainWindow(QMainWindow):
 
     def __init__(self):
@@ -34,9 +58,13 @@ class MainWindow(QMainWindow):
         self.data = {}
         self.original_commander_pixmap = None
         self.original_partner_pixmap = None
-        self.filepath_front = None
-        self.filepath_back = None
+        self.commander_face_keys = []
         self.times_clicked_flip = 0
+        self.image_cache = CardImageCache()
+        self.scaled_cache = ScaledPixmapCache()
+        self._displayed_cards = None  # (commander, partner or None) whose images are shown
+        self._image_size = None  # Scryfall image size currently displayed
+        self._pending_image_size = None  # larger size that is being loaded in the background
 
         #--- WINDOW SETTINGS ---#
         self.setWindowTitle("QTCommanderFinder")
@@ -44,13 +72,42 @@ class MainWindow(QMainWindow):
         icon_path = resource_path(os.path.join("assets", "flash-cards.png"))
         self.setWindowIcon(QIcon(icon_path))
 
+        # --- RESIZE DEBOUNCING ---#
+        # While the window is being resized, images are scaled fast. Once resizing
+        # pauses, this timer triggers a single smooth scaling pass.
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+
         # --- THREADING ---#
         self.thread = None
         self.worker = None
+        self.request_pipeline = RequestPipeline(parent=self)
+        # Bumped on every new search so results of superseded searches are dropped.
+        self._search_generation = 0
+        # Batch deck fetching gets its own bounded pool so it cannot starve searches.
+        self.batch_pipeline = RequestPipeline(max_threads=BATCH_MAX_WORKERS, parent=self)
+        self._batch_generation = 0
+        self._batch_pending = 0
+        self._deck_prefetch = None  # DeckTablePrefetch of the commander on screen
+        self._index_refresh_running = False
+
+        # --- BROWSER PRE-WARMING ---#
+        # Starting the headless browser takes seconds, so it is started before the
+        # first scrape needs it (see BROWSER_PREWARM). Unused ones quit on their own.
+        self._browser_prewarm_thread = None
+        self._browser_prewarm_timer = QTimer(self)
+        self._browser_prewarm_timer.setSingleShot(True)
+        self._browser_prewarm_timer.setInterval(BROWSER_PREWARM_IDLE_MS)
+        self._browser_prewarm_timer.timeout.connect(self._prewarm_browser)
+        if BROWSER_PREWARM == "idle":
+            self._browser_prewarm_timer.start()
 
         # --- TEXT SEARCH BAR ---#
         self.searchText = QLineEdit()
         self.searchText.setPlaceholderText("Search a commander...")
+        self.nameCompleter = CommanderNameCompleter(self.searchText, self.request_pipeline, self)
 
         self.searchButton = QPushButton("Search")
         self.searchButton.clicked.connect(self.search)
@@ -75,16 +132,18 @@ class MainWindow(QMainWindow):
         self.salt_input.setPlaceholderText("Filter by salt score (e.g. <30 or 30-40")
 
         # --- TAG COMPLETION ---
-        completer = MultiTagCompleter(EDHREC_TAGS, self)
-        completer.setCaseSensitivity(Qt.CaseInsensitive)
-        completer.setFilterMode(Qt.MatchContains)
-        self.tags_input.setCompleter(completer)
+        self.tagCompleter = FuzzyTagCompleter(EDHREC_TAGS, self.tags_input, self)
 
         self.budget_hint = QLabel(
             "Budget search allows minus-separated ranges, min values with >, and max values with <")
         self.partnerSearch = QCheckBox("Search Partner Combo")
+        self.useLocalIndex = QCheckBox("Offline Card Index")
+        self.useLocalIndex.setToolTip("Answer searches from a local copy of Scryfall's card data")
+        self.useLocalIndex.toggled.connect(self._on_local_index_toggled)
         self.helpButton = QPushButton("Syntax Guide")
         self.helpButton.clicked.connect(self.show_syntax_guide)
+        self.cacheStatsButton = QPushButton("Cache Stats")
+        self.cacheStatsButton.clicked.connect(self.show_cache_stats)
 
         #--- EXTENDED SEARCH CONTAINER ---#
         self.extendedSearchLayout = QGridLayout()
@@ -95,7 +154,9 @@ class MainWindow(QMainWindow):
         self.extendedSearchLayout.addWidget(self.salt_input, 0, 2)
         self.extendedSearchLayout.addWidget(self.partnerSearch, 0, 3)
         self.extendedSearchLayout.addWidget(self.helpButton, 0, 4)
-        self.extendedSearchLayout.addWidget(self.budget_hint, 1, 0, 1, 4, Qt.AlignTop)
+        self.extendedSearchLayout.addWidget(self.budget_hint, 1, 0, 1, 3, Qt.AlignTop)
+        self.extendedSearchLayout.addWidget(self.useLocalIndex, 1, 3)
+        self.extendedSearchLayout.addWidget(self.cacheStatsButton, 1, 4)
 
         #--- IMAGE WIDGETS ---#
         self.commanderImage = QLabel(self)
@@ -122,10 +183,44 @@ class MainWindow(QMainWindow):
         self.deckPriceLabel.setEnabled(False)
         self.deckPriceLabel.setAlignment(Qt.AlignCenter)
 
+        #--- DECKLIST EXPORT ---#
+        self.exportFormat = QComboBox()
+        for export_format, label in DECK_EXPORT_FORMATS.items():
+            self.exportFormat.addItem(label, export_format)
+        self.exportFormat.setToolTip("Format decklists are copied to the clipboard in")
+
+        #--- DECK RANKING ---#
+        self.deckSort = QComboBox()
+        for sort_order, label in DECK_SORT_ORDERS.items():
+            self.deckSort.addItem(label, sort_order)
+        self.deckSort.setToolTip("Which matching decks are fetched first")
+
+        #--- BATCH DECK FETCHING ---#
+        self.deckCount = QSpinBox()
+        self.deckCount.setRange(1, BATCH_MAX_DECK_COUNT)
+        self.deckCount.setValue(BATCH_DEFAULT_DECK_COUNT)
+        self.deckCount.setPrefix("Top ")
+        self.deckCount.setSuffix(" decks")
+        self.get_TopDecks = QPushButton("Get Top Decklists")
+        self.get_TopDecks.clicked.connect(self.fetch_top_decklists)
+        self.deckList = QListWidget()
+        self.deckList.setToolTip("Double-click a decklist to copy it to the clipboard")
+        self.deckList.setVisible(False)
+        self.deckList.itemActivated.connect(self.copy_deck_from_list)
+
         #--- ACTION BUTTON CONTAINER ---#
+        self.decklistLayout = QHBoxLayout()
+        self.decklistLayout.addWidget(self.get_Decklist, 1)
+        self.decklistLayout.addWidget(self.exportFormat)
+        self.batchLayout = QHBoxLayout()
+        self.batchLayout.addWidget(self.deckSort)
+        self.batchLayout.addWidget(self.deckCount)
+        self.batchLayout.addWidget(self.get_TopDecks)
         self.actionLayout = QVBoxLayout()
-        self.actionLayout.addWidget(self.get_Decklist)
+        self.actionLayout.addLayout(self.decklistLayout)
         self.actionLayout.addWidget(self.deckPriceLabel)
+        self.actionLayout.addLayout(self.batchLayout)
+        self.actionLayout.addWidget(self.deckList)
 
         #--- ERROR BOX ---#
         self.errorLabel = QLabel()
@@ -150,16 +245,8 @@ class MainWindow(QMainWindow):
         self.widget.setLayout(self.layout)
         self.setCentralWidget(self.widget)
 
-    def _cleanup_temp_files(self):
-        """Removes temporary image files."""
-        for f in [COMMANDER_BACK_IMG_PATH, PARTNER_IMG_PATH, COMMANDER_IMG_PATH, COMMANDER_FRONT_IMG_PATH]:
-            if os.path.isfile(f):
-                os.remove(f)
-
     def _reset_ui_state(self):
         """Resets UI elements to their initial state for a new search."""
-        self._cleanup_temp_files()
-
         # Reset partner view
         self.partnerImage.setVisible(False)
         self.original_partner_pixmap = None
@@ -169,10 +256,12 @@ class MainWindow(QMainWindow):
         self.commanderImageFlip.setVisible(False)
         self.commanderImageFlip.setEnabled(False)
 
-        # Reset data cache for images
-        self.filepath_front = None
-        self.filepath_back = None
+        # Reset displayed images
+        self.commander_face_keys = []
         self.original_commander_pixmap = None
+        self._displayed_cards = None
+        self._image_size = None
+        self._pending_image_size = None
 
     def _set_status(self, message, is_error=False):
         """Updates the status label."""
@@ -182,216 +271,270 @@ class MainWindow(QMainWindow):
             self.errorLabel.setStyleSheet("background-color: lightgrey; color: black;")
         self.errorLabel.setText(message)
         self.errorLabel.setVisible(True)
-        QApplication.processEvents()
 
     def _build_scryfall_query(self):
         """Constructs the Scryfall query string from the UI."""
-        query = self.searchText.text().strip()
-        if "is:commander" not in query.lower():
-            query += " is:commander"
-        if "game:paper" not in query.lower():
-            query += " game:paper"
-        if self.partnerSearch.isChecked() and "o:partner" not in query.lower():
-            query += " o:partner"
-        return query
-
-    def _download_and_display_card_image(self, card_data):
+        return build_scryfall_query(self.searchText.text(), self.partnerSearch.isChecked())
+
+    def _target_image_height(self):
+        """Height the commander image is displayed at."""
+        # The label is at least 2/3 of the window high (see update_commander_image), but
+        # it might not have been laid out yet, e.g. in a test environment.
+        return max(self.commanderImage.height(), int(self.height() * (2 / 3)))
+
+    def _submit_search(self, fn, *args, on_result, on_error, **kwargs):
+        """
+        Submits a job belonging to the current commander search. Results and progress
+        messages of a search that has been superseded by a newer one are silently dropped.
         """
-        Downloads the image for a given card (including double-faced cards)
-        and sets it up for display.
+        generation = self._search_generation
+
+        def if_current(slot):
+            def wrapper(value):
+                if generation == self._search_generation:
+                    slot(value)
+            return wrapper
+
+        return self.request_pipeline.submit(
+            fn, *args,
+            on_result=if_current(on_result),
+            on_error=if_current(on_error),
+            on_progress=if_current(self._set_status),
+            **kwargs
+        )
+
+    def _load_card_images(self, card_data, size="png"):
         """
-        image_uris = card_data.get('image_uris')
-        if image_uris:
-            image_link = image_uris.get('png')
-            urllib.request.urlretrieve(image_link, COMMANDER_IMG_PATH)
-            time.sleep(0.1)
-            self.original_commander_pixmap = QPixmap(COMMANDER_IMG_PATH)
-        elif "card_faces" in card_data:
-            faces = card_data.get("card_faces")
-            image_front_link = faces[0].get("image_uris", {}).get("png")
-            image_back_link = faces[1].get("image_uris", {}).get("png")
-            self.filepath_front = COMMANDER_FRONT_IMG_PATH
-            self.filepath_back = COMMANDER_BACK_IMG_PATH
-            urllib.request.urlretrieve(image_front_link, self.filepath_front)
-            time.sleep(0.1)
-            urllib.request.urlretrieve(image_back_link, self.filepath_back)
-            time.sleep(0.1)
-            self.original_commander_pixmap = QPixmap(self.filepath_front)
+        Loads the image(s) for a given card in the given Scryfall size, including
+        both faces of double-faced cards, through the image cache. Runs on a pool
+        thread and returns (cache key, image bytes) pairs; the bytes are None if
+        the decoded image is still in memory.
+        """
+        face_count = 1 if card_data.get('image_uris') else min(len(card_data.get("card_faces") or []), 2)
+        images = []
+        for face in range(face_count):
+            key, url = resolve_card_image(card_data, face, size)
+            if not url:
+                break
+            images.append((key, self.image_cache.load_bytes(key, url)))
+        if not images:
+            raise SearchError(f"No image found for {card_data.get('name')}.")
+        return images
+
+    def _fetch_card_images(self, commander, partner, size, progress=None):
+        """Loads the commander's and (if given) the partner's images. Runs on a pool thread."""
+        result = {"image_size": size, "commander_images": self._load_card_images(commander, size), "partner_image": None}
+        if partner and partner.get('image_uris'):
+            result["partner_image"] = self._load_card_images(partner, size)[0]
+        return result
+
+    def _display_card_images(self, images):
+        """Decodes loaded commander image(s) and sets them up for display."""
+        self.commander_face_keys = [key for key, _ in images]
+        pixmaps = [self.image_cache.pixmap(key, data) for key, data in images]
+        if len(images) > 1:
             self.commanderImageFlip.setEnabled(True)
             self.commanderImageFlip.setVisible(True)
-        else:
-            self._set_status(f"No image found for {card_data.get('name')}.", is_error=True)
-            return False
-        return True
+        # Keep showing the face the user flipped to when a larger image is swapped in
+        self.original_commander_pixmap = pixmaps[self.times_clicked_flip % len(pixmaps)]
 
-    def search(self):
-        self._reset_ui_state()
-        self._set_status("Looking for specified card...")
+    def _request_image_size(self, size):
+        """
+        Loads the displayed cards in a larger image size in the background and
+        swaps them in once they have arrived. Does nothing if that size (or a
+        larger one) is already shown or on its way.
+        """
+        if not self._displayed_cards:
+            return
+        rank = image_size_rank(size)
+        if rank <= image_size_rank(self._image_size) or rank <= image_size_rank(self._pending_image_size):
+            return
+        self._pending_image_size = size
+        commander, partner = self._displayed_cards
+        self._submit_search(
+            self._fetch_card_images, commander, partner, size,
+            on_result=self._on_larger_images_loaded,
+            on_error=lambda error: self._on_larger_images_error(error, size)
+        )
+
+    def _on_larger_images_loaded(self, result):
+        size = result["image_size"]
+        if size == self._pending_image_size:
+            self._pending_image_size = None
+        if image_size_rank(size) <= image_size_rank(self._image_size):
+            return # A larger size that was requested later has overtaken this one
+        self._display_card_images(result["commander_images"])
+        if result["partner_image"]:
+            self.original_partner_pixmap = self.image_cache.pixmap(*result["partner_image"])
+        # Scryfall may not offer the requested size; don't ask for it again either way.
+        self._image_size = size
+        self.update_commander_image()
 
-        query = self._build_scryfall_query()
-        payload = {"order": "edhrec", "q": query}
+    def _on_larger_images_error(self, error, size):
+        # The smaller image stays on screen, so this is not worth bothering the user with.
+        print(f"Could not load larger card image: {error}")
+        if size == self._pending_image_size:
+            self._pending_image_size = None
+            self._image_size = size # Don't retry on every resize
 
-        try:
-            response = requests.get(SCRYFALL_API_CARD_SEARCH_URL, params=payload, headers=HTTP_HEADERS)
-            time.sleep(0.1)
-            response.raise_for_status()
-            json_data = response.json().get('data')
+    def _fetch_commander(self, query, random_card, with_partner, image_size, progress, local_index=None):
+        """
+        Looks up a commander on Scryfall (or in the offline `local_index`, if it can
+        answer the query), optionally its most popular partner, and downloads the
+        card images in the given size. Runs on a pool thread.
+        """
+        commander = find_commander(query, random_card, local_index)
+        progress("Commander found.")
 
-            if not json_data:
-                self._set_status("Commander not found.", is_error=True)
-                return
+        partner = fetch_partner(commander, progress, local_index) if with_partner else None
+        result = {"commander": commander, "partner": partner, "image_size": image_size}
+        result.update(self._fetch_card_images(commander, partner, image_size))
+        return result
 
-            commander = json_data[0]
-            self.data['commander'] = commander
-            self._set_status("Commander found.")
+    # --- Offline Commander Index --- #
 
-            if self.partnerSearch.isChecked():
-                if not self._handle_partner_search(commander):
-                    return
-            else:
-                if not self._download_and_display_card_image(commander):
-                    return
+    def _local_index(self):
+        """Returns the offline commander index if it is enabled and built, else None."""
+        if not self.useLocalIndex.isChecked():
+            return None
+        index = get_commander_index()
+        return index if index.is_built else None
+
+    def _on_local_index_toggled(self, checked):
+        if checked:
+            self.refresh_local_index()
+        self._update_name_source()
+
+    def _update_name_source(self):
+        """Completes commander names from the offline index while it is enabled and built."""
+        self.nameCompleter.set_name_source(self._local_index())
+
+    def refresh_local_index(self, force=False):
+        """Builds the offline commander index, or updates it if Scryfall released new card data."""
+        index = get_commander_index()
+        if self._index_refresh_running or not (force or index.needs_refresh_check()):
+            return
+        self._index_refresh_running = True
+        self.request_pipeline.submit(
+            index.refresh, force=force,
+            on_result=self._on_local_index_refreshed, on_error=self._on_local_index_error,
+            on_progress=self._set_status
+        )
+
+    def _on_local_index_refreshed(self, updated):
+        self._index_refresh_running = False
+        index = get_commander_index()
+        if updated or self.nameCompleter.name_index is None:
+            self._update_name_source()
+        if updated:
+            self._set_status(f"Offline card index ready ({index.count()} commanders).")
+        else:
+            self._set_status("Offline card index is up to date.")
 
-            self.update_commander_image()
+    def _on_local_index_error(self, error):
+        self._index_refresh_running = False
+        print(f"Could not refresh the offline card index: {error}")
+        if get_commander_index().is_built:
+            self._set_status("Could not update the offline card index, using the existing one.", is_error=True)
+        else:
+            self._set_status(f"Could not build the offline card index: {error}", is_error=True)
 
-        except requests.exceptions.RequestException as e:
-            self._set_status(f"API request error: {e}", is_error=True)
-            self.commanderImage.setText("Failed to load data.")
+    def search(self):
+        self._reset_ui_state()
+        self._set_status("Looking for specified card...")
+
+        self._search_generation += 1
+        self._cancel_deck_prefetch()
+        self._submit_search(
+            self._fetch_commander, self._build_scryfall_query(),
+            random_card=False, with_partner=self.partnerSearch.isChecked(),
+            image_size=select_image_size(self._target_image_height()), local_index=self._local_index(),
+            on_result=self._on_commander_loaded, on_error=self._on_search_error
+        )
 
     def search_random(self):
         self._reset_ui_state()
         self._set_status("Finding random commander...")
 
-        query = self._build_scryfall_query()
-        payload = {"q": query}
-
-        try:
-            response = requests.get(SCRYFALL_API_CARD_RANDOM_URL, params=payload, headers=HTTP_HEADERS)
-            time.sleep(0.1)
-            response.raise_for_status()
-            commander = response.json()
-
-            if not commander:
-                self._set_status("Commander not found.", is_error=True)
-                return
-
-            self.data['commander'] = commander
-
-            if self.partnerSearch.isChecked():
-                if not self._handle_partner_search(commander):
-                    return
+        self._search_generation += 1
+        self._cancel_deck_prefetch()
+        self._submit_search(
+            self._fetch_commander, self._build_scryfall_query(),
+            random_card=True, with_partner=self.partnerSearch.isChecked(),
+            image_size=select_image_size(self._target_image_height()), local_index=self._local_index(),
+            on_result=self._on_commander_loaded, on_error=self._on_search_error
+        )
+
+    def _on_commander_loaded(self, result):
+        """Displays the result of a (random) commander search."""
+        self._display_card_images(result["commander_images"])
+
+        partner = result["partner"]
+        if partner:
+            if result["partner_image"]:
+                self.original_partner_pixmap = self.image_cache.pixmap(*result["partner_image"])
+                self.partnerImage.setVisible(True)
+                self._set_status(f"Most popular partner: {partner.get('name')}.")
             else:
-                if not self._download_and_display_card_image(commander):
-                    return
-
-            self.update_commander_image()
+                # Partners are not typically double-faced. We can proceed without the partner image.
+                self._set_status(f"No image found for partner {partner.get('name')}.", is_error=True)
+            self.data['partner'] = partner
+        else:
             self._set_status("Commander found.")
 
-        except requests.exceptions.RequestException as e:
-            self._set_status(f"API request error: {e}", is_error=True)
+        self.data['commander'] = result["commander"]
+        self._displayed_cards = (result["commander"], partner)
+        self._image_size = result["image_size"]
+        self.update_commander_image()
+        if PROGRESSIVE_IMAGE_LOADING:
+            self._request_image_size("png")
+        if DECK_TABLE_PREFETCH:
+            self._start_deck_prefetch(result["commander"], partner)
+        if BROWSER_PREWARM == "after_search" or (BROWSER_PREWARM == "after_bot_check" and bot_challenge_seen()):
+            self._prewarm_browser()
+        elif BROWSER_PREWARM == "idle":
+            self._browser_prewarm_timer.start()  # Restarts the countdown
+
+    def _on_search_error(self, error):
+        if isinstance(error, SearchError):
+            self._set_status(str(error), is_error=True)
+        elif http_client.is_request_error(error):
+            self._set_status(f"API request error: {error}", is_error=True)
             self.commanderImage.setText("Failed to load data.")
+        else:
+            self._set_status(f"An unexpected error occurred: {error}", is_error=True)
 
-    def _handle_partner_search(self, commander):
-        self._set_status(f"Looking up most popular partner for {commander.get('name')}...")
-
-        edhrec_link = commander.get("related_uris", {}).get("edhrec")
-        if not edhrec_link:
-            self._set_status(f"No EDHRec link found for {commander.get('name')}.", is_error=True)
-            return False
-
-        try:
-            response_edhrec = requests.get(edhrec_link)
-            response_edhrec.raise_for_status()
-            deck_slug = response_edhrec.url.rsplit("/", 1)[-1].replace("?cc=", "")
-
-            partner_page_url = EDHREC_PARTNERS_URL_TPL.format(slug=deck_slug)
-            response = requests.get(partner_page_url)
-            response.raise_for_status()
-
-            soup = bs4.BeautifulSoup(response.text, 'html.parser')
-            partner_list = soup.find("div", class_=re.compile("cardlist"))
-            if not partner_list:
-                self._set_status(f"Could not find partner list for {commander.get('name')}.", is_error=True)
-                return False
-
-            first_partner_span = partner_list.find("span", class_=re.compile("Card_name"))
-            if not first_partner_span:
-                self._set_status(f"Could not find a partner for {commander.get('name')}.", is_error=True)
-                return False
-
-            partner_name = first_partner_span.get_text()
-            self._set_status(f"Most popular partner: {partner_name}. Fetching image...")
-
-            # Fetch partner card data from Scryfall
-            payload = {"order": "edhrec", "q": f'"{partner_name}" is:commander game:paper'}
-            fetch_partner_resp = requests.get(SCRYFALL_API_CARD_SEARCH_URL, params=payload, headers=HTTP_HEADERS)
-            fetch_partner_resp.raise_for_status()
-            json_data = fetch_partner_resp.json().get('data')
-            if not json_data:
-                self._set_status(f"Could not find card data for partner: {partner_name}", is_error=True)
-                return False
-
-            partner = json_data[0]
-            self.data['partner'] = partner
-
-            # Download commander image (including double-faced)
-            if not self._download_and_display_card_image(commander):
-                return False # Cannot proceed without commander image
-
-            # Download partner image
-            p_image_uris = partner.get('image_uris', {})
-            if p_image_uris.get('png'):
-                 urllib.request.urlretrieve(p_image_uris.get('png'), PARTNER_IMG_PATH)
-                 self.original_partner_pixmap = QPixmap(PARTNER_IMG_PATH)
-                 self.partnerImage.setVisible(True)
-            else:
-                # Partners are not typically double-faced, but good to be safe
-                self._set_status(f"No image found for partner {partner.get('name')}.", is_error=True)
-                # We can proceed without the partner image, so we don't return False
-
-            return True
-
-        except requests.exceptions.RequestException as e:
-            self._set_status(f"API request error during partner search: {e}", is_error=True)
-            return False
-        except Exception as e:
-            self._set_status(f"An error occurred during partner search: {e}", is_error=True)
-            return False
-
-    def update_commander_image(self):
-        """Scales the original pixmap and displays it in the label."""
+    def update_commander_image(self, smooth=True):
+        """
+        Scales the original pixmap and displays it in the label. Smoothly scaled
+        pixmaps are cached per height; `smooth=False` is used while the window is being resized.
+        """
         min_height = int(self.height() * (2 / 3))
         self.commanderImage.setMinimumHeight(min_height)
         self.partnerImage.setMinimumHeight(min_height)
 
         if self.original_commander_pixmap:
-            # In a test environment, widget height might be 0 initially.
-            # Use the window's minimum height calculation as a reliable fallback.
-            target_height = self.commanderImage.height()
-            if target_height <= 0:
-                target_height = min_height
-            scaled_pixmap = self.original_commander_pixmap.scaledToHeight(
-                self.commanderImage.height(),
-                Qt.SmoothTransformation
-            )
+            if smooth:
+                # Fetch a larger image in the background if the current one would have to be upscaled
+                self._request_image_size(select_image_size(self._target_image_height()))
+            scaled_pixmap = self.scaled_cache.scaled(
+                self.original_commander_pixmap, self.commanderImage.height(), smooth)
             self.commanderImage.setPixmap(scaled_pixmap)
         else:
             self.commanderImage.clear()
 
         if self.original_partner_pixmap:
-            scaled_partner_pixmap = self.original_partner_pixmap.scaledToHeight(
-                self.partnerImage.height(),
-                Qt.SmoothTransformation
-            )
+            scaled_partner_pixmap = self.scaled_cache.scaled(
+                self.original_partner_pixmap, self.partnerImage.height(), smooth)
             self.partnerImage.setPixmap(scaled_partner_pixmap)
         else:
             self.partnerImage.clear()
 
     def flip_image(self):
-        if self.times_clicked_flip % 2 == 0:
-            self.original_commander_pixmap = QPixmap(self.filepath_back)
-        else:
-            self.original_commander_pixmap = QPixmap(self.filepath_front)
+        if len(self.commander_face_keys) < 2:
+            return
+        face_key = self.commander_face_keys[(self.times_clicked_flip + 1) % 2]
+        self.original_commander_pixmap = self.image_cache.pixmap(face_key)
 
         self.times_clicked_flip += 1
         self.update_commander_image()
@@ -399,105 +542,176 @@ class MainWindow(QMainWindow):
     def resizeEvent(self, event):
         """Called when the window is resized."""
         super().resizeEvent(event)
+        self.update_commander_image(smooth=False)
+        self._resize_timer.start() # Restarts the countdown on every resize tick
+
+    def _on_resize_settled(self):
         self.update_commander_image()
 
-    def _get_edhrec_deck_table(self):
-        """Fetches and parses the deck table from EDHRec for a commander or partner pair."""
+    # Jobs run on pool threads, see core.deck_finder
+    _fetch_edhrec_deck_table = staticmethod(fetch_deck_table)
+    _fetch_deck_link = staticmethod(fetch_deck_link)
+    _fetch_and_scrape_deck = staticmethod(scrape_deck)
+
+    def _selected_deck_owner(self):
+        """
+        Returns (commander, partner or None) whose decks should be fetched, or None
+        after showing an error if the required search has not been done yet.
+        """
         if self.partnerSearch.isChecked():
             if 'commander' not in self.data or 'partner' not in self.data:
                 self._set_status("Please search for a commander and partner first.", is_error=True)
                 return None
+            return self.data['commander'], self.data['partner']
+        if "commander" not in self.data:
+            self._set_status("Please search for a commander first.", is_error=True)
+            return None
+        return self.data['commander'], None
+
+    def _deck_filter_queries(self):
+        """Returns the (budget, tags, salt) filter queries entered in the UI."""
+        return (
+            self.price_limit.text().strip(),
+            self.tags_input.text().strip().lower(),
+            self.salt_input.text().strip()
+        )
+
+    @staticmethod
+    def _format_deck_summary(deck):
+        """Describes an EDHRec deck table row by its price, tags and salt score."""
+        tags = deck.get('tags')
+        if tags == []: tags = "[No tags]"
+        salt = round(deck.get('salt'), 2)
+        return f"${deck.get('price')} with the tags {tags} and salt score {salt}"
+
+    # --- Browser Pre-warming --- #
+
+    def _prewarm_browser(self):
+        """
+        Launches a headless browser on its own thread unless one is idle already, see
+        DriverPool.prewarm. Failures are not shown; the scrape that needs the browser reports them.
+        """
+        if self._browser_prewarm_thread is not None and self._browser_prewarm_thread.is_alive():
+            return
+        self._browser_prewarm_thread = get_driver_pool().prewarm_in_background()
 
-            commander_slug_part = self.data['commander'].get("name", "").lower().replace(" ", "-").replace(",", "")
-            partner_slug_part = self.data['partner'].get("name", "").lower().replace(" ", "-").replace(",", "")
-            # This is a guess, EDHRec URL slugs can be complex. A more robust way is needed if this fails.
-            # Let's try to get it from the edhrec page url itself
-            comm_edhrec_url = self.data['commander'].get("related_uris", {}).get("edhrec")
-            part_edhrec_url = self.data['partner'].get("related_uris", {}).get("edhrec")
-            if not comm_edhrec_url or not part_edhrec_url:
-                self._set_status("EDHRec links missing for commander or partner.", is_error=True)
-                return None
-
-            comm_slug = requests.get(comm_edhrec_url).url.rsplit("/", 1)[-1].replace("?cc=", "")
-            part_slug = requests.get(part_edhrec_url).url.rsplit("/", 1)[-1].replace("?cc=", "")
-
-            decks_site_url = EDHREC_DECKS_URL_TPL.format(slug=f"{comm_slug}-{part_slug}")
-        else:
-            if "commander" not in self.data:
-                self._set_status("Please search for a commander first.", is_error=True)
-                return None
+    # --- Deck Table Prefetch --- #
 
-            edhrec_link = self.data["commander"].get("related_uris", {}).get("edhrec")
-            if not edhrec_link:
-                self._set_status("No EDHRec link found for commander.", is_error=True)
-                return None
+    @staticmethod
+    def _deck_owner_key(commander, partner):
+        def card_key(card):
+            return card.get("id") or card.get("name") if card else None
+        return card_key(commander), card_key(partner)
 
-            # Follow redirect to get the correct slug
-            response_edhrec = requests.get(edhrec_link)
-            response_edhrec.raise_for_status()
-            name_slug = response_edhrec.url.rsplit("/", 1)[-1].replace("?cc=", "")
-            decks_site_url = EDHREC_DECKS_URL_TPL.format(slug=name_slug)
+    def _start_deck_prefetch(self, commander, partner):
+        """
+        Speculatively fetches the deck table of the commander (and partner) that was
+        just found, as "Get Decklist" is usually the next click.
+        """
+        self._cancel_deck_prefetch()
+        prefetch = DeckTablePrefetch(self._deck_owner_key(commander, partner))
+        self._deck_prefetch = prefetch
+        # Not bound to the search generation: a deck fetch may still be waiting for
+        # it after a new search started. Its progress messages are not shown.
+        prefetch.worker = self.request_pipeline.submit(
+            self._fetch_edhrec_deck_table, commander, partner,
+            on_result=lambda table: self._on_deck_prefetch_done(prefetch, table),
+            on_error=lambda error: self._on_deck_prefetch_done(prefetch, None, error)
+        )
+
+    def _on_deck_prefetch_done(self, prefetch, table, error=None):
+        if table is not None:
+            self._learn_deck_tags(table)
+        prefetch.table = table
+        prefetch.failed = error is not None
+        waiters, prefetch.waiters = prefetch.waiters, []
+        for on_result, on_error in waiters:
+            if error is None:
+                on_result(table)
+            else:
+                on_error(error)
 
-        # Fetch the decks page and parse __NEXT_DATA__
-        response = requests.get(decks_site_url)
-        response.raise_for_status()
+    def _cancel_deck_prefetch(self):
+        """Drops the prefetch of the previous commander unless a deck fetch is already waiting for it."""
+        prefetch, self._deck_prefetch = self._deck_prefetch, None
+        if prefetch is not None and not prefetch.waiters and prefetch.worker is not None:
+            self.request_pipeline.cancel(prefetch.worker)
 
-        soup = bs4.BeautifulSoup(response.text, 'html.parser')
-        next_data_script = soup.find('script', {'id': '__NEXT_DATA__'})
-        if not next_data_script:
-            self._set_status("Could not find deck data on the page.", is_error=True)
-            return None
+    def _load_deck_table(self, commander, partner, on_result, on_error):
+        """
+        Delivers the deck table of a commander (and partner) to the callbacks. Uses
+        the prefetched table if there is one, waits for a running prefetch, and
+        fetches the table itself otherwise.
+        """
+        prefetch = self._deck_prefetch
+        if prefetch is not None and prefetch.owner == self._deck_owner_key(commander, partner):
+            if prefetch.table is not None:
+                on_result(prefetch.table)
+                return
+            if not prefetch.done:
+                self._set_status("Fetching decks from EDHRec...")
+                prefetch.waiters.append((on_result, on_error))
+                return
+            # A failed prefetch is retried in the foreground so its error is shown.
 
-        data = json.loads(next_data_script.string)
-        deck_table = data.get('props', {}).get('pageProps', {}).get('data', {}).get('table', [])
-        if not deck_table:
-            self._set_status("No decks found in the data.", is_error=True)
-            return None
+        self.request_pipeline.submit(
+            self._fetch_edhrec_deck_table, commander, partner,
+            on_result=lambda table: on_result(self._learn_deck_tags(table)),
+            on_error=on_error, on_progress=self._set_status
+        )
 
+    def _learn_deck_tags(self, deck_table):
+        """Offers the tags of fetched decks for completion, too. Returns the table."""
+        self.tagCompleter.add_tags(tag for deck in deck_table for tag in deck.get("tags") or ())
         return deck_table
 
     def fetch_first_decklist_in_budget(self):
         self.errorLabel.setVisible(False)
 
-        try:
-            deck_table = self._get_edhrec_deck_table()
-            if deck_table is None:
-                return # Error was already set by the helper method
-
-            budget_query = self.price_limit.text().strip()
-            tags_query = self.tags_input.text().strip().lower()
-            salt_query = self.salt_input.text().strip()
-
+        owner = self._selected_deck_owner()
+        if owner is None:
+            return
+        commander, partner = owner
 
-            first_deck_found = filter_decks(deck_table, budget_query, tags_query, salt_query)
+        self.get_Decklist.setEnabled(False)
+        self._load_deck_table(commander, partner, self._on_deck_table_loaded, self._on_deck_fetch_error)
 
-            if first_deck_found:
-                price = first_deck_found.get('price')
-                tags = first_deck_found.get('tags')
-                if tags == []: tags = "[No tags]"
-                salt = round(first_deck_found.get('salt'), 2)
-                self.deckPriceLabel.setText(f"Decklist found for ${price} with the tags {tags} and salt score {salt}")
-                self.deckPriceLabel.setEnabled(True)
+    def _on_deck_table_loaded(self, deck_table):
+        """Filters the fetched EDHRec deck table and starts scraping the first match."""
+        try:
+            first_deck_found = filter_decks(deck_table, *self._deck_filter_queries(),
+                                            sort_order=self.deckSort.currentData())
+        except (ValueError, IndexError):
+            self._set_status("Invalid budget format. Use numbers, '>', '<', or '-'.", is_error=True)
+            self.get_Decklist.setEnabled(True)
+            return
 
-                deck_url_hash = first_deck_found.get("urlhash")
-                deck_preview_link = EDHREC_DECK_PREVIEW_URL_TPL.format(hash=deck_url_hash)
+        if first_deck_found:
+            price = first_deck_found.get('price')
+            self.deckPriceLabel.setText(f"Decklist found for {self._format_deck_summary(first_deck_found)}")
+            self.deckPriceLabel.setEnabled(True)
 
-                self._set_status(f"Found deck for ${price}. Preparing to fetch...")
-                print(f"Found deck within budget: {deck_preview_link}")
+            deck_preview_link = deck_page_url(first_deck_found)
 
-                self.data['deck_page'] = deck_preview_link
-                self.start_decklist_scraping()
-            else:
-                self._set_status("No decks found matching your filters.", is_error=True)
+            self._set_status(f"Found deck for ${price}. Preparing to fetch...")
+            print(f"Found deck within budget: {deck_preview_link}")
 
-        except (ValueError, IndexError):
-            self._set_status("Invalid budget format. Use numbers, '>', '<', or '-'.", is_error=True)
-        except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
-            self._set_status(f"Network error fetching deck data: {e}", is_error=True)
-        except Exception as e:
-            print(f"Unexpected error in fetch_first_decklist_in_budget: {e}")
-            self._set_status(f"An unexpected error occurred: {e}", is_error=True)
+            self.data['deck_page'] = deck_preview_link
+            self.start_decklist_scraping()
+        else:
+            self._set_status("No decks found matching your filters.", is_error=True)
+            self.get_Decklist.setEnabled(True)
+
+    def _on_deck_fetch_error(self, error):
+        if isinstance(error, SearchError):
+            self._set_status(str(error), is_error=True)
+        elif http_client.is_request_error(error):
+            print(f"Request error: {error}")
+            self._set_status(f"Network error fetching deck data: {error}", is_error=True)
+        else:
+            print(f"Unexpected error in fetch_first_decklist_in_budget: {error}")
+            self._set_status(f"An unexpected error occurred: {error}", is_error=True)
+        self.get_Decklist.setEnabled(True)
 
     def start_decklist_scraping(self):
         self.errorLabel.setVisible(False)
@@ -505,47 +719,163 @@ class MainWindow(QMainWindow):
 
         if not deck_page:
             self._set_status("Deck page not accessible.", is_error=True)
+            self.get_Decklist.setEnabled(True)
+            return
+
+        self.get_Decklist.setEnabled(False)
+        self.request_pipeline.submit(
+            self._fetch_deck_link, deck_page,
+            on_result=self._on_deck_link_loaded, on_error=self._on_deck_link_error
+        )
+
+    def _on_deck_link_loaded(self, deck_link):
+        """Starts the Selenium worker for a supported deck hosting site."""
+        if is_supported_deck_link(deck_link):
+            site_name = "Moxfield" if "moxfield" in deck_link else "Archidekt"
+            self._set_status(f"Fetching from {site_name}...")
+
+            self.thread = QThread()
+            self.worker = DecklistScraperWorker(deck_link)
+            self.worker.moveToThread(self.thread)
+            self.thread.started.connect(self.worker.run)
+            self.worker.decklist_ready.connect(self.on_decklist_scraped)
+            self.worker.failed.connect(self.on_scrape_failed)
+            self.worker.finished.connect(self._on_scraper_finished)
+            self.thread.start()
+        else:
+            self._set_status(f"Unsupported site for scraping: {deck_link}", is_error=True)
+            self.get_Decklist.setEnabled(True)
+
+    def _on_deck_link_error(self, error):
+        print(f"Request error: {error}")
+        self._set_status("Not a valid deck link.", is_error=True)
+        self.get_Decklist.setEnabled(True)
+
+    # --- Batch Deck Fetching --- #
+
+    def fetch_top_decklists(self):
+        """Fetches the EDHRec deck table and scrapes the top N matching decks concurrently."""
+        self.errorLabel.setVisible(False)
+
+        owner = self._selected_deck_owner()
+        if owner is None:
+            return
+        commander, partner = owner
+
+        # A new batch replaces the previous one; its queued scrapes are dropped.
+        self._batch_generation += 1
+        self.batch_pipeline.cancel_pending()
+        self.get_TopDecks.setEnabled(False)
+        generation = self._batch_generation
+        self._load_deck_table(
+            commander, partner,
+            lambda table: self._on_batch_table_loaded(table, generation), self._on_batch_table_error
+        )
+
+    def _on_batch_table_loaded(self, deck_table, generation):
+        """Picks the top matching decks and queues one resolve-and-scrape job per deck."""
+        self.get_TopDecks.setEnabled(True)
+        if generation != self._batch_generation:
             return
 
         try:
-            response = requests.get(deck_page)
-            response.raise_for_status()
-            soup = bs4.BeautifulSoup(response.text, 'html.parser')
-            next_data_script = soup.find('script', {'id': '__NEXT_DATA__'})
-            data = json.loads(next_data_script.string)
-            deck_link = data.get("props", {}).get("pageProps", {}).get("data", {}).get("url", "")
-
-            if "moxfield.com" in deck_link or "archidekt.com" in deck_link:
-                self.get_Decklist.setEnabled(False)
-                site_name = "Moxfield" if "moxfield" in deck_link else "Archidekt"
-                self._set_status(f"Fetching from {site_name}...")
-
-                self.thread = QThread()
-                self.worker = DecklistScraperWorker(deck_link)
-                self.worker.moveToThread(self.thread)
-                self.thread.started.connect(self.worker.run)
-                self.worker.finished.connect(self.on_selenium_finished)
-                self.thread.start()
-            else:
-                self._set_status(f"Unsupported site for scraping: {deck_link}", is_error=True)
+            decks = find_matching_decks(deck_table, *self._deck_filter_queries(),
+                                        limit=self.deckCount.value(), sort_order=self.deckSort.currentData())
+        except (ValueError, IndexError):
+            self._set_status("Invalid budget format. Use numbers, '>', '<', or '-'.", is_error=True)
+            return
 
-        except requests.exceptions.RequestException as e:
-            print(f"Request error: {e}")
-            self._set_status("Not a valid deck link.", is_error=True)
+        if not decks:
+            self._set_status("No decks found matching your filters.", is_error=True)
+            return
+
+        self.deckList.clear()
+        self.deckList.setVisible(True)
+        self._batch_pending = len(decks)
+        self._set_status(f"Fetching {len(decks)} decklists...")
+
+        for rank, deck in enumerate(decks, start=1):
+            item = QListWidgetItem(f"{rank}. {self._format_deck_summary(deck)} - fetching...")
+            self.deckList.addItem(item)
+            self.batch_pipeline.submit(
+                self._fetch_and_scrape_deck, deck_page_url(deck),
+                on_result=self._batch_slot(generation, self._on_batch_deck_loaded, item, rank, deck),
+                on_error=self._batch_slot(generation, self._on_batch_deck_error, item, rank, deck)
+            )
+
+    def _batch_slot(self, generation, slot, *args):
+        """Binds a batch job callback to its list item and drops it once the batch was replaced."""
+        def wrapper(value):
+            if generation == self._batch_generation:
+                slot(value, *args)
+        return wrapper
+
+    def _on_batch_table_error(self, error):
+        self.get_TopDecks.setEnabled(True)
+        self._on_deck_fetch_error(error)
+
+    def _on_batch_deck_loaded(self, decklist, item, rank, deck):
+        item.setText(f"{rank}. {self._format_deck_summary(deck)} - ready")
+        item.setData(Qt.UserRole, decklist)
+        self._on_batch_deck_done()
+
+    def _on_batch_deck_error(self, error, item, rank, deck):
+        print(f"Batch scrape error for {deck.get('urlhash')}: {error}")
+        item.setText(f"{rank}. {self._format_deck_summary(deck)} - failed: {error}")
+        item.setForeground(Qt.red)
+        self._on_batch_deck_done()
+
+    def _on_batch_deck_done(self):
+        self._batch_pending -= 1
+        if self._batch_pending > 0:
+            return
+        fetched = sum(1 for row in range(self.deckList.count())
+                      if self.deckList.item(row).data(Qt.UserRole) is not None)
+        self._set_status(f"Fetched {fetched} of {self.deckList.count()} decklists. Double-click one to copy it.")
+
+    def copy_deck_from_list(self, item):
+        """Copies the decklist of a finished batch entry to the clipboard."""
+        decklist = item.data(Qt.UserRole)
+        if decklist is None:
+            return
+        self._copy_decklist(decklist)
+
+    def _copy_decklist(self, decklist):
+        """Copies a Decklist to the clipboard in the selected export format."""
+        copy_to_clipboard(export_decklist(decklist, self.exportFormat.currentData()))
+        self._set_status("Decklist copied to clipboard!")
 
     def show_syntax_guide(self):
         webbrowser.open(SCRYFALL_SYNTAX_GUIDE_URL)
 
-    def on_selenium_finished(self, decklist):
-        """Handles the result from the Selenium worker thread."""
+    def show_cache_stats(self):
+        """Shows how well the HTTP response cache performs and offers to clear it."""
+        cache = response_cache.get_cache()
+        stats = cache.stats()
+        message = (
+            f"Cached responses: {stats['entries']}\n"
+            f"Size: {stats['bytes'] / 1024 / 1024:.1f} MB of {stats['max_bytes'] / 1024 / 1024:.0f} MB\n\n"
+            f"This session:\n"
+            f"Hits: {stats['hits']}, revalidated: {stats['revalidated']}, misses: {stats['misses']}\n"
+            f"Hit rate: {stats['hit_rate']:.0%}, evicted: {stats['evicted']}"
+        )
+        box = QMessageBox(QMessageBox.Information, "Cache Stats", message, parent=self)
+        box.addButton(QMessageBox.Ok)
+        clear_button = box.addButton("Clear Cache", QMessageBox.DestructiveRole)
+        box.exec()
+        if box.clickedButton() is clear_button:
+            cache.clear()
+            self._set_status("HTTP cache cleared.")
+
+    def on_decklist_scraped(self, decklist):
+        """Handles the Decklist from the scraper worker thread."""
         self.errorLabel.setVisible(False)
+        self._copy_decklist(decklist)
 
-        if "Error" in decklist:
-            self._set_status(decklist, is_error=True)
-        else:
-            pyperclip.copy(decklist)
-            self._set_status("Decklist copied to clipboard!")
+    def on_scrape_failed(self, message):
+        self._set_status(message, is_error=True)
 
+    def _on_scraper_finished(self):
         self.get_Decklist.setEnabled(True)
         if self.thread:
             self.thread.quit()
@@ -557,7 +887,10 @@ class MainWindow(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            self._cleanup_temp_files()
+            self.batch_pipeline.cancel_pending()
+            http_client.close()
+            close_commander_index()
+            shutdown_driver_pool()
             # Clean up debug screenshots
             for f in [DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH, "debug_screenshot_moxfield.png", "debug_screenshot_archidekt.png"]:
                  if os.path.isfile(f):
@@ -1,63 +1,245 @@
-def filter_decks(decks, budget_query, tags_query, salt_query):
+import heapq
+from array import array
+from itertools import islice
+
+from utils.tag_index import TagIndex
+
+# Values assumed for decks the EDHRec table lists without a price or salt score.
+DEFAULT_PRICE = float('inf')
+DEFAULT_SALT = 30.00
+
+
+class DeckTable:
+    """
+    Column-oriented view of an EDHRec deck table. Prices, salt scores and tag
+    bitmasks are extracted once, so the table can be filtered with several
+    queries without touching the deck dictionaries again. Build it once per
+    fetched deck table and pass it to every filter.
+    """
+    def __init__(self, decks, tag_index=None):
+        self.decks = list(decks)
+        self.tag_index = tag_index if tag_index is not None else TagIndex()
+        self.prices = array('d', (_number(deck.get('price'), DEFAULT_PRICE) for deck in self.decks))
+        self.salts = array('d', (_number(deck.get('salt'), DEFAULT_SALT) for deck in self.decks))
+        self.tag_masks = [self.tag_index.mask(deck.get('tags') or ()) for deck in self.decks]
+        self.savedates = [deck.get('savedate') or "" for deck in self.decks]
+
+    def __len__(self):
+        return len(self.decks)
+
+    def __iter__(self):
+        return iter(self.decks)
+
+
+def _number(value, default):
+    return default if value is None else float(value)
+
+
+class RangeFilter:
+    """
+    A parsed budget or salt query:
+    "a-b" matches a <= x <= b, ">a" matches x > a, "<b" and a plain "b" match x <= b.
+    """
+    def __init__(self, query):
+        if "-" in query:
+            self.low, self.high = map(float, query.split('-'))
+            self.low_inclusive = True
+        elif ">" in query:
+            self.low, self.high = float(query.replace('>', '')), float('inf')
+            self.low_inclusive = False
+        elif "<" in query:
+            self.low, self.high = float('-inf'), float(query.replace('<', ''))
+            self.low_inclusive = True
+        else:  # A single number is treated as the maximum
+            self.low, self.high = float('-inf'), float(query)
+            self.low_inclusive = True
+
+    def contains(self, value):
+        if self.low_inclusive:
+            return self.low <= value <= self.high
+        return self.low < value <= self.high
+
+    def select(self, column, rows):
+        """Returns the rows whose value in `column` lies within the range."""
+        low, high = self.low, self.high
+        if self.low_inclusive:
+            return [row for row in rows if low <= column[row] <= high]
+        return [row for row in rows if low < column[row] <= high]
+
+
+class TagFilter:
+    """A parsed comma-separated tag query. Every fragment must be part of at least one deck tag."""
+    def __init__(self, query):
+        self.fragments = tuple(t.strip().lower() for t in query.split(',') if t.strip())
+
+    def mask(self, tag_index):
+        """Returns the bitmask of every tag matched by any fragment."""
+        mask = 0
+        for fragment in self.fragments:
+            mask |= tag_index.fragment_mask(fragment)
+        return mask
+
+    def fragment_masks(self, tag_index):
+        """Returns one bitmask per fragment, or None if a fragment matches no tag at all."""
+        masks = [tag_index.fragment_mask(fragment) for fragment in self.fragments]
+        return None if not all(masks) else masks
+
+    def select(self, table, rows):
+        """Returns the rows whose tags contain every fragment, using the table's tag bitmasks."""
+        tag_masks = table.tag_masks
+        for fragment in self.fragments:
+            fragment_mask = table.tag_index.fragment_mask(fragment)
+            if not fragment_mask:
+                return []
+            rows = [row for row in rows if tag_masks[row] & fragment_mask]
+        return rows
+
+
+class DeckFilter:
+    """
+    Budget, tag and salt queries compiled once. Evaluating the filter runs one
+    pass per active criterion over the matching columns of a DeckTable.
+    """
+    def __init__(self, budget_query="", tags_query="", salt_query=""):
+        self.budget = RangeFilter(budget_query) if budget_query else None
+        self.tags = TagFilter(tags_query) if tags_query and tags_query.strip(", ") else None
+        self.salt = RangeFilter(salt_query) if salt_query else None
+
+    def matching_rows(self, table):
+        """Returns the indices of all matching decks in table order."""
+        rows = range(len(table))
+        if self.budget:
+            rows = self.budget.select(table.prices, rows)
+        if self.tags:
+            rows = self.tags.select(table, rows)
+        if self.salt:
+            rows = self.salt.select(table.salts, rows)
+        return list(rows)
+
+    def iter_rows(self, table):
+        """Yields the indices of the matching decks in table order, checking one deck at a time."""
+        tests = []
+        if self.budget:
+            prices, budget = table.prices, self.budget
+            tests.append(lambda row: budget.contains(prices[row]))
+        if self.tags:
+            fragment_masks = self.tags.fragment_masks(table.tag_index)
+            if fragment_masks is None:
+                return
+            tag_masks = table.tag_masks
+            tests.append(lambda row: all(tag_masks[row] & mask for mask in fragment_masks))
+        if self.salt:
+            salts, salt = table.salts, self.salt
+            tests.append(lambda row: salt.contains(salts[row]))
+        for row in range(len(table)):
+            if all(test(row) for test in tests):
+                yield row
+
+    def all(self, table, limit=None):
+        """Returns the matching deck dictionaries in table order, at most `limit` of them."""
+        if limit is not None:
+            # Stops at the limit instead of filtering the whole table
+            return [table.decks[row] for row in islice(self.iter_rows(table), limit)]
+        return [table.decks[row] for row in self.matching_rows(table)]
+
+    def first(self, table):
+        """Returns the first matching deck dictionary, or None. Stops at the first match."""
+        row = next(self.iter_rows(table), None)
+        return None if row is None else table.decks[row]
+
+    def top(self, table, k, sort_order="edhrec"):
+        """
+        Returns the best `k` matching deck dictionaries by one of the RANKINGS.
+        Uses a bounded heap, so the matches are never fully sorted. Ties keep table order.
+        """
+        ranking = RANKINGS.get(sort_order)
+        if ranking is None:
+            raise ValueError(f"Unknown sort order: {sort_order}")
+        if ranking is _rank_edhrec:
+            return self.all(table, limit=k)
+        rows = self.matching_rows(table)
+        key, largest = ranking(table, self)
+        pick = heapq.nlargest if largest else heapq.nsmallest
+        return [table.decks[row] for row in pick(k, rows, key=key)]
+
+
+# --- Rankings --- #
+# Each ranking returns (key function over table rows, whether larger keys rank first).
+
+def _rank_edhrec(table, deck_filter):
+    return None, False
+
+
+def _rank_cheapest(table, deck_filter):
+    return table.prices.__getitem__, False
+
+
+def _rank_lowest_salt(table, deck_filter):
+    return table.salts.__getitem__, False
+
+
+def _rank_closest_to_ceiling(table, deck_filter):
+    # Matches never cost more than the ceiling, so the closest one is the most
+    # expensive one. Decks without a price rank last.
+    prices = table.prices
+    return (lambda row: (prices[row] == DEFAULT_PRICE, -prices[row])), False
+
+
+def _rank_most_tag_overlap(table, deck_filter):
+    query_mask = deck_filter.tags.mask(table.tag_index) if deck_filter.tags else 0
+    tag_masks = table.tag_masks
+    return (lambda row: (tag_masks[row] & query_mask).bit_count()), True
+
+
+def _rank_most_recent(table, deck_filter):
+    # EDHRec save dates are ISO formatted, so they sort chronologically as strings.
+    return table.savedates.__getitem__, True
+
+
+RANKINGS = {
+    "edhrec": _rank_edhrec,
+    "cheapest": _rank_cheapest,
+    "lowest_salt": _rank_lowest_salt,
+    "closest_to_ceiling": _rank_closest_to_ceiling,
+    "most_tag_overlap": _rank_most_tag_overlap,
+    "most_recent": _rank_most_recent,
+}
+
+
+def compile_filter(budget_query, tags_query, salt_query):
+    """
+    Parses the filter queries once. Raises ValueError (or IndexError) for
+    malformed budget or salt queries.
+    """
+    return DeckFilter(budget_query, tags_query, salt_query)
+
+
+def _as_table(decks):
+    # Plain lists still work, but building the table is the expensive part:
+    # callers filtering the same deck table repeatedly should pass a DeckTable.
+    return decks if isinstance(decks, DeckTable) else DeckTable(decks)
+
+
+def filter_decks(decks, budget_query, tags_query, salt_query, sort_order="edhrec"):
     """
-    Filters a list of decks based on budget and tag criteria.
+    Filters a list of decks (or a DeckTable) based on budget, tag and salt criteria.
 
     Returns:
-        The first matching deck dictionary, or None if no match is found.
-    """
-    for deck in decks:
-        is_match = True
-
-        # 1. Filter by budget (if provided)
-        if budget_query:
-            price = deck.get('price', float('inf'))
-            budget_match = False
-            if "-" in budget_query:
-                min_b, max_b = map(float, budget_query.split('-'))
-                if min_b <= price <= max_b: budget_match = True
-            elif ">" in budget_query:
-                min_b = float(budget_query.replace('>', ''))
-                if price > min_b: budget_match = True
-            elif "<" in budget_query:
-                max_b = float(budget_query.replace('<', ''))
-                if price <= max_b: budget_match = True
-            else:  # A single number is treated as max budget
-                max_b = float(budget_query)
-                if price <= max_b: budget_match = True
-
-            if not budget_match:
-                is_match = False
-
-        # 2. Filter by tags (if provided and still a match)
-        if is_match and tags_query:
-            search_tags = [t.strip() for t in tags_query.split(',') if t.strip()]
-            deck_tags_lower = [t.lower() for t in deck.get("tags", [])]
-            if not all(any(search_tag in deck_tag for deck_tag in deck_tags_lower) for search_tag in search_tags):
-                is_match = False
-
-        # 3. Filter by salt score
-        if is_match and salt_query:
-            salt_match = False
-            salt = deck.get('salt', 30.00)
-            if "-" in salt_query:
-                min_s, max_s = map(float, salt_query.split('-'))
-                if min_s <= salt <= max_s: salt_match = True
-            elif ">" in salt_query:
-                min_s = float(salt_query.replace('>', ''))
-                if salt > min_s: salt_match = True
-            elif "<" in salt_query:
-                max_s = float(salt_query.replace('<', ''))
-                if salt <= max_s: salt_match = True
-            else:  # A single number is treated as max salt score
-                max_s = float(salt_query)
-                if salt <= max_s: salt_match = True
-
-            if not salt_match:
-                is_match = False
-
-
-        # If all active filters passed, we found our deck
-        if is_match:
-            return deck
-
-    return None # No deck found
\ No newline at end of file
+        The best matching deck dictionary according to `sort_order` (the first
+        one in table order by default), or None if no match is found.
+    """
+    matches = compile_filter(budget_query, tags_query, salt_query).top(_as_table(decks), 1, sort_order)
+    return matches[0] if matches else None
+
+
+def find_matching_decks(decks, budget_query, tags_query, salt_query, limit=None, sort_order="edhrec"):
+    """
+    Filters a list of decks (or a DeckTable) based on budget, tag and salt criteria.
+
+    Returns:
+        The matching deck dictionaries, best first according to `sort_order`
+        (see RANKINGS), at most `limit` of them.
+    """
+    table = _as_table(decks)
+    return compile_filter(budget_query, tags_query, salt_query).top(
+        table, len(table) if limit is None else limit, sort_order)
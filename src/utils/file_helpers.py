@@ -1,6 +1,8 @@
 import os
 import sys
 
+from config.constants import APP_NAME, CACHE_DIR_ENV_VAR
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -10,4 +12,22 @@ def resource_path(relative_path):
         # In development, use the script's directory
         base_path = os.path.dirname(os.path.abspath(sys.argv[0])) or os.getcwd()
 
-    return os.path.join(base_path, relative_path)
\ No newline at end of file
+    return os.path.join(base_path, relative_path)
+
+
+def user_cache_dir(*subdirs):
+    """ Get (and create) the per-user cache directory of the app, optionally a subdirectory of it """
+    base_path = os.environ.get(CACHE_DIR_ENV_VAR)
+    if not base_path:
+        if sys.platform == "win32":
+            local_app_data = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+            base_path = os.path.join(local_app_data, APP_NAME, "Cache")
+        elif sys.platform == "darwin":
+            base_path = os.path.join(os.path.expanduser("~"), "Library", "Caches", APP_NAME)
+        else:
+            xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            base_path = os.path.join(xdg_cache, APP_NAME)
+
+    path = os.path.join(base_path, *subdirs)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,154 @@
+import json
+import re
+
+# The JSON a Next.js page (EDHRec, Archidekt) embeds for hydration.
+_NEXT_DATA_OPEN = r'<script[^>]*\bid\s*=\s*["\']?__NEXT_DATA__["\']?[^>]*>'
+_NEXT_DATA_OPEN_STR = re.compile(_NEXT_DATA_OPEN, re.IGNORECASE)
+_NEXT_DATA_OPEN_BYTES = re.compile(_NEXT_DATA_OPEN.encode("ascii"), re.IGNORECASE)
+_SCRIPT_CLOSE_STR = re.compile(r'</script\s*>', re.IGNORECASE)
+_SCRIPT_CLOSE_BYTES = re.compile(rb'</script\s*>', re.IGNORECASE)
+
+# Tokens used to step over JSON values without decoding them.
+_WHITESPACE = re.compile(r'\s*')
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_STRUCTURAL = re.compile(r'[\[\]{}"]')
+_SCALAR = re.compile(r'[^,}\]\s]*')
+_decoder = json.JSONDecoder()
+
+
+def find_next_data(page):
+    """
+    Returns the raw JSON text of a page's <script id="__NEXT_DATA__"> tag, or None.
+    `page` may be the HTML as str or as undecoded bytes; only the script body is decoded then.
+    No DOM is built, the page is scanned for the tag directly.
+    """
+    if isinstance(page, (bytes, bytearray)):
+        opening, closing = _NEXT_DATA_OPEN_BYTES, _SCRIPT_CLOSE_BYTES
+    else:
+        opening, closing = _NEXT_DATA_OPEN_STR, _SCRIPT_CLOSE_STR
+
+    start = opening.search(page)
+    if start is None:
+        return None
+    end = closing.search(page, start.end())
+    if end is None:
+        return None
+    text = page[start.end():end.start()]
+    if isinstance(text, (bytes, bytearray)):
+        text = text.decode("utf-8", errors="replace")
+    return text
+
+
+def load_next_data(page):
+    """Returns the parsed __NEXT_DATA__ JSON of a Next.js page, or None if the page has none."""
+    text = find_next_data(page)
+    return json.loads(text) if text is not None else None
+
+
+def json_value_at(text, path, default=None):
+    """
+    Decodes only the value at `path` (a sequence of object keys and list indices)
+    of a JSON document. Everything before it is stepped over token-wise without
+    building Python objects. Returns `default` if the path does not exist.
+    """
+    pos = _seek(text, 0, path)
+    if pos is None:
+        return default
+    value, _ = _decoder.raw_decode(text, pos)
+    return value
+
+
+def next_data_value(page, path, default=None):
+    """Returns the value at `path` inside a page's __NEXT_DATA__, or `default`."""
+    text = find_next_data(page)
+    if text is None:
+        return default
+    return json_value_at(text, path, default)
+
+
+def _skip_whitespace(text, pos):
+    return _WHITESPACE.match(text, pos).end()
+
+
+def _skip_value(text, pos):
+    """Returns the position right after the JSON value starting at `pos`."""
+    char = text[pos]
+    if char == '"':
+        return _string_end(text, pos)
+    if char not in '{[':
+        return _SCALAR.match(text, pos).end()
+
+    depth = 0
+    while True:
+        match = _STRUCTURAL.search(text, pos)
+        if match is None:
+            raise ValueError("Unterminated JSON value")
+        token = match.group()
+        if token == '"':
+            pos = _string_end(text, match.start())
+            continue
+        pos = match.end()
+        if token in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _string_end(text, pos):
+    match = _STRING.match(text, pos)
+    if match is None:
+        raise ValueError(f"Unterminated JSON string at {pos}")
+    return match.end()
+
+
+def _seek(text, pos, path):
+    """Returns the position of the value at `path`, or None if it does not exist."""
+    for step in path:
+        pos = _skip_whitespace(text, pos)
+        if pos >= len(text):
+            return None
+        if text[pos] == '{' and isinstance(step, str):
+            pos = _seek_member(text, pos + 1, step)
+        elif text[pos] == '[' and isinstance(step, int):
+            pos = _seek_item(text, pos + 1, step)
+        else:
+            return None
+        if pos is None:
+            return None
+    return _skip_whitespace(text, pos)
+
+
+def _seek_member(text, pos, key):
+    """Steps over the members of an object until `key`; returns the position of its value."""
+    while True:
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == '}':
+            return None
+        name_end = _string_end(text, pos)
+        name = text[pos + 1:name_end - 1]
+        if '\\' in name:
+            name = json.loads(text[pos:name_end])
+        pos = _skip_whitespace(text, name_end)
+        if text[pos] != ':':
+            raise ValueError(f"Expected ':' at {pos}")
+        pos = _skip_whitespace(text, pos + 1)
+        if name == key:
+            return pos
+        pos = _skip_whitespace(text, _skip_value(text, pos))
+        if text[pos] == ',':
+            pos += 1
+
+
+def _seek_item(text, pos, index):
+    """Steps over the items of a list until `index`; returns the position of that item."""
+    for _ in range(index):
+        pos = _skip_whitespace(text, pos)
+        if text[pos] == ']':
+            return None
+        pos = _skip_whitespace(text, _skip_value(text, pos))
+        if text[pos] == ',':
+            pos += 1
+    pos = _skip_whitespace(text, pos)
+    return None if text[pos] == ']' else pos
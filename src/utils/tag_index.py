@@ -0,0 +1,59 @@
+from config.constants import EDHREC_TAGS
+
+
+class TagIndex:
+    """
+    Assigns every known tag a bit position, so a deck's tags can be stored as
+    a single integer bitmask.
+
+    A query fragment matches every tag that contains it, e.g. "counter" matches
+    "+1/+1 Counters" and "Charge Counters". These fragment masks are computed
+    once per fragment and kept up to date as new tags are added, so checking a
+    deck against a multi-tag query costs one AND per fragment.
+    """
+    def __init__(self, tags=EDHREC_TAGS):
+        self._bits = {}  # lower-cased tag -> bit position
+        self._fragment_masks = {}
+        for tag in tags:
+            self.add(tag)
+
+    def __len__(self):
+        return len(self._bits)
+
+    def __contains__(self, tag):
+        return tag.lower() in self._bits
+
+    def add(self, tag):
+        """Returns the bit of a tag, assigning the next free one if the tag is new."""
+        tag = tag.lower()
+        bit = self._bits.get(tag)
+        if bit is None:
+            bit = 1 << len(self._bits)
+            self._bits[tag] = bit
+            for fragment in self._fragment_masks:
+                if fragment in tag:
+                    self._fragment_masks[fragment] |= bit
+        return bit
+
+    def mask(self, tags):
+        """Returns the bitmask of a deck's tags. Unknown tags are added to the index."""
+        mask = 0
+        for tag in tags:
+            mask |= self.add(tag)
+        return mask
+
+    def fragment_mask(self, fragment):
+        """Returns the bitmask of all tags containing the (case-insensitive) fragment."""
+        fragment = fragment.lower()
+        mask = self._fragment_masks.get(fragment)
+        if mask is None:
+            mask = 0
+            for tag, bit in self._bits.items():
+                if fragment in tag:
+                    mask |= bit
+            self._fragment_masks[fragment] = mask
+        return mask
+
+    def tags(self, mask):
+        """Returns the lower-cased tags set in a bitmask, in index order."""
+        return [tag for tag, bit in self._bits.items() if mask & bit]
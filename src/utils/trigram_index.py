@@ -0,0 +1,92 @@
+import heapq
+from collections import Counter
+
+from config.constants import TAG_FUZZY_MIN_SIMILARITY
+
+# Misspellings have to share at least this many trigrams with a term, so one
+# or two letters never fuzzily match everything starting with them.
+_MIN_SHARED_TRIGRAMS = 3
+
+
+def trigrams(text, partial=False):
+    """
+    Returns the trigrams of each word of a lower-cased text. Words are padded, so
+    the first trigrams mark a word start. With `partial`, the last word is taken
+    to be still being typed and its end is not marked.
+    """
+    grams = set()
+    words = text.split()
+    for position, word in enumerate(words):
+        padded = f"  {word}" if partial and position == len(words) - 1 else f"  {word} "
+        for start in range(len(padded) - 2):
+            grams.add(padded[start:start + 3])
+    return grams
+
+
+class TrigramIndex:
+    """
+    Fuzzy completion over a growing vocabulary (e.g. EDHRec tags). Every term is
+    listed under its trigrams, so a query only looks at the terms sharing at
+    least one trigram with it instead of scanning all of them.
+
+    Terms starting with the query come first, then terms with a word starting
+    with it, then terms containing it, then misspellings sharing at least
+    TAG_FUZZY_MIN_SIMILARITY of the query's trigrams. Queries of one or two
+    letters only match word starts.
+    """
+    def __init__(self, terms=()):
+        self.terms = []  # as first added
+        self._keys = []  # lower-cased terms
+        self._ids = {}  # lower-cased term -> position
+        self._postings = {}  # trigram -> positions of the terms containing it
+        for term in terms:
+            self.add(term)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __contains__(self, term):
+        return " ".join(term.lower().split()) in self._ids
+
+    def add(self, term):
+        """Adds a term unless it is already known (ignoring case). Returns True if it was new."""
+        key = " ".join(term.lower().split())
+        if not key or key in self._ids:
+            return False
+        position = len(self.terms)
+        self._ids[key] = position
+        self.terms.append(term.strip())
+        self._keys.append(key)
+        for gram in trigrams(key):
+            self._postings.setdefault(gram, []).append(position)
+        return True
+
+    def search(self, text, limit=None):
+        """Returns the best matching terms for a (partially typed) query, best first."""
+        query = " ".join(text.lower().split())
+        if not query:
+            return []
+        grams = trigrams(query, partial=True)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        ranked = []
+        for position, count in shared.items():
+            key = self._keys[position]
+            if key.startswith(query):
+                kind = 0
+            elif f" {query}" in f" {key}":
+                kind = 1
+            elif query in key:
+                kind = 2
+            elif count >= _MIN_SHARED_TRIGRAMS and count / len(grams) >= TAG_FUZZY_MIN_SIMILARITY:
+                kind = 3
+            else:
+                continue
+            # Only misspellings are ranked by similarity, real matches by length
+            similarity = count / len(grams) if kind == 3 else 1
+            ranked.append((kind, -similarity, len(key), key, position))
+
+        best = heapq.nsmallest(limit, ranked) if limit is not None else sorted(ranked)
+        return [self.terms[entry[-1]] for entry in best]
@@ -0,0 +1,23 @@
+import importlib
+import threading
+
+from config.constants import WARM_UP_MODULES
+
+
+def _import_all(modules):
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Could not preload {name}: {e}")
+
+
+def start_import_warm_up(modules=WARM_UP_MODULES):
+    """
+    Imports modules the app loads lazily (Selenium, requests, ...) on a daemon
+    thread, so they are ready by the time the user first needs them without
+    delaying the window. Returns the thread.
+    """
+    thread = threading.Thread(target=_import_all, args=(modules,), name="import-warm-up", daemon=True)
+    thread.start()
+    return thread
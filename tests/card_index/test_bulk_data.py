@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from src.card_index.bulk_data import compact_card, is_commander_candidate, iter_json_array, normalize_text
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_iter_json_array_across_chunks(size):
+    """Test that elements split across chunk (and multi-byte character) boundaries are decoded."""
+    items = [{"name": "Lim-Dûl", "n": i, "nested": {"list": [1, "]", "}"]}} for i in range(5)]
+    data = json.dumps(items).encode("utf-8")
+    assert list(iter_json_array(chunked(data, size))) == items
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([b" [ ] "])) == []
+
+def test_iter_json_array_rejects_truncated_data():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[{"name": "Kren']))
+
+def test_iter_json_array_rejects_non_arrays():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"object": "error"}']))
+
+def test_is_commander_candidate(bulk_cards):
+    names = [card["name"] for card in bulk_cards if is_commander_candidate(card)]
+    assert names == ["Atraxa, Praetors' Voice", "Krenko, Mob Boss", "Kraum, Ludevic's Opus", "Tymna the Weaver",
+                     "Teferi, Temporal Archmage", "Lim-Dûl the Necromancer"]
+
+def test_is_commander_candidate_double_faced():
+    card = {"layout": "transform", "games": ["paper"], "card_faces": [
+        {"name": "Front", "type_line": "Legendary Creature — Human"},
+        {"name": "Back", "type_line": "Legendary Planeswalker — Human"},
+    ]}
+    assert is_commander_candidate(card)
+    card["card_faces"][0]["type_line"] = "Creature — Human"
+    assert not is_commander_candidate(card)
+
+def test_compact_card_keeps_only_used_fields(bulk_cards):
+    compact = compact_card(dict(bulk_cards[0], card_faces=[{"name": "A", "image_uris": {}, "artist": "x"}]))
+    assert "prices" not in compact and "legalities" not in compact
+    assert compact["related_uris"] == bulk_cards[0]["related_uris"]
+    assert compact["card_faces"] == [{"name": "A", "image_uris": {}}]
+
+def test_normalize_text():
+    assert normalize_text("Lim-Dûl, the Necromancer's") == "lim-dul the necromancers"
@@ -0,0 +1,85 @@
+import pytest
+
+from src.card_index.commander_index import CommanderIndex, UnsupportedQuery
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = CommanderIndex(str(tmp_path / "commanders.sqlite3"))
+    yield index
+    index.close()
+
+@pytest.fixture
+def built_index(index, mock_bulk_download):
+    assert index.refresh()
+    return index
+
+def test_refresh_builds_index(built_index):
+    assert built_index.is_built
+    assert built_index.count() == 6
+    assert not built_index.needs_refresh_check()
+
+def test_query_orders_by_edhrec_rank(built_index):
+    """Test that matches come in Scryfall's order=edhrec, unranked cards last."""
+    names = [card["name"] for card in built_index.query("is:commander")]
+    assert names[:3] == ["Atraxa, Praetors' Voice", "Krenko, Mob Boss", "Tymna the Weaver"]
+    assert names[-1] == "Lim-Dûl the Necromancer"
+
+def test_query_by_name_words(built_index):
+    """Test that name words match anywhere in the name, ignoring case, accents and punctuation."""
+    assert [c["name"] for c in built_index.query("praetors'")] == ["Atraxa, Praetors' Voice"]
+    assert [c["name"] for c in built_index.query("LIM-DUL")] == ["Lim-Dûl the Necromancer"]
+    assert [c["name"] for c in built_index.query("k boss")] == ["Krenko, Mob Boss"]
+
+def test_query_partner(built_index):
+    assert [c["name"] for c in built_index.query("o:partner")] == ["Tymna the Weaver", "Kraum, Ludevic's Opus"]
+
+def test_lookup_search_bar_queries(built_index):
+    assert built_index.lookup("krenko is:commander game:paper")["name"] == "Krenko, Mob Boss"
+    assert built_index.lookup("is:commander game:paper o:partner")["name"] == "Tymna the Weaver"
+    assert built_index.lookup("nobody is:commander game:paper") is None
+    assert built_index.lookup("kraum is:commander o:partner", random_card=True)["name"] == "Kraum, Ludevic's Opus"
+
+def test_query_scryfall_syntax(built_index):
+    assert [c["name"] for c in built_index.query("t:goblin is:commander")] == ["Krenko, Mob Boss"]
+    assert [c["name"] for c in built_index.query("krenko or tymna")] == ["Krenko, Mob Boss", "Tymna the Weaver"]
+    assert "Krenko, Mob Boss" not in [c["name"] for c in built_index.query("-krenko is:commander")]
+
+@pytest.mark.parametrize("query", ["pow>=3 is:commander", "f:modern", "is:partner", "c>=2"])
+def test_lookup_unsupported_syntax(built_index, query):
+    with pytest.raises(UnsupportedQuery):
+        built_index.lookup(query)
+
+def test_card_by_name(built_index):
+    assert built_index.card_by_name("tymna the weaver")["oracle_id"] == "oracle-Tymna the Weaver"
+    assert built_index.card_by_name("Tymna") is None
+
+def test_stored_cards_are_compact(built_index):
+    card = built_index.card_by_name("Krenko, Mob Boss")
+    assert card["image_uris"]["png"] == "http://example.com/Krenko, Mob Boss.png"
+    assert card["edhrec_rank"] == 20
+    assert "prices" not in card
+
+def test_refresh_skips_unchanged_bulk_file(built_index, mock_bulk_download):
+    calls = mock_bulk_download["get"].call_count
+    assert not built_index.refresh()
+    assert mock_bulk_download["get"].call_count == calls + 1  # only the metadata
+
+def test_refresh_applies_changes(built_index, mock_bulk_download, bulk_cards):
+    """Test that a new bulk file updates changed cards and drops removed ones."""
+    mock_bulk_download["updated_at"] = "2026-10-02T09:00:00+00:00"
+    mock_bulk_download["cards"] = [dict(bulk_cards[1], edhrec_rank=1)] + bulk_cards[2:]
+    assert built_index.refresh()
+    assert built_index.count() == 5
+    assert built_index.query("is:commander")[0]["name"] == "Krenko, Mob Boss"
+    assert built_index.card_by_name("Atraxa, Praetors' Voice") is None
+    assert built_index.bulk_updated_at == "2026-10-02T09:00:00+00:00"
+
+def test_index_persists(tmp_path, mock_bulk_download):
+    path = str(tmp_path / "commanders.sqlite3")
+    first = CommanderIndex(path)
+    first.refresh()
+    first.close()
+    reopened = CommanderIndex(path)
+    assert reopened.is_built and reopened.count() == 6
+    reopened.close()
@@ -0,0 +1,61 @@
+import pytest
+
+from src.card_index.commander_index import CommanderIndex
+from src.card_index.name_index import CommanderNameIndex, load_name_index
+
+NAMES = ["Atraxa, Praetors' Voice", "Krenko, Mob Boss", "Tymna the Weaver", "Kraum, Ludevic's Opus",
+         "Krenko, Tin Street Kingpin", "Lim-Dûl the Necromancer", "Esika, God of the Tree // The Prismatic Bridge"]
+
+@pytest.fixture
+def name_index():
+    return CommanderNameIndex(NAMES)
+
+@pytest.mark.parametrize("text, expected", [
+    ("kr", ["Krenko, Mob Boss", "Kraum, Ludevic's Opus", "Krenko, Tin Street Kingpin"]),
+    ("KRENKO,", ["Krenko, Mob Boss", "Krenko, Tin Street Kingpin"]),
+    ("krenko t", ["Krenko, Tin Street Kingpin"]),
+    ("mob b", ["Krenko, Mob Boss"]),
+    ("lim-du", ["Lim-Dûl the Necromancer"]),
+    ("praetors v", ["Atraxa, Praetors' Voice"]),
+    ("prismatic", ["Esika, God of the Tree // The Prismatic Bridge"]),
+    ("ob", []),
+    ("", []),
+    ("  ", []),
+])
+def test_complete(name_index, text, expected):
+    assert name_index.complete(text) == expected
+
+def test_name_start_matches_come_first(name_index):
+    """Test that names starting with the text are suggested before names with a later word starting with it."""
+    assert name_index.complete("t") == ["Tymna the Weaver", "Krenko, Tin Street Kingpin",
+                                        "Lim-Dûl the Necromancer", "Esika, God of the Tree // The Prismatic Bridge"]
+    assert name_index.complete("t", limit=2) == ["Tymna the Weaver", "Krenko, Tin Street Kingpin"]
+
+def test_names_are_suggested_once(name_index):
+    assert name_index.complete("the") == ["Tymna the Weaver", "Lim-Dûl the Necromancer",
+                                          "Esika, God of the Tree // The Prismatic Bridge"]
+
+def test_save_and_load(name_index, tmp_path):
+    path = str(tmp_path / "names.json")
+    name_index.save(path, "v1")
+    loaded = CommanderNameIndex.load(path, "v1")
+    assert loaded.complete("mob") == ["Krenko, Mob Boss"]
+    assert len(loaded) == len(NAMES)
+    assert CommanderNameIndex.load(path, "v2") is None
+    assert CommanderNameIndex.load(str(tmp_path / "missing.json"), "v1") is None
+
+def test_load_name_index_from_commander_index(tmp_path, mock_bulk_download, mocker):
+    index = CommanderIndex(str(tmp_path / "commanders.sqlite3"))
+    index.refresh()
+    path = str(tmp_path / "names.json")
+
+    assert load_name_index(index, path).complete("k") == ["Krenko, Mob Boss", "Kraum, Ludevic's Opus"]
+    names = mocker.spy(index, "names")
+    assert load_name_index(index, path).complete("tymna") == ["Tymna the Weaver"]
+    names.assert_not_called()  # read from disk
+
+    mock_bulk_download["updated_at"] = "2026-10-02T09:00:00+00:00"
+    index.refresh()
+    load_name_index(index, path)
+    names.assert_called_once()  # stale after a new bulk file
+    index.close()
@@ -0,0 +1,104 @@
+import pytest
+
+from src.card_index.query import QueryEngine, UnsupportedQuery, parse_query
+
+
+def card(name, type_line, oracle_text="", colors=(), identity=None, cmc=3.0, **extra):
+    return dict({
+        "name": name, "type_line": type_line, "oracle_text": oracle_text, "colors": list(colors),
+        "color_identity": list(identity if identity is not None else colors), "cmc": cmc,
+    }, **extra)
+
+CARDS = [
+    card("Atraxa, Praetors' Voice", "Legendary Creature — Phyrexian Angel Horror",
+         "Flying, vigilance, deathtouch, lifelink\\nAt the beginning of your end step, proliferate.", "WUBG", cmc=4),
+    card("Krenko, Mob Boss", "Legendary Creature — Goblin Warrior",
+         "{T}: Create X 1/1 red Goblin creature tokens, where X is the number of Goblins you control.", "R", cmc=4),
+    card("Tymna the Weaver", "Legendary Creature — Human Cleric",
+         "Lifelink\\nAt the beginning of your postcombat main phase, you may pay X life, where X is the number of "
+         "opponents that were dealt combat damage this turn. If you do, draw X cards.\\nPartner", "WB"),
+    card("Kraum, Ludevic's Opus", "Legendary Creature — Zombie Horror",
+         "Flying, haste\\nWhenever an opponent casts their second spell each turn, draw a card.\\nPartner", "UR", cmc=5),
+    card("Lim-Dûl the Necromancer", "Legendary Creature — Human Wizard", "", "B", cmc=7),
+    card("Esika, God of the Tree // The Prismatic Bridge", "Legendary Creature — God // Legendary Enchantment",
+         colors=(), identity="WUBRG", cmc=3, card_faces=[
+             {"name": "Esika, God of the Tree", "type_line": "Legendary Creature — God", "oracle_text": "Vigilance",
+              "colors": ["G"]},
+             {"name": "The Prismatic Bridge", "type_line": "Legendary Enchantment", "oracle_text": "At the beginning",
+              "colors": ["W", "U", "B", "R", "G"]}]),
+    card("Kozilek, the Great Distortion", "Legendary Creature — Eldrazi", "Menace", cmc=10),
+]
+
+@pytest.fixture(scope="module")
+def engine():
+    return QueryEngine(CARDS)
+
+def names(engine, query):
+    return [c["name"].split(",")[0].split(" ")[0] for c in engine.search(query)]
+
+@pytest.mark.parametrize("query, expected", [
+    ("krenko", ["Krenko"]),
+    ("kren boss", ["Krenko"]),
+    ("lim-dul", ["Lim-Dûl"]),
+    ("praetors'", ["Atraxa"]),
+    ('"the weaver"', ["Tymna"]),
+    ('!"Krenko, Mob Boss"', ["Krenko"]),
+    ('!"esika, god of the tree"', ["Esika"]),
+    ("o:partner", ["Tymna", "Kraum"]),
+    ('o:"draw a card"', ["Kraum"]),
+    ("t:goblin", ["Krenko"]),
+    ("type:horror", ["Atraxa", "Kraum"]),
+    ("t:legendary t:enchantment", ["Esika"]),
+])
+def test_text_fields(engine, query, expected):
+    assert names(engine, query) == expected
+
+@pytest.mark.parametrize("query, expected", [
+    ("c:r", ["Krenko", "Kraum", "Esika"]),
+    ("c=r", ["Krenko"]),
+    ("c:c", ["Kozilek"]),
+    ("c:colorless", ["Kozilek"]),
+    ("c<=wb", ["Tymna", "Lim-Dûl", "Kozilek"]),
+    ("c:m", ["Atraxa", "Tymna", "Kraum", "Esika"]),
+    ("c:g", ["Atraxa", "Esika"]),
+    ("id:orzhov", ["Tymna", "Lim-Dûl", "Kozilek"]),
+    ("id>=wubrg", ["Esika"]),
+    ("id:izzet", ["Krenko", "Kraum", "Kozilek"]),
+    ("id!=b", ["Atraxa", "Krenko", "Tymna", "Kraum", "Esika", "Kozilek"]),
+])
+def test_colors(engine, query, expected):
+    assert names(engine, query) == expected
+
+@pytest.mark.parametrize("query, expected", [
+    ("cmc=4", ["Atraxa", "Krenko"]),
+    ("mv:3", ["Tymna", "Esika"]),
+    ("cmc>=7", ["Lim-Dûl", "Kozilek"]),
+    ("cmc<4", ["Tymna", "Esika"]),
+])
+def test_mana_value(engine, query, expected):
+    assert names(engine, query) == expected
+
+@pytest.mark.parametrize("query, expected", [
+    ("o:partner is:commander game:paper", ["Tymna", "Kraum"]),
+    ("o:partner -c:r", ["Tymna"]),
+    ("krenko or tymna", ["Krenko", "Tymna"]),
+    ("krenko OR tymna or kraum", ["Krenko", "Tymna", "Kraum"]),
+    ("(c:r or c:g) cmc>=5", ["Kraum"]),
+    ("-(t:human or t:god) c:m", ["Atraxa", "Kraum"]),
+    ("t:human and c:b", ["Tymna", "Lim-Dûl"]),
+    ("", ["Atraxa", "Krenko", "Tymna", "Kraum", "Lim-Dûl", "Esika", "Kozilek"]),
+])
+def test_boolean_operators(engine, query, expected):
+    assert names(engine, query) == expected
+
+@pytest.mark.parametrize("query", [
+    "pow>3", "f:commander", "is:partner", "game:arena", "c>=2", "cmc>x", "(krenko", "krenko)", "c:rx", "or",
+    "o:/goblin/", 't:"/^legendary/"', 'o:"when ~ enters"', "o:~", 'o:"."', "name:!!", "~",
+])
+def test_unsupported_queries(query):
+    with pytest.raises(UnsupportedQuery):
+        parse_query(query)
+
+def test_parse_tree():
+    assert parse_query("-t:goblin (krenko or c:r)") == (
+        "and", [("not", ("type", ":", "goblin")), ("or", [("name", ":", "krenko"), ("colors", ":", 8)])])
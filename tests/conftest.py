@@ -15,10 +15,27 @@ def disable_qmessagebox_confirmation(mocker):
     from PyQt5.QtWidgets import QMessageBox
     mocker.patch.object(QMessageBox, 'question', return_value=QMessageBox.Yes)
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Points the app's on-disk caches at a temporary directory."""
+    from config.constants import CACHE_DIR_ENV_VAR
+    from card_index import commander_index
+    from network import response_cache, slug_resolver
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path / "cache"))
+    response_cache.close_cache()
+    slug_resolver.reset_slug_resolver()
+    commander_index.close_commander_index()
+    yield tmp_path / "cache"
+    response_cache.close_cache()
+    slug_resolver.reset_slug_resolver()
+    commander_index.close_commander_index()
+
 @pytest.fixture
 def mock_requests_get(mocker):
     """
-    Mocks requests.get to return a configurable mock response.
+    Mocks the shared HTTP client's get() to return a configurable mock response.
+    The app imports it as `network.http_client` (src is on the pythonpath), so
+    that is the module that has to be patched.
     """
     mock_response = MagicMock()
     mock_response.raise_for_status.return_value = None # Assume success by default
@@ -26,29 +43,29 @@ def mock_requests_get(mocker):
     mock_response.text = ""
     mock_response.url = "http://mock.url"
 
-    mocker.patch("requests.get", return_value=mock_response)
+    mocker.patch("network.http_client.get", return_value=mock_response)
     return mock_response
 
 @pytest.fixture
-def mock_urllib_urlretrieve(mocker):
-    """
-    Mocks urllib.request.urlretrieve to prevent actual file downloads.
-    """
-    return mocker.patch("urllib.request.urlretrieve")
+def png_bytes(qapp):
+    """Returns the bytes of a real, tiny PNG image so Qt can decode it."""
+    from PyQt5.QtCore import QBuffer, QByteArray, QIODevice
+    from PyQt5.QtGui import QImage
+    image = QImage(2, 3, QImage.Format_RGB32)
+    image.fill(0)
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
 
 @pytest.fixture
-def mock_qpixmap(mocker):
+def mock_image_download(mocker, png_bytes):
     """
-    Mocks PyQt5.QtGui.QPixmap to prevent file I/O errors in tests when
-    image files don't actually exist. It returns a mock pixmap that
-    reports itself as non-null.
+    Mocks the shared HTTP client's get_bytes() so card images are "downloaded"
+    as a valid PNG without any network access.
     """
-    # Create a real, tiny, valid QPixmap in memory.
-    # This satisfies all type checks of Qt methods like setPixmap.
-    from PyQt5.QtGui import QPixmap as RealQPixmap
-
-    # Return a new dummy pixmap on each call to simulate loading different images.
-    return mocker.patch("src.ui.main_window.QPixmap", side_effect=lambda *args, **kwargs: RealQPixmap(1, 1))
+    return mocker.patch("network.http_client.get_bytes", return_value=png_bytes)
 
 @pytest.fixture
 def mock_selenium_driver(mocker):
@@ -84,4 +101,56 @@ def mock_selenium_driver(mocker):
     # Patch webdriver.Chrome directly
     mocker.patch("selenium.webdriver.Chrome", return_value=mock_driver, autospec=True)
 
-    yield mock_driver
\ No newline at end of file
+    yield mock_driver
+
+
+def _bulk_card(name, type_line, edhrec_rank=None, oracle_text="", **extra):
+    card = {
+        "object": "card", "id": f"id-{name}", "oracle_id": f"oracle-{name}", "name": name, "layout": "normal",
+        "type_line": type_line, "oracle_text": oracle_text, "cmc": 3.0, "colors": [], "color_identity": [],
+        "keywords": [], "games": ["paper", "mtgo"], "legalities": {"commander": "legal"},
+        "image_uris": {"small": f"http://example.com/{name}-s.jpg", "png": f"http://example.com/{name}.png"},
+        "related_uris": {"edhrec": f"https://edhrec.com/route/?cc={name}"}, "prices": {"usd": "1.00"},
+    }
+    if edhrec_rank is not None:
+        card["edhrec_rank"] = edhrec_rank
+    card.update(extra)
+    return card
+
+
+@pytest.fixture
+def bulk_cards():
+    """A small excerpt of Scryfall's oracle cards bulk file."""
+    return [
+        _bulk_card("Atraxa, Praetors' Voice", "Legendary Creature — Phyrexian Angel Horror", 5),
+        _bulk_card("Krenko, Mob Boss", "Legendary Creature — Goblin Warrior", 20),
+        _bulk_card("Kraum, Ludevic's Opus", "Legendary Creature — Zombie Horror", 90, oracle_text="Flying, haste\nPartner"),
+        _bulk_card("Tymna the Weaver", "Legendary Creature — Human Cleric", 40, oracle_text="Lifelink\nPartner"),
+        _bulk_card("Teferi, Temporal Archmage", "Legendary Planeswalker — Teferi", 900,
+                   oracle_text="Teferi, Temporal Archmage can be your commander."),
+        _bulk_card("Lim-Dûl the Necromancer", "Legendary Creature — Human Wizard"),
+        _bulk_card("Sol Ring", "Artifact", 1),
+        _bulk_card("Goblin Token", "Token Creature — Goblin", layout="token"),
+        _bulk_card("Arena Legend", "Legendary Creature — Elf", 3, games=["arena"]),
+    ]
+
+@pytest.fixture
+def mock_bulk_download(mocker, bulk_cards):
+    """
+    Serves the bulk-data metadata and the bulk file itself (streamed in small
+    chunks) from `bulk_cards` instead of Scryfall.
+    """
+    import json
+    from config.constants import SCRYFALL_BULK_DATA_URL
+    state = {"updated_at": "2026-10-01T09:00:00+00:00", "cards": bulk_cards}
+
+    def fake_get(url, **kwargs):
+        if url == SCRYFALL_BULK_DATA_URL:
+            metadata = {"download_uri": "https://data.scryfall.io/oracle-cards.json", "updated_at": state["updated_at"]}
+            return MagicMock(json=lambda: metadata, raise_for_status=lambda: None)
+        payload = json.dumps(state["cards"], indent=1).encode("utf-8")
+        chunks = [payload[i:i + 97] for i in range(0, len(payload), 97)]
+        return MagicMock(iter_content=lambda chunk_size: iter(chunks), raise_for_status=lambda: None)
+
+    state["get"] = mocker.patch("network.http_client.get", side_effect=fake_get)
+    return state
@@ -0,0 +1,82 @@
+import io
+import json
+import threading
+
+import pytest
+
+from src.core import batch
+from src.core.batch import read_batch_file, run_batch, write_deck_files, write_jsonl
+from src.scraping.decklist import DeckEntry, Decklist
+
+def test_read_batch_file():
+    lines = [
+        "# budget lists",
+        "Krenko, Mob Boss",
+        "",
+        "Atraxa | <200 | counters",
+        "t:goblin | | | <20",
+    ]
+    assert read_batch_file(lines, budget="<100", salt="<30") == [
+        {"query": "Krenko, Mob Boss", "budget": "<100", "tags": "", "salt": "<30"},
+        {"query": "Atraxa", "budget": "<200", "tags": "counters", "salt": "<30"},
+        {"query": "t:goblin", "budget": "<100", "tags": "", "salt": "<20"},
+    ]
+
+def test_read_batch_file_rejects_extra_fields():
+    with pytest.raises(ValueError):
+        read_batch_file(["Krenko | 1 | 2 | 3 | 4"])
+
+def test_run_batch_runs_commanders_concurrently(mocker):
+    """Test that commanders are processed in parallel and failures are reported per commander."""
+    both_started = threading.Barrier(2, timeout=2)
+
+    def fake_find(query, budget, tags, salt, count, sort_order, partner, local_index, progress):
+        both_started.wait()
+        progress(f"working on {query}")
+        if query == "Nobody":
+            raise RuntimeError("Commander not found.")
+        return {"query": query, "commander": query, "partner": None, "decks": [], "count": count}
+    mocker.patch.object(batch, "find_decklists", side_effect=fake_find)
+    jobs = read_batch_file(["Krenko", "Nobody"])
+    messages = []
+
+    results = list(run_batch(jobs, count=2, workers=2, progress=lambda job, message: messages.append(message)))
+
+    assert sorted(results, key=lambda r: r["query"]) == [
+        {"job": 1, "query": "Krenko", "commander": "Krenko", "partner": None, "decks": [], "count": 2},
+        {"job": 2, "query": "Nobody", "error": "Commander not found."},
+    ]
+    assert sorted(messages) == ["working on Krenko", "working on Nobody"]
+
+def test_write_jsonl():
+    stream = io.StringIO()
+    write_jsonl({"query": "Lim-Dûl", "decks": []}, stream)
+    write_jsonl({"query": "Krenko", "error": "x"}, stream)
+    write_jsonl({"query": "Atraxa", "decks": [{"rank": 1, "decklist": Decklist([DeckEntry(1, "Sol Ring")])}]}, stream)
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line)["query"] for line in lines] == ["Lim-Dûl", "Krenko", "Atraxa"]
+    decklist = json.loads(lines[2])["decks"][0]["decklist"]
+    assert Decklist.from_dict(decklist) == Decklist([DeckEntry(1, "Sol Ring")])
+
+def test_write_deck_files(tmp_path):
+    result = {"job": 4, "query": "tymna", "commander": "Tymna the Weaver", "partner": "Kraum, Ludevic's Opus", "decks": [
+        {"rank": 1, "decklist": Decklist([DeckEntry(1, "Sol Ring")])},
+        {"rank": 2, "error": "Unsupported site"},
+        {"rank": 3, "decklist": Decklist([DeckEntry(1, "Arcane Signet")])},
+    ]}
+    paths = write_deck_files(result, str(tmp_path / "out"))
+    assert [p.rsplit("/", 1)[-1].rsplit("\\", 1)[-1] for p in paths] == [
+        "4-tymna-the-weaver-kraum-ludevics-opus-1.txt", "4-tymna-the-weaver-kraum-ludevics-opus-3.txt"]
+    assert open(paths[0], encoding="utf-8").read() == "1 Sol Ring\n"
+    assert write_deck_files({"query": "x", "error": "failed"}, str(tmp_path / "out")) == []
+
+    csv_paths = write_deck_files(result, str(tmp_path / "csv"), "csv")
+    assert csv_paths[0].endswith("-1.csv")
+    assert open(csv_paths[0], encoding="utf-8").read().splitlines()[1] == "1,Sol Ring,,,mainboard,"
+
+def test_write_deck_files_keeps_jobs_for_the_same_commander_apart(tmp_path):
+    decks = [{"rank": 1, "decklist": Decklist([DeckEntry(1, "Sol Ring")])}]
+    first = write_deck_files({"job": 1, "commander": "Krenko, Mob Boss", "decks": decks}, str(tmp_path))
+    second = write_deck_files({"job": 2, "commander": "Krenko, Mob Boss", "decks": decks}, str(tmp_path))
+    assert first != second
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["1-krenko-mob-boss-1.txt", "2-krenko-mob-boss-1.txt"]
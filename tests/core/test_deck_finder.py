@@ -0,0 +1,128 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.config.constants import SCRYFALL_MIN_REQUEST_INTERVAL
+from src.core import deck_finder
+from src.core.deck_finder import SearchError, build_scryfall_query, find_commander, find_decklists
+
+DECK_TABLE = [
+    {"urlhash": "cheap", "price": 80, "tags": ["tokens"], "salt": 10.0},
+    {"urlhash": "pricey", "price": 900, "tags": ["tokens"], "salt": 12.0},
+    {"urlhash": "other", "price": 60, "tags": ["aggro"], "salt": 15.0},
+]
+
+def test_build_scryfall_query():
+    assert build_scryfall_query(" Teferi ") == "Teferi is:commander game:paper"
+    assert build_scryfall_query("Teferi", partner=True) == "Teferi is:commander game:paper o:partner"
+    assert build_scryfall_query("Teferi is:commander o:partner", partner=True) == \
+        "Teferi is:commander o:partner game:paper"
+
+def test_find_commander_from_scryfall(mock_requests_get):
+    from network import http_client
+    mock_requests_get.json.return_value = {"data": [{"name": "Krenko, Mob Boss"}]}
+    assert find_commander("krenko is:commander")["name"] == "Krenko, Mob Boss"
+    http_client.get.assert_called_once_with(
+        deck_finder.SCRYFALL_API_CARD_SEARCH_URL, params={"order": "edhrec", "q": "krenko is:commander"})
+
+def test_find_commander_not_found(mock_requests_get):
+    mock_requests_get.json.return_value = {"data": []}
+    with pytest.raises(SearchError, match="Commander not found."):
+        find_commander("nobody")
+
+def test_find_commander_prefers_local_index(mock_requests_get):
+    from network import http_client
+    local_index = MagicMock()
+    local_index.lookup.return_value = {"name": "Local"}
+    assert find_commander("local", random_card=True, local_index=local_index)["name"] == "Local"
+    local_index.lookup.assert_called_once_with("local", random_card=True)
+    http_client.get.assert_not_called()
+
+@pytest.mark.parametrize("query", ["o:/goblin/ is:commander", 'o:"when ~ enters" is:commander', "o:~"])
+def test_find_commander_sends_unsupported_text_to_scryfall(mock_requests_get, query):
+    """Test that regexes and "~" go to Scryfall instead of matching nothing (or everything) offline."""
+    from network import http_client
+    from card_index.query import QueryEngine  # the module deck_finder catches UnsupportedQuery from
+    engine = QueryEngine([{"name": "Krenko, Mob Boss", "oracle_text": "Goblin tokens"}])
+    local_index = MagicMock()
+    local_index.lookup.side_effect = lambda q, random_card: (engine.search(q) or [None])[0]
+    mock_requests_get.json.return_value = {"data": [{"name": "Scryfall"}]}
+    assert find_commander(query, local_index=local_index)["name"] == "Scryfall"
+    http_client.get.assert_called_once()
+
+def test_scryfall_requests_are_spaced_out(mocker):
+    """Test that Scryfall requests from any thread keep Scryfall's requested gap."""
+    times = []
+    def fake_get(url, **kwargs):
+        times.append(time.monotonic())
+        return MagicMock(json=lambda: {"data": [{"name": "X"}]}, raise_for_status=lambda: None)
+    mocker.patch("network.http_client.get", side_effect=fake_get)
+    for _ in range(3):
+        find_commander("x")
+    assert all(later - earlier >= SCRYFALL_MIN_REQUEST_INTERVAL * 0.95
+               for earlier, later in zip(times, times[1:]))
+
+def test_fetch_deck_table_builds_deck_table(mocker):
+    """Test that the fetched table is compiled once, for every filter run on it."""
+    mocker.patch.object(deck_finder, "get_slug_resolver", return_value=MagicMock(resolve=lambda card: "krenko"))
+    mocker.patch.object(deck_finder, "find_next_data", return_value={})
+    mocker.patch.object(deck_finder, "json_value_at", return_value=DECK_TABLE)
+    mocker.patch("network.http_client.get")
+    table = deck_finder.fetch_deck_table({"name": "Krenko"})
+    assert type(table).__name__ == "DeckTable"  # deck_finder's own import of utils.deck_filter
+    assert list(table) == DECK_TABLE
+    assert list(table.prices) == [80, 900, 60]
+
+def test_find_decklists(mocker):
+    mocker.patch.object(deck_finder, "find_commander", return_value={"name": "Krenko, Mob Boss"})
+    fetch_table = mocker.patch.object(deck_finder, "fetch_deck_table", return_value=DECK_TABLE)
+
+    def fake_scrape(deck_page, progress=None):
+        if deck_page.endswith("other"):
+            raise SearchError("Unsupported site for scraping: https://tappedout.net")
+        return f"1 Deck from {deck_page}"
+    mocker.patch.object(deck_finder, "scrape_deck", side_effect=fake_scrape)
+    messages = []
+
+    result = find_decklists("krenko", budget="<100", count=3, sort_order="cheapest", progress=messages.append)
+
+    fetch_table.assert_called_once_with({"name": "Krenko, Mob Boss"}, None, messages.append)
+    assert result["commander"] == "Krenko, Mob Boss"
+    assert result["partner"] is None
+    assert [deck["rank"] for deck in result["decks"]] == [1, 2]
+    assert result["decks"][0]["error"] == "Unsupported site for scraping: https://tappedout.net"
+    assert result["decks"][1]["decklist"] == "1 Deck from https://edhrec.com/deckpreview/cheap"
+    assert result["decks"][1]["price"] == 80
+    assert "Commander found: Krenko, Mob Boss" in messages
+
+def test_find_decklists_with_partner(mocker):
+    mocker.patch.object(deck_finder, "find_commander", return_value={"name": "Tymna the Weaver"})
+    mocker.patch.object(deck_finder, "fetch_partner", return_value={"name": "Kraum, Ludevic's Opus"})
+    fetch_table = mocker.patch.object(deck_finder, "fetch_deck_table", return_value=DECK_TABLE)
+    mocker.patch.object(deck_finder, "scrape_deck", return_value="1 Sol Ring")
+
+    result = find_decklists("tymna", partner=True)
+    assert fetch_table.call_args.args[1] == {"name": "Kraum, Ludevic's Opus"}
+    assert result["partner"] == "Kraum, Ludevic's Opus"
+    assert len(result["decks"]) == 1
+
+@pytest.mark.parametrize("budget, message", [("<10", "No decks found"), ("abc", "Invalid budget")])
+def test_find_decklists_without_matches(mocker, budget, message):
+    mocker.patch.object(deck_finder, "find_commander", return_value={"name": "Krenko, Mob Boss"})
+    mocker.patch.object(deck_finder, "fetch_deck_table", return_value=DECK_TABLE)
+    with pytest.raises(SearchError, match=message):
+        find_decklists("krenko", budget=budget)
+
+def test_scrape_deck_rejects_unsupported_sites(mocker):
+    mocker.patch.object(deck_finder, "fetch_deck_link", return_value="https://tappedout.net/deck")
+    with pytest.raises(SearchError, match="Unsupported site"):
+        deck_finder.scrape_deck("https://edhrec.com/deckpreview/x")
+
+def test_scrape_deck_reports_scrape_errors(mocker):
+    mocker.patch.object(deck_finder, "fetch_deck_link", return_value="https://moxfield.com/decks/abc")
+    scrape = mocker.patch.object(deck_finder, "scrape_decklist",
+                                 side_effect=deck_finder.ScrapeError("Moxfield's export dialog was empty."))
+    with pytest.raises(SearchError, match="export dialog was empty"):
+        deck_finder.scrape_deck("https://edhrec.com/deckpreview/x")
+    scrape.assert_called_once_with("https://moxfield.com/decks/abc")
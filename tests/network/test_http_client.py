@@ -0,0 +1,45 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.network import http_client
+from src.config.constants import HTTP_HEADERS, HTTP_TIMEOUT
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.close()
+    yield
+    http_client.close()
+
+def test_get_session_is_shared():
+    """Test that every caller gets the same pooled session."""
+    assert http_client.get_session() is http_client.get_session()
+
+def test_session_sends_default_headers():
+    """Test that HTTP_HEADERS are applied to the session by default."""
+    session = http_client.get_session()
+    for key, value in HTTP_HEADERS.items():
+        assert session.headers[key] == value
+
+def test_session_mounts_pooled_adapter():
+    """Test that both schemes use the keep-alive adapter with per-host pools."""
+    session = http_client.get_session()
+    adapter = session.get_adapter("https://api.scryfall.com")
+    assert adapter is session.get_adapter("https://edhrec.com")
+    assert adapter._pool_maxsize == http_client.HTTP_POOL_MAXSIZE
+
+def test_get_applies_default_timeout(mocker):
+    """Test that get() goes through the shared session with a default timeout."""
+    mock_get = mocker.patch("requests.Session.get", return_value=MagicMock())
+    http_client.get("https://api.scryfall.com/cards/search", use_cache=False, params={"q": "x"})
+    mock_get.assert_called_once_with("https://api.scryfall.com/cards/search", params={"q": "x"}, timeout=HTTP_TIMEOUT)
+
+def test_get_bytes_returns_content(mocker):
+    """Test that get_bytes() returns the raw response body."""
+    mocker.patch("requests.Session.get", return_value=MagicMock(content=b"PNGDATA", raise_for_status=lambda: None))
+    assert http_client.get_bytes("https://cards.scryfall.io/png/x.png") == b"PNGDATA"
+
+def test_close_discards_session():
+    """Test that close() drops the session so a fresh one is created afterwards."""
+    session = http_client.get_session()
+    http_client.close()
+    assert http_client.get_session() is not session
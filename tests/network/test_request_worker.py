@@ -0,0 +1,112 @@
+import pytest
+from PyQt5.QtCore import QThread
+
+from src.network.request_worker import RequestPipeline
+
+
+@pytest.fixture
+def pipeline(qapp):
+    pipeline = RequestPipeline(max_threads=2)
+    yield pipeline
+    pipeline.wait_for_done(2000)
+
+def test_submit_delivers_result(pipeline, qtbot):
+    """Test that the job's return value arrives through the result callback."""
+    results = []
+    pipeline.submit(lambda a, b, progress: a + b, 2, 3, on_result=results.append)
+    qtbot.waitUntil(lambda: len(results) == 1, timeout=1000)
+    assert results == [5]
+
+def test_submit_runs_off_gui_thread(pipeline, qtbot):
+    """Test that jobs run on a pool thread while callbacks run on the GUI thread."""
+    gui_thread = QThread.currentThread()
+    job_threads, callback_threads = [], []
+
+    def job(progress):
+        job_threads.append(QThread.currentThread())
+
+    pipeline.submit(job, on_result=lambda _: callback_threads.append(QThread.currentThread()))
+    qtbot.waitUntil(lambda: len(callback_threads) == 1, timeout=1000)
+    assert job_threads[0] is not gui_thread
+    assert callback_threads[0] is gui_thread
+
+def test_submit_reports_errors_and_progress(pipeline, qtbot):
+    """Test that progress messages and raised exceptions reach their callbacks."""
+    messages, errors, results = [], [], []
+
+    def job(progress):
+        progress("working")
+        raise ValueError("boom")
+
+    pipeline.submit(job, on_result=results.append, on_error=errors.append, on_progress=messages.append)
+    qtbot.waitUntil(lambda: len(errors) == 1, timeout=1000)
+    assert messages == ["working"]
+    assert isinstance(errors[0], ValueError)
+    assert results == []
+
+def test_cancel_pending_drops_queued_jobs(qtbot):
+    """Test that queued jobs are dropped while the running one finishes."""
+    import threading
+    pipeline = RequestPipeline(max_threads=1)
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def running(progress):
+        started.set()
+        release.wait(2)
+        return "running"
+
+    pipeline.submit(running, on_result=results.append)
+    pipeline.submit(lambda progress: "queued", on_result=results.append)
+    assert started.wait(2)
+    pipeline.cancel_pending()
+    release.set()
+
+    pipeline.wait_for_done(2000)
+    qtbot.wait(20)
+    assert results == ["running"]
+
+def test_cancel_queued_job(qtbot):
+    """Test that a job still waiting for a thread never runs."""
+    import threading
+    pipeline = RequestPipeline(max_threads=1)
+    release = threading.Event()
+    results = []
+
+    pipeline.submit(lambda progress: release.wait(2), on_result=lambda _: None)
+    queued = pipeline.submit(lambda progress: "queued", on_result=results.append)
+    assert pipeline.cancel(queued)
+    assert not pipeline.cancel(queued)  # Already dropped
+    release.set()
+
+    pipeline.wait_for_done(2000)
+    qtbot.wait(20)
+    assert results == []
+
+def test_cancel_running_job_returns_false(qtbot):
+    import threading
+    pipeline = RequestPipeline(max_threads=1)
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def running(progress):
+        started.set()
+        release.wait(2)
+        return "running"
+
+    worker = pipeline.submit(running, on_result=results.append)
+    assert started.wait(2)
+    assert not pipeline.cancel(worker)
+    release.set()
+    qtbot.waitUntil(lambda: results == ["running"], timeout=1000)
+
+def test_cancel_finished_job(pipeline, qtbot):
+    """Test that cancelling jobs whose finished signal is still queued does not touch the deleted runnable."""
+    results = []
+    worker = pipeline.submit(lambda progress: "done", on_result=results.append)
+    pipeline.wait_for_done(2000)
+    # The job has run, but its signals have not been delivered to the GUI thread yet
+    assert not pipeline.cancel(worker)
+    pipeline.cancel_pending()
+    qtbot.waitUntil(lambda: results == ["done"], timeout=1000)
+    assert not pipeline.cancel(worker)
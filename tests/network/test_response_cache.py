@@ -0,0 +1,145 @@
+import pytest
+from unittest.mock import MagicMock
+
+from requests.structures import CaseInsensitiveDict
+
+from src.network.response_cache import ResponseCache, ttl_for_url
+
+TTLS = {"https://edhrec.com/": 60, "https://edhrec.com/decks/": 3600}
+DECKS_URL = "https://edhrec.com/decks/atraxa"
+
+def make_response(content=b"<html>decks</html>", status=200, headers=None, url=DECKS_URL):
+    response = MagicMock()
+    response.content = content
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    response.url = url
+    return response
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(directory=str(tmp_path / "http"), ttls=TTLS)
+    yield cache
+    cache.close()
+
+@pytest.fixture
+def session():
+    return MagicMock()
+
+def test_ttl_for_url_uses_longest_prefix():
+    assert ttl_for_url("https://edhrec.com/decks/atraxa", TTLS) == 3600
+    assert ttl_for_url("https://edhrec.com/partners/atraxa", TTLS) == 60
+    assert ttl_for_url("https://moxfield.com/decks/x", TTLS) == 0
+
+def test_fresh_entry_is_served_from_disk(cache, session):
+    """Test that a repeated lookup within the TTL does not hit the network."""
+    session.get.return_value = make_response(url="https://edhrec.com/commanders/atraxa")
+    first = cache.get(session, DECKS_URL)
+    second = cache.get(session, DECKS_URL)
+
+    assert session.get.call_count == 1
+    assert second.content == first.content
+    assert second.url == "https://edhrec.com/commanders/atraxa" # Redirect target is preserved
+    assert second.from_cache
+    assert cache.stats()["hits"] == 1
+
+def test_stale_entry_is_revalidated_with_etag(cache, session, mocker):
+    """Test that stale entries send If-None-Match and reuse the body on 304."""
+    session.get.return_value = make_response(headers={"ETag": '"v1"'})
+    cache.get(session, DECKS_URL)
+
+    clock = mocker.patch("src.network.response_cache.time.time", return_value=10 ** 10)
+    session.get.return_value = make_response(content=b"", status=304)
+    response = cache.get(session, DECKS_URL)
+
+    assert session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert response.content == b"<html>decks</html>"
+    assert cache.stats()["revalidated"] == 1
+
+    # Revalidation renewed the entry, so it is fresh again
+    clock.return_value = 10 ** 10 + 10
+    cache.get(session, DECKS_URL)
+    assert session.get.call_count == 2
+
+def test_entry_without_body_is_fetched_unconditionally(cache, session, mocker, tmp_path):
+    """Test that a lost body is not revalidated, as a 304 would leave nothing to serve."""
+    session.get.return_value = make_response(headers={"ETag": '"v1"'})
+    cache.get(session, DECKS_URL)
+    for blob in (tmp_path / "http" / "blobs").rglob("*"):
+        if blob.is_file():
+            blob.unlink()
+
+    mocker.patch("src.network.response_cache.time.time", return_value=10 ** 10)
+    session.get.return_value = make_response(content=b"<html>new</html>")
+    response = cache.get(session, DECKS_URL)
+
+    assert not session.get.call_args.kwargs.get("headers")
+    assert response.content == b"<html>new</html>"
+    assert cache.stats()["entries"] == 1  # Stored again
+
+def test_uncached_urls_pass_through(cache, session):
+    session.get.return_value = make_response()
+    cache.get(session, "https://api.scryfall.com/cards/random")
+    cache.get(session, "https://api.scryfall.com/cards/random")
+    assert session.get.call_count == 2
+    assert cache.stats()["entries"] == 0
+
+def test_error_responses_are_not_stored(cache, session):
+    session.get.return_value = make_response(status=404)
+    cache.get(session, DECKS_URL)
+    assert cache.stats()["entries"] == 0
+
+def test_lru_eviction_keeps_cache_within_bounds(tmp_path, session):
+    """Test that the least recently used entries are evicted first."""
+    cache = ResponseCache(directory=str(tmp_path / "http"), max_bytes=25, ttls=TTLS)
+    for name in ("a", "b"):
+        session.get.return_value = make_response(content=name.encode() * 10)
+        cache.get(session, f"https://edhrec.com/decks/{name}")
+    cache.get(session, "https://edhrec.com/decks/a") # "a" is now more recent than "b"
+
+    session.get.return_value = make_response(content=b"c" * 10)
+    cache.get(session, "https://edhrec.com/decks/c")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evicted"] == 1
+    session.get.reset_mock()
+    cache.get(session, "https://edhrec.com/decks/a")
+    assert session.get.call_count == 0
+    cache.close()
+
+def test_identical_bodies_are_stored_once(cache, session, tmp_path):
+    """Test that bodies are content-addressed."""
+    session.get.return_value = make_response(content=b"same")
+    cache.get(session, "https://edhrec.com/decks/a")
+    cache.get(session, "https://edhrec.com/decks/b")
+    blobs = [p for p in (tmp_path / "http" / "blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+
+def test_released_body_is_not_deleted_under_a_concurrent_store(cache, mocker):
+    """Test that a body being released can't be deleted after another thread indexed it again."""
+    import threading, time
+    cache._store("a", "https://edhrec.com/decks/a", make_response(content=b"shared"), time.time())
+    remove_blob = cache._remove_blob
+    other = threading.Thread(target=cache._store,
+                             args=("b", "https://edhrec.com/decks/b", make_response(content=b"shared"), time.time()))
+
+    def remove_while_storing(content_hash):
+        # Give the other store every chance to run between the refcount check and the unlink
+        other.start()
+        other.join(0.2)
+        remove_blob(content_hash)
+    mocker.patch.object(cache, "_remove_blob", side_effect=remove_while_storing)
+
+    cache._store("a", "https://edhrec.com/decks/a", make_response(content=b"other"), time.time())
+    other.join()
+    assert cache._build_response(cache._lookup("b")).content == b"shared"
+
+def test_clear_removes_everything(cache, session):
+    session.get.return_value = make_response()
+    cache.get(session, DECKS_URL)
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+    cache.get(session, DECKS_URL)
+    assert session.get.call_count == 2
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.network.slug_resolver import SlugResolver, slug_from_name, slug_from_url
+
+ROUTE_URL = "https://edhrec.com/route/?cc=Lim-D%C3%BBl+the+Necromancer"
+
+
+@pytest.fixture
+def resolver(tmp_path):
+    return SlugResolver(str(tmp_path / "slugs.json"))
+
+@pytest.fixture
+def mock_head(mocker):
+    return mocker.patch("network.http_client.head", return_value=MagicMock(
+        status_code=302, headers={"Location": "/commanders/lim-dul-the-necromancer"}))
+
+@pytest.mark.parametrize("name, slug", [
+    ("Atraxa, Praetors' Voice", "atraxa-praetors-voice"),
+    ("Esika, God of the Tree // The Prismatic Bridge", "esika-god-of-the-tree"),
+    ("Lim-Dûl the Necromancer", "lim-dul-the-necromancer"),
+    ("Minsc & Boo, Timeless Heroes", "minsc-boo-timeless-heroes"),
+])
+def test_slug_from_name(name, slug):
+    assert slug_from_name(name) == slug
+
+def test_slug_from_url():
+    assert slug_from_url("https://edhrec.com/commanders/krenko-mob-boss/") == "krenko-mob-boss"
+
+def test_simple_names_resolve_without_requests(resolver, mock_head, mocker):
+    """Test that plainly named cards never cause a request."""
+    mock_get = mocker.patch("network.http_client.get")
+    assert resolver.resolve({"oracle_id": "o1", "name": "Atraxa, Praetors' Voice"}) == "atraxa-praetors-voice"
+    mock_head.assert_not_called()
+    mock_get.assert_not_called()
+
+def test_other_names_resolved_from_redirect(resolver, mock_head):
+    """Test that the slug is read from the Location header of a HEAD request."""
+    card = {"oracle_id": "o2", "name": "Lim-Dûl the Necromancer", "related_uris": {"edhrec": ROUTE_URL}}
+    assert resolver.resolve(card) == "lim-dul-the-necromancer"
+    mock_head.assert_called_once_with(ROUTE_URL, allow_redirects=False)
+
+def test_falls_back_to_streamed_get(resolver, mocker):
+    """Test that a server rejecting HEAD is asked with a GET whose body is not downloaded."""
+    mocker.patch("network.http_client.head", return_value=MagicMock(status_code=405, headers={}))
+    redirect = MagicMock(status_code=301, headers={"Location": "https://edhrec.com/commanders/jhoira"})
+    mock_get = mocker.patch("network.http_client.get", return_value=redirect)
+    assert resolver.resolve({"name": "Jhoira!", "related_uris": {"edhrec": ROUTE_URL}}) == "jhoira"
+    mock_get.assert_called_once_with(ROUTE_URL, use_cache=False, allow_redirects=False, stream=True)
+    redirect.close.assert_called_once()
+
+def test_resolutions_are_persisted(resolver, mock_head, tmp_path):
+    """Test that a resolved slug is stored and reused by a later resolver."""
+    card = {"oracle_id": "o2", "name": "Lim-Dûl the Necromancer", "related_uris": {"edhrec": ROUTE_URL}}
+    resolver.resolve(card)
+    assert json.loads((tmp_path / "slugs.json").read_text()) == {"o2": "lim-dul-the-necromancer"}
+
+    assert SlugResolver(str(tmp_path / "slugs.json")).resolve(card) == "lim-dul-the-necromancer"
+    assert mock_head.call_count == 1
+
+def test_unresolvable_card(resolver):
+    assert resolver.resolve({"name": "Jhoira!"}) is None
+
+def test_corrupt_map_is_ignored(tmp_path):
+    path = tmp_path / "slugs.json"
+    path.write_text("{not json")
+    assert SlugResolver(str(path)).resolve({"id": "x", "name": "Krenko, Mob Boss"}) == "krenko-mob-boss"
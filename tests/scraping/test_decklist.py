@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+from src.scraping.decklist import DeckEntry, Decklist, export_decklist
+
+@pytest.fixture
+def decklist():
+    return Decklist([
+        DeckEntry(1, "Atraxa, Praetors' Voice", "CM2", "10", "commander"),
+        DeckEntry(1, "Sol Ring", "cmm", "410"),
+        DeckEntry(10, "Forest", "MH3", "318", foil=True),
+        DeckEntry(1, "Swords to Plowshares", "STA", "10", "sideboard"),
+    ], "https://moxfield.com/decks/abc")
+
+def test_decklist_boards(decklist):
+    assert decklist.commanders == ["Atraxa, Praetors' Voice"]
+    assert [entry.name for entry in decklist.board("sideboard")] == ["Swords to Plowshares"]
+    assert decklist.card_count == 13
+    assert len(decklist) == 4
+
+def test_entries_have_no_instance_dict(decklist):
+    assert not hasattr(decklist, "__dict__")
+    assert not hasattr(decklist.entries[0], "__dict__")
+
+def test_dict_round_trip(decklist):
+    data = json.loads(json.dumps(decklist.to_dict()))
+    assert Decklist.from_dict(data) == decklist
+
+def test_moxfield_export(decklist):
+    assert export_decklist(decklist) == (
+        "1 Atraxa, Praetors' Voice (CM2) 10\n"
+        "1 Sol Ring (cmm) 410\n"
+        "10 Forest (MH3) 318 *F*\n"
+        "\n"
+        "SIDEBOARD:\n"
+        "1 Swords to Plowshares (STA) 10"
+    )
+
+def test_mtgo_export_puts_commander_into_sideboard(decklist):
+    assert export_decklist(decklist, "mtgo") == (
+        "1 Sol Ring\n10 Forest\n\n1 Atraxa, Praetors' Voice\n1 Swords to Plowshares"
+    )
+
+def test_arena_export(decklist):
+    assert export_decklist(decklist, "arena") == (
+        "Commander\n1 Atraxa, Praetors' Voice (CM2) 10\n\n"
+        "Deck\n1 Sol Ring (CMM) 410\n10 Forest (MH3) 318\n\n"
+        "Sideboard\n1 Swords to Plowshares (STA) 10"
+    )
+
+def test_csv_export(decklist):
+    lines = export_decklist(decklist, "csv").splitlines()
+    assert lines[0] == "quantity,name,set,collector_number,board,foil"
+    assert lines[1] == "1,\"Atraxa, Praetors' Voice\",CM2,10,commander,"
+    assert lines[3] == "10,Forest,MH3,318,mainboard,foil"
+
+def test_json_export(decklist):
+    data = json.loads(export_decklist(decklist, "json"))
+    assert data["source_url"] == "https://moxfield.com/decks/abc"
+    assert data["cards"][0] == {"quantity": 1, "name": "Atraxa, Praetors' Voice", "set_code": "CM2",
+                                "collector_number": "10", "board": "commander", "foil": False}
+
+def test_unknown_export_format(decklist):
+    with pytest.raises(ValueError, match="Unknown decklist format"):
+        export_decklist(decklist, "tappedout")
+
+def test_from_text_reads_moxfield_export(decklist):
+    parsed = Decklist.from_text(export_decklist(decklist))
+    assert [(entry.quantity, entry.name, entry.board, entry.foil) for entry in parsed] == [
+        (1, "Atraxa, Praetors' Voice", "mainboard", False),  # Moxfield's text doesn't mark commanders
+        (1, "Sol Ring", "mainboard", False),
+        (10, "Forest", "mainboard", True),
+        (1, "Swords to Plowshares", "sideboard", False),
+    ]
+    assert parsed.entries[1].set_code == "cmm" and parsed.entries[1].collector_number == "410"
+
+def test_from_text_reads_arena_sections(decklist):
+    parsed = Decklist.from_text(export_decklist(decklist, "arena"))
+    assert parsed.commanders == ["Atraxa, Praetors' Voice"]
+    assert [entry.board for entry in parsed] == ["commander", "mainboard", "mainboard", "sideboard"]
+
+def test_from_text_without_printing():
+    parsed = Decklist.from_text("1x Sol Ring\nError Prone Card\n")
+    assert [(entry.quantity, entry.name, entry.set_code) for entry in parsed] == [
+        (1, "Sol Ring", None), (1, "Error Prone Card", None)]
@@ -0,0 +1,163 @@
+import threading
+import time
+import pytest
+from unittest.mock import MagicMock
+
+from src.scraping.driver_pool import DriverPool, block_resources, blocked_url_patterns, create_stealth_driver
+
+@pytest.fixture
+def factory():
+    """Creates a new mock browser on every call."""
+    def create():
+        driver = MagicMock()
+        driver.execute_script.return_value = None
+        return driver
+    return MagicMock(side_effect=create)
+
+def test_released_driver_is_reused(factory):
+    pool = DriverPool(max_drivers=2, driver_factory=factory)
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.acquire() is driver
+    assert factory.call_count == 1
+    driver.get.assert_called_with("about:blank") # The page was dropped between uses
+
+def test_lease_context_manager(factory):
+    pool = DriverPool(driver_factory=factory)
+    with pool.lease() as driver:
+        pass
+    assert pool.idle_count == 1
+
+    with pytest.raises(ValueError):
+        with pool.lease() as same_driver:
+            raise ValueError("scrape failed")
+    assert same_driver is driver
+    driver.quit.assert_called_once()
+    assert pool.idle_count == 0
+
+def test_driver_is_recycled_after_max_uses(factory):
+    pool = DriverPool(max_uses=2, driver_factory=factory)
+    first = pool.acquire()
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)
+    first.quit.assert_called_once()
+    assert pool.acquire() is not first
+
+def test_driver_is_recycled_above_memory_threshold(factory):
+    pool = DriverPool(max_js_heap_mb=1, driver_factory=factory)
+    driver = pool.acquire()
+    driver.execute_script.return_value = 2 * 1024 * 1024
+    pool.release(driver)
+    driver.quit.assert_called_once()
+    assert pool.idle_count == 0
+
+def test_unhealthy_idle_driver_is_replaced(factory):
+    pool = DriverPool(driver_factory=factory)
+    dead = pool.acquire()
+    pool.release(dead)
+    dead.execute_script.side_effect = Exception("chrome not reachable")
+
+    driver = pool.acquire()
+    assert driver is not dead
+    dead.quit.assert_called_once()
+
+def test_acquire_waits_for_free_driver(factory):
+    pool = DriverPool(max_drivers=1, driver_factory=factory)
+    driver = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+
+    threading.Timer(0.05, pool.release, args=(driver,)).start()
+    assert pool.acquire(timeout=2) is driver
+
+def test_shutdown_quits_idle_and_released_drivers(factory):
+    pool = DriverPool(max_drivers=2, driver_factory=factory)
+    idle, leased = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.shutdown()
+    idle.quit.assert_called_once()
+    leased.quit.assert_not_called()
+
+    pool.release(leased)
+    leased.quit.assert_called_once()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+def test_prewarmed_driver_is_leased_without_launch(factory):
+    pool = DriverPool(max_drivers=2, driver_factory=factory, idle_timeout=None)
+    assert pool.prewarm() == 1
+    assert pool.prewarm() == 0  # One browser is idle already
+    assert factory.call_count == 1
+    driver = pool.acquire()
+    assert factory.call_count == 1
+    pool.release(driver)
+
+def test_prewarm_respects_max_drivers(factory):
+    pool = DriverPool(max_drivers=1, driver_factory=factory, idle_timeout=None)
+    driver = pool.acquire()
+    assert pool.prewarm() == 0
+    pool.release(driver)
+    assert pool.prewarm(count=2) == 0
+    assert pool.idle_count == 1
+
+def test_prewarm_after_shutdown_does_nothing(factory):
+    pool = DriverPool(driver_factory=factory)
+    pool.shutdown()
+    assert pool.prewarm() == 0
+    factory.assert_not_called()
+
+def test_idle_driver_quits_after_timeout(factory):
+    pool = DriverPool(driver_factory=factory, idle_timeout=0.05)
+    pool.prewarm()
+    driver = pool.acquire()
+    pool.release(driver)
+    assert pool.idle_count == 1
+
+    deadline = time.monotonic() + 5
+    while pool.idle_count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.idle_count == 0
+    driver.quit.assert_called_once()
+
+def test_reap_idle_keeps_recently_used_drivers(factory):
+    pool = DriverPool(driver_factory=factory, idle_timeout=60)
+    pool.prewarm()
+    assert pool.reap_idle() == 0
+    assert pool.idle_count == 1
+    pool.shutdown()
+
+def test_stealth_driver_uses_lean_page_loads(mock_selenium_driver):
+    from selenium import webdriver
+    assert create_stealth_driver() is mock_selenium_driver
+    options = webdriver.Chrome.call_args.kwargs["options"]
+    assert options.page_load_strategy == "eager"
+
+def test_blocked_url_patterns_respect_site_allowlist():
+    archidekt = blocked_url_patterns("archidekt")
+    assert "*.png" in archidekt and "*.woff2" in archidekt and "*google-analytics.com*" in archidekt
+    assert "*.svg" in archidekt
+    assert "*.svg" not in blocked_url_patterns("moxfield")
+    assert blocked_url_patterns("unknown") == archidekt
+
+def test_block_resources_sets_blocked_urls():
+    driver = MagicMock()
+    block_resources(driver, "moxfield")
+    driver.execute_cdp_cmd.assert_any_call("Network.enable", {})
+    driver.execute_cdp_cmd.assert_called_with("Network.setBlockedURLs", {"urls": blocked_url_patterns("moxfield")})
+
+def test_block_resources_failure_is_ignored():
+    driver = MagicMock()
+    driver.execute_cdp_cmd.side_effect = Exception("not a Chrome driver")
+    block_resources(driver, "archidekt")  # Does not raise
+
+def test_prewarm_in_background(factory):
+    pool = DriverPool(driver_factory=factory, idle_timeout=None)
+    pool.prewarm_in_background().join(2)
+    assert pool.idle_count == 1
+
+def test_prewarm_in_background_failure_is_logged(capsys):
+    pool = DriverPool(driver_factory=MagicMock(side_effect=Exception("chromedriver missing")))
+    pool.prewarm_in_background().join(2)
+    assert pool.idle_count == 0
+    assert "chromedriver missing" in capsys.readouterr().out
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.scraping.http_scrapers import (
+    BotChallengeError, ScrapeError, archidekt_decklist_from_next_data, fetch_archidekt_decklist,
+    fetch_moxfield_decklist, moxfield_decklist_from_json, moxfield_public_id
+)
+from src.scraping.decklist import to_moxfield_text
+
+def test_archidekt_decklist_from_next_data():
+    """Test that commanders come first and maybeboard cards are skipped."""
+    data = {"props": {"pageProps": {"redux": {"deck": {"cardMap": {
+        "1": {"qty": 1, "name": "Sol Ring", "setCode": "cmm", "collectorNumber": "410", "categories": ["Ramp"]},
+        "2": {"qty": 1, "name": "Atraxa", "setCode": "one", "collectorNumber": "196", "categories": ["Commander"]},
+        "3": {"qty": 1, "name": "Arcane Signet", "setCode": "cmm", "collectorNumber": "1", "categories": ["Maybeboard"]},
+    }}}}}}
+    assert to_moxfield_text(archidekt_decklist_from_next_data(data)) == "1 Atraxa (one) 196\n1 Sol Ring (cmm) 410"
+
+def test_archidekt_decklist_without_card_map():
+    with pytest.raises(ScrapeError, match="cardMap"):
+        archidekt_decklist_from_next_data({"props": {}})
+
+@pytest.mark.parametrize("status, text", [
+    (403, "Forbidden"),
+    (503, "Service unavailable"),
+    (200, "<html><head><title>Just a moment...</title></head></html>"),
+    (200, '<script src="/cdn-cgi/challenge-platform/h/b/orchestrate/jsch/v1"></script>'),
+])
+def test_fetch_archidekt_detects_bot_challenge(mocker, status, text):
+    from src.scraping import http_scrapers
+    mocker.patch("network.http_client.get", return_value=MagicMock(status_code=status, text=text))
+    mocker.patch.object(http_scrapers, "_bot_challenge_seen", http_scrapers.threading.Event())
+    with pytest.raises(BotChallengeError):
+        fetch_archidekt_decklist("https://archidekt.com/decks/1")
+    assert http_scrapers.bot_challenge_seen()
+
+def test_fetch_archidekt_without_next_data(mocker):
+    mocker.patch("network.http_client.get", return_value=MagicMock(status_code=200, text="<html></html>"))
+    with pytest.raises(ScrapeError, match="__NEXT_DATA__"):
+        fetch_archidekt_decklist("https://archidekt.com/decks/1")
+
+def _entry(name, set_code, cn, quantity=1, **extra):
+    return dict({"quantity": quantity, "card": {"name": name, "set": set_code, "cn": cn}}, **extra)
+
+def test_moxfield_decklist_from_v3_json():
+    """Test the export text format: commanders first, sorted mainboard, sideboard section, no maybeboard."""
+    deck = {"boards": {
+        "commanders": {"cards": {"a": _entry("Atraxa, Praetors' Voice", "cm2", "10")}},
+        "mainboard": {"cards": {
+            "b": _entry("Sol Ring", "cmm", "410"),
+            "c": _entry("Forest", "mh3", "318", quantity=10),
+            "d": _entry("Arcane Signet", "cmm", "368", finish="foil"),
+        }},
+        "sideboard": {"cards": {"e": _entry("Swords to Plowshares", "sta", "10")}},
+        "maybeboard": {"cards": {"f": _entry("Mana Crypt", "2xm", "270")}},
+    }}
+    assert to_moxfield_text(moxfield_decklist_from_json(deck)) == (
+        "1 Atraxa, Praetors' Voice (CM2) 10\n"
+        "1 Arcane Signet (CMM) 368 *F*\n"
+        "10 Forest (MH3) 318\n"
+        "1 Sol Ring (CMM) 410\n"
+        "\n"
+        "SIDEBOARD:\n"
+        "1 Swords to Plowshares (STA) 10"
+    )
+
+def test_moxfield_decklist_from_v2_json():
+    deck = {"commanders": {"Atraxa": _entry("Atraxa", "cm2", "10")},
+            "mainboard": {"Sol Ring": _entry("Sol Ring", "cmm", "410")}}
+    assert to_moxfield_text(moxfield_decklist_from_json(deck)) == "1 Atraxa (CM2) 10\n1 Sol Ring (CMM) 410"
+
+def test_moxfield_decklist_without_set():
+    deck = {"mainboard": {"Sol Ring": {"quantity": 1, "card": {"name": "Sol Ring", "set": None, "cn": None}}}}
+    assert to_moxfield_text(moxfield_decklist_from_json(deck)) == "1 Sol Ring"
+
+def test_moxfield_decklist_without_cards():
+    with pytest.raises(ScrapeError):
+        moxfield_decklist_from_json({"boards": {}})
+
+def test_moxfield_public_id():
+    assert moxfield_public_id("https://www.moxfield.com/decks/Ab-C_12?utm=x") == "Ab-C_12"
+    assert moxfield_public_id("https://moxfield.com/decks/xyz/primer") == "xyz"
+    with pytest.raises(ScrapeError):
+        moxfield_public_id("https://moxfield.com/users/someone")
+
+def test_fetch_moxfield_detects_bot_challenge(mocker):
+    mocker.patch("network.http_client.get", return_value=MagicMock(status_code=403, text="Forbidden"))
+    with pytest.raises(BotChallengeError):
+        fetch_moxfield_decklist("https://moxfield.com/decks/abc")
@@ -3,7 +3,9 @@ from unittest.mock import MagicMock, patch
 from PyQt5.QtCore import QThread
 import os
 
-from src.scraping.scraper_worker import DecklistScraperWorker
+from src.scraping.decklist import DeckEntry, to_moxfield_text
+from src.scraping.driver_pool import DriverPool
+from src.scraping.scraper_worker import DecklistScraperWorker, ScrapeError
 from src.config.constants import DEBUG_SCREENSHOT_PATH_TPL, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
 
 # Helper to clean up files created by tests
@@ -22,6 +24,13 @@ def worker_thread():
     thread.quit()
     thread.wait()
 
+@pytest.fixture
+def driver_pool():
+    """A private driver pool so tests don't share browsers through the global one."""
+    pool = DriverPool(max_drivers=1)
+    yield pool
+    pool.shutdown()
+
 def test_scraper_worker_init():
     """Test initialization and site detection."""
     worker_mox = DecklistScraperWorker("https://moxfield.com/decks/abc")
@@ -33,27 +42,38 @@ def test_scraper_worker_init():
     worker_unknown = DecklistScraperWorker("https://example.com/deck")
     assert worker_unknown.site == "unknown"
 
-def test_scrape_moxfield_success(worker_thread, mock_selenium_driver, qtbot):
+@pytest.fixture
+def bot_challenge(mocker):
+    """Makes every plain HTTP request run into a Cloudflare check, forcing the Selenium path."""
+    return mocker.patch("network.http_client.get",
+                        return_value=MagicMock(status_code=403, text="<title>Just a moment...</title>"))
+
+def test_scrape_moxfield_success(worker_thread, mock_selenium_driver, driver_pool, bot_challenge, qtbot):
     """Test Moxfield scraping with mocked Selenium."""
-    worker = DecklistScraperWorker("https://moxfield.com/decks/test")
+    worker = DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool)
     worker.moveToThread(worker_thread)
 
     mock_selenium_driver.find_element.return_value.get_attribute.return_value = "1 Card A\n2 Card B"
 
     result = []
-    worker.finished.connect(result.append)
+    worker.decklist_ready.connect(result.append)
 
     worker_thread.started.connect(worker.run)
-    worker_thread.start()
-    qtbot.waitUntil(lambda: len(result) > 0, timeout=5000)
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker_thread.start()
 
-    assert result[0] == "1 Card A\n2 Card B"
+    assert to_moxfield_text(result[0]) == "1 Card A\n2 Card B"
+    assert result[0].source_url == "https://moxfield.com/decks/test"
     mock_selenium_driver.execute_script.call_count == 2 # For more_button and export_link
+    # The browser stays warm in the pool for the next scrape
+    mock_selenium_driver.quit.assert_not_called()
+    assert driver_pool.idle_count == 1
+    driver_pool.shutdown()
     mock_selenium_driver.quit.assert_called_once()
 
-def test_scrape_archidekt_success(worker_thread, mock_selenium_driver, qtbot):
-    """Test Archidekt scraping with mocked Selenium and BeautifulSoup."""
-    worker = DecklistScraperWorker("https://archidekt.com/decks/test")
+def test_scrape_archidekt_success(worker_thread, mock_selenium_driver, driver_pool, bot_challenge, qtbot):
+    """Test Archidekt scraping with mocked Selenium and BeautifulSoup after the HTTP path hit a bot check."""
+    worker = DecklistScraperWorker("https://archidekt.com/decks/test", driver_pool)
     worker.moveToThread(worker_thread)
 
     # Configure the mock driver to return a page source containing the JSON data
@@ -61,12 +81,132 @@ def test_scrape_archidekt_success(worker_thread, mock_selenium_driver, qtbot):
     mock_selenium_driver.page_source = f'<html><body><script id="__NEXT_DATA__">{json_data}</script></body></html>'
 
     result = []
-    worker.finished.connect(result.append)
+    worker.decklist_ready.connect(result.append)
 
     worker_thread.started.connect(worker.run)
-    worker_thread.start()
-    qtbot.waitUntil(lambda: len(result) > 0, timeout=5000)
+    with qtbot.waitSignal(worker.finished, timeout=5000):
+        worker_thread.start()
 
     expected_decklist = "2 Card B (SET) 2\n1 Card A (SET) 1" # Commander first, then sorted
-    assert result[0] == expected_decklist
-    mock_selenium_driver.quit.assert_called_once()
\ No newline at end of file
+    assert to_moxfield_text(result[0]) == expected_decklist
+    assert result[0].commanders == ["Card B"]
+    mock_selenium_driver.quit.assert_not_called()
+
+def test_sequential_scrapes_reuse_browser(mock_selenium_driver, driver_pool, bot_challenge, qtbot):
+    """Test that a second scrape does not launch another browser."""
+    from selenium import webdriver
+    mock_selenium_driver.find_element.return_value.get_attribute.return_value = "1 Card A"
+    for _ in range(2):
+        worker = DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool)
+        result = []
+        worker.decklist_ready.connect(result.append)
+        worker.run()
+        assert result == [worker.scrape()]
+        assert result[0].entries[0].to_dict() == DeckEntry(1, "Card A").to_dict()
+    assert webdriver.Chrome.call_count == 1
+
+def test_unexpected_error_discards_browser(mock_selenium_driver, driver_pool, bot_challenge):
+    """Test that a browser that failed unexpectedly is not handed out again."""
+    mock_selenium_driver.get.side_effect = [RuntimeError("renderer crashed"), None]
+    worker = DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool)
+    errors, done = [], []
+    worker.failed.connect(errors.append)
+    worker.finished.connect(lambda: done.append(True))
+    worker.run()
+
+    assert errors[0].startswith("An unexpected error occurred: RuntimeError")
+    assert done == [True]
+    mock_selenium_driver.quit.assert_called_once()
+    assert driver_pool.idle_count == 0
+
+ARCHIDEKT_PAGE = (
+    '<html><body><script id="__NEXT_DATA__">'
+    '{"props": {"pageProps": {"redux": {"deck": {"cardMap": {'
+    '"1": {"qty": 1, "name": "Card A", "setCode": "SET", "collectorNumber": "1", "categories": []}, '
+    '"2": {"qty": 1, "name": "Card C", "setCode": "SET", "collectorNumber": "3", "categories": ["Maybeboard"]}, '
+    '"3": {"qty": 1, "name": "Card B", "setCode": "SET", "collectorNumber": "2", "categories": ["Commander"]}'
+    '}}}}}}</script></body></html>'
+)
+
+def test_scrape_archidekt_without_browser(mock_selenium_driver, driver_pool, mocker):
+    """Test that Archidekt decks are read over plain HTTP without launching Chrome."""
+    from selenium import webdriver
+    mocker.patch("network.http_client.get", return_value=MagicMock(status_code=200, text=ARCHIDEKT_PAGE))
+    worker = DecklistScraperWorker("https://archidekt.com/decks/test", driver_pool)
+    result = []
+    worker.decklist_ready.connect(result.append)
+    worker.run()
+
+    assert to_moxfield_text(result[0]) == "1 Card B (SET) 2\n1 Card A (SET) 1"
+    webdriver.Chrome.assert_not_called()
+
+def test_scrape_archidekt_http_error_does_not_launch_browser(mock_selenium_driver, driver_pool, mocker):
+    """Test that only bot checks trigger the Selenium fallback."""
+    from selenium import webdriver
+    import requests
+    response = MagicMock(status_code=404, text="Not found")
+    response.raise_for_status.side_effect = requests.exceptions.HTTPError("404 Client Error")
+    mocker.patch("network.http_client.get", return_value=response)
+    worker = DecklistScraperWorker("https://archidekt.com/decks/test", driver_pool)
+    result, errors = [], []
+    worker.decklist_ready.connect(result.append)
+    worker.failed.connect(errors.append)
+    worker.run()
+
+    assert result == []
+    assert errors[0].startswith("Could not load the Archidekt deck")
+    webdriver.Chrome.assert_not_called()
+
+def test_scrape_moxfield_without_browser(mock_selenium_driver, driver_pool, mocker):
+    """Test that Moxfield decks are read from the deck API without launching Chrome."""
+    from selenium import webdriver
+    deck = {"boards": {
+        "commanders": {"cards": {"x": {"quantity": 1, "card": {"name": "Atraxa", "set": "one", "cn": "196"}}}},
+        "mainboard": {"cards": {"y": {"quantity": 1, "card": {"name": "Sol Ring", "set": "cmm", "cn": "410"}}}},
+    }}
+    mock_get = mocker.patch("network.http_client.get",
+                            return_value=MagicMock(status_code=200, text="{}", json=lambda: deck))
+    worker = DecklistScraperWorker("https://moxfield.com/decks/AbC-12", driver_pool)
+    result = []
+    worker.decklist_ready.connect(result.append)
+    worker.run()
+
+    assert to_moxfield_text(result[0]) == "1 Atraxa (ONE) 196\n1 Sol Ring (CMM) 410"
+    assert mock_get.call_args.args[0] == "https://api2.moxfield.com/v3/decks/all/AbC-12"
+    webdriver.Chrome.assert_not_called()
+
+def test_scrape_returns_decklist_without_signal(mock_selenium_driver, driver_pool, bot_challenge):
+    """Test that scrape() can be called synchronously, e.g. from a batch pool thread."""
+    mock_selenium_driver.find_element.return_value.get_attribute.return_value = "1 Card A"
+    worker = DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool)
+    emitted = []
+    worker.decklist_ready.connect(emitted.append)
+
+    assert to_moxfield_text(worker.scrape()) == "1 Card A"
+    assert emitted == []
+
+def test_scrape_unsupported_site(mock_selenium_driver, driver_pool):
+    worker = DecklistScraperWorker("https://example.com/deck", driver_pool)
+    with pytest.raises(ScrapeError, match="Unsupported website"):
+        worker.scrape()
+
+def test_scrape_error_is_not_mistaken_for_a_card(mock_selenium_driver, driver_pool, bot_challenge):
+    """A card name containing "Error" is just a card."""
+    mock_selenium_driver.find_element.return_value.get_attribute.return_value = "1 Error Card (SET) 1"
+    worker = DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool)
+    result, errors = [], []
+    worker.decklist_ready.connect(result.append)
+    worker.failed.connect(errors.append)
+    worker.run()
+    assert errors == []
+    assert result[0].entries[0].name == "Error Card"
+
+def test_selenium_scrape_blocks_resources_before_loading(mock_selenium_driver, driver_pool, bot_challenge):
+    """The pooled browser gets the site's block list before it opens the deck."""
+    calls = []
+    mock_selenium_driver.execute_cdp_cmd.side_effect = lambda cmd, params: calls.append(cmd)
+    mock_selenium_driver.get.side_effect = lambda url: calls.append(url)
+    mock_selenium_driver.find_element.return_value.get_attribute.return_value = "1 Card A"
+
+    DecklistScraperWorker("https://moxfield.com/decks/test", driver_pool).scrape()
+    assert calls.index("Network.setBlockedURLs") < calls.index("https://moxfield.com/decks/test")
@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from src import cli
+from src.scraping.decklist import Decklist
+
+
+@pytest.fixture
+def fake_find(mocker):
+    """Replaces the pipeline the CLI runs for every commander."""
+    def find(query, budget, tags, salt, count, sort_order, partner, local_index, progress):
+        if query == "Nobody":
+            raise RuntimeError("Commander not found.")
+        progress("Commander found.")
+        decks = [{"rank": rank, "url": f"https://edhrec.com/deckpreview/{rank}", "price": 50, "tags": [],
+                  "salt": 10.0, "decklist": Decklist.from_text(f"1 {query} deck {rank}")} for rank in range(1, count + 1)]
+        return {"query": query, "commander": query, "partner": None, "decks": decks}
+    return mocker.patch("core.batch.find_decklists", side_effect=find)
+
+@pytest.fixture
+def batch_file(tmp_path):
+    path = tmp_path / "commanders.txt"
+    path.write_text("Krenko, Mob Boss\nAtraxa | <200\n", encoding="utf-8")
+    return str(path)
+
+def test_cli_writes_jsonl(fake_find, batch_file, tmp_path, capsys):
+    out = tmp_path / "decks.jsonl"
+    assert cli.main([batch_file, "--jsonl", str(out), "--budget", "<100", "-n", "2", "--sort", "cheapest"]) == 0
+
+    results = sorted((json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()),
+                     key=lambda r: r["query"])
+    assert [r["commander"] for r in results] == ["Atraxa", "Krenko, Mob Boss"]
+    assert results[0]["decks"][0]["decklist"]["cards"][0]["name"] == "Atraxa deck 1"
+    assert len(results[1]["decks"]) == 2
+    assert fake_find.call_args.kwargs["sort_order"] == "cheapest"
+    assert "Done: 2 of 2 commanders have decklists." in capsys.readouterr().err
+
+def test_cli_writes_deck_files(fake_find, batch_file, tmp_path):
+    out_dir = tmp_path / "decks"
+    assert cli.main([batch_file, "--out-dir", str(out_dir), "-q"]) == 0
+    assert sorted(p.name for p in out_dir.iterdir()) == ["1-krenko-mob-boss-1.txt", "2-atraxa-1.txt"]
+    assert (out_dir / "2-atraxa-1.txt").read_text(encoding="utf-8") == "1 Atraxa deck 1\n"
+
+def test_cli_writes_deck_files_in_export_format(fake_find, batch_file, tmp_path):
+    out_dir = tmp_path / "decks"
+    assert cli.main([batch_file, "--out-dir", str(out_dir), "--format", "arena", "-q"]) == 0
+    assert (out_dir / "2-atraxa-1.txt").read_text(encoding="utf-8") == "Deck\n1 Atraxa deck 1\n"
+
+def test_cli_reports_failed_commanders(fake_find, tmp_path, capsys):
+    path = tmp_path / "commanders.txt"
+    path.write_text("Krenko\nNobody\n", encoding="utf-8")
+    assert cli.main([str(path), "--jsonl", "-", "-q"]) == 1
+    captured = capsys.readouterr()
+    assert "[Nobody] Failed: Commander not found." in captured.err
+    assert len(captured.out.splitlines()) == 2
+
+def test_cli_requires_an_output(batch_file):
+    with pytest.raises(SystemExit):
+        cli.main([batch_file])
+
+@pytest.mark.parametrize("option", ["--workers", "--count"])
+@pytest.mark.parametrize("value", ["0", "-1", "two"])
+def test_cli_rejects_non_positive_numbers(fake_find, batch_file, option, value, capsys):
+    with pytest.raises(SystemExit):
+        cli.main([batch_file, "--jsonl", "-", option, value])
+    assert option in capsys.readouterr().err
+    fake_find.assert_not_called()
+
+def test_cli_missing_file(tmp_path, capsys):
+    assert cli.main([str(tmp_path / "missing.txt"), "--jsonl", "-"]) == 1
+    assert "Could not read" in capsys.readouterr().err
+
+def test_cli_does_not_need_qt():
+    """Test that the CLI runs without Qt, e.g. on servers without a display."""
+    import os, subprocess, sys
+    src_dir = os.path.join(os.path.dirname(__file__), "..", "src")
+    code = "import sys, cli; assert not [m for m in sys.modules if m.startswith('PyQt5')], 'Qt imported'"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=src_dir)
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), "..", "src")
+
+# Modules that must not be imported before the window is shown
+LAZY_MODULES = ("selenium", "selenium_stealth", "bs4", "requests", "urllib3", "pyperclip")
+# Modules the GUI's startup imports may add to sys.modules. It adds about 65 today;
+# importing Selenium, requests or BeautifulSoup eagerly adds over 200 more.
+STARTUP_MAX_NEW_MODULES = 120
+
+
+def _import_in_fresh_interpreter(*modules):
+    """
+    Imports modules in a new Python process and returns (lazy modules that were
+    loaded, number of modules the imports added to sys.modules).
+    """
+    code = (
+        "import json, sys\n"
+        "before = len(sys.modules)\n"
+        f"import {', '.join(modules)}\n"
+        f"print(json.dumps([[m for m in {LAZY_MODULES!r} if m in sys.modules], len(sys.modules) - before]))\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_main_window_import_is_lean():
+    """Test that starting the GUI does not import Selenium, requests or the other heavy modules."""
+    loaded, _ = _import_in_fresh_interpreter("ui.main_window")
+    assert loaded == []
+
+def test_startup_imports_few_modules():
+    """Test that the modules imported before the window shows stay few, a machine-independent startup cost."""
+    _, added = _import_in_fresh_interpreter("qtcommanderfinder", "ui.main_window")
+    assert added <= STARTUP_MAX_NEW_MODULES
+
+def test_main_window_starts_without_heavy_modules():
+    """Test that showing the window does not pull them in either."""
+    code = (
+        "import sys\n"
+        "from PyQt5.QtWidgets import QApplication\n"
+        "app = QApplication([])\n"
+        "from ui.main_window import MainWindow\n"
+        "window = MainWindow()\n"
+        "window.show()\n"
+        "app.processEvents()\n"
+        f"print([m for m in {LAZY_MODULES!r} if m in sys.modules])\n"
+    )
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.splitlines()[-1] == "[]"
+
+def test_warm_up_imports_in_background(capsys):
+    from src.utils.warm_up import start_import_warm_up
+    thread = start_import_warm_up(("json", "no_such_module_for_warm_up"))
+    thread.join(5)
+    assert not thread.is_alive()
+    assert thread.daemon
+    assert "Could not preload no_such_module_for_warm_up" in capsys.readouterr().out
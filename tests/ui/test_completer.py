@@ -1,8 +1,13 @@
+from unittest.mock import MagicMock
+
 import pytest
 from PyQt5.QtWidgets import QApplication, QLineEdit
 from PyQt5.QtCore import QStringListModel
 
-from src.ui.completer import MultiTagCompleter
+from src.card_index.name_index import CommanderNameIndex
+from src.config.constants import SCRYFALL_MIN_REQUEST_INTERVAL
+from src.network.request_worker import RequestPipeline
+from src.ui.completer import CommanderNameCompleter, FuzzyTagCompleter, MultiTagCompleter
 
 @pytest.fixture
 def completer_setup(qapp):
@@ -40,4 +45,120 @@ def test_pathFromIndex(completer_setup):
     line_edit.setText("")
     mock_index = completer.model().index(0, 0) # Index for "tag1"
     result = completer.pathFromIndex(mock_index)
-    assert result == "tag1"
\ No newline at end of file
+    assert result == "tag1"
+
+# --- Commander Name Completion --- #
+
+@pytest.fixture
+def name_completer(qtbot):
+    line_edit = QLineEdit()
+    qtbot.addWidget(line_edit)
+    pipeline = RequestPipeline()
+    completer = CommanderNameCompleter(line_edit, pipeline)
+    yield completer, line_edit
+    pipeline.wait_for_done(2000)
+
+def suggestions(completer):
+    return completer.model().stringList()
+
+def test_name_completer_uses_offline_names(name_completer, mocker, qtbot):
+    """Test that once the name index is loaded, suggestions are updated synchronously on every keystroke."""
+    completer, line_edit = name_completer
+    source = MagicMock()
+    load = mocker.patch("src.ui.completer.load_name_index",
+                        return_value=CommanderNameIndex(["Krenko, Mob Boss", "Kraum, Ludevic's Opus"]))
+    get = mocker.patch("network.http_client.get")
+    completer.set_name_source(source)
+
+    qtbot.keyClicks(line_edit, "k")
+    qtbot.waitUntil(lambda: completer.name_index is not None, timeout=1000)
+    load.assert_called_once_with(source)
+
+    qtbot.keyClicks(line_edit, "re")
+    assert suggestions(completer) == ["Krenko, Mob Boss"]
+    qtbot.keyClicks(line_edit, "x")
+    assert suggestions(completer) == []
+    qtbot.wait(300)
+    get.assert_not_called()
+
+def test_name_completer_falls_back_to_scryfall(name_completer, mock_requests_get, qtbot):
+    """Test that without offline names, Scryfall is asked once typing pauses."""
+    from network import http_client
+    from src.config.constants import SCRYFALL_API_AUTOCOMPLETE_URL
+    completer, line_edit = name_completer
+    mock_requests_get.json.return_value = {"data": ["Krenko, Mob Boss", "Krenko's Command"]}
+
+    qtbot.keyClicks(line_edit, "kre")
+    qtbot.waitUntil(lambda: suggestions(completer) == ["Krenko, Mob Boss", "Krenko's Command"], timeout=2000)
+    http_client.get.assert_called_once_with(SCRYFALL_API_AUTOCOMPLETE_URL, params={"q": "kre"})
+
+def test_name_completer_shares_scryfall_rate_limit(mocker):
+    """Test that autocomplete requests keep Scryfall's requested gap to searches, too."""
+    import time
+    from src.core.deck_finder import find_commander
+    times = []
+    def fake_get(url, **kwargs):
+        times.append(time.monotonic())
+        return MagicMock(json=lambda: {"data": [{"name": "Krenko, Mob Boss"}]}, raise_for_status=lambda: None)
+    mocker.patch("network.http_client.get", side_effect=fake_get)
+    CommanderNameCompleter._fetch_suggestions("kre", None)
+    find_commander("krenko")
+    CommanderNameCompleter._fetch_suggestions("kren", None)
+    assert all(later - earlier >= SCRYFALL_MIN_REQUEST_INTERVAL * 0.95 for earlier, later in zip(times, times[1:]))
+
+def test_name_completer_drops_outdated_answers(name_completer, qtbot):
+    completer, line_edit = name_completer
+    line_edit.setText("krenko")
+    completer._on_remote_suggestions("kre", ["Kresh the Bloodbraided"])
+    assert suggestions(completer) == []
+
+@pytest.mark.parametrize("text", ["k", "t:goblin", "krenko -c:r", '"krenko"', "cmc>3"])
+def test_name_completer_ignores_short_texts_and_queries(name_completer, mocker, qtbot, text):
+    completer, line_edit = name_completer
+    get = mocker.patch("network.http_client.get")
+    qtbot.keyClicks(line_edit, text)
+    qtbot.wait(350)
+    get.assert_not_called()
+    assert suggestions(completer) == []
+
+def test_name_completer_fills_in_activated_name(name_completer):
+    completer, line_edit = name_completer
+    line_edit.setText("kre")
+    completer.activated[str].emit("Krenko, Mob Boss")
+    assert line_edit.text() == "Krenko, Mob Boss"
+
+
+# --- Fuzzy Tag Completion --- #
+
+@pytest.fixture
+def tag_completer(qtbot):
+    line_edit = QLineEdit()
+    qtbot.addWidget(line_edit)
+    completer = FuzzyTagCompleter(["Tokens", "Treasure", "Goblins", "+1/+1 Counters", "Charge Counters"], line_edit)
+    return completer, line_edit
+
+def test_tag_completer_suggests_for_last_segment(tag_completer, qtbot):
+    completer, line_edit = tag_completer
+    assert line_edit.completer() is completer
+    qtbot.keyClicks(line_edit, "goblins, coun")
+    assert completer.model().stringList() == ["+1/+1 Counters", "Charge Counters"]
+    line_edit.clear()
+    qtbot.keyClicks(line_edit, "coun, qqq")
+    assert completer.model().stringList() == []
+
+def test_tag_completer_forgives_typos(tag_completer, qtbot):
+    completer, line_edit = tag_completer
+    qtbot.keyClicks(line_edit, "treasrue")
+    assert completer.model().stringList() == ["Treasure"]
+
+def test_tag_completer_keeps_previous_tags_on_selection(tag_completer):
+    completer, line_edit = tag_completer
+    line_edit.setText("tokens, gob")
+    completer.update_suggestions("tokens, gob")
+    assert completer.pathFromIndex(completer.model().index(0, 0)) == "tokens, Goblins"
+
+def test_tag_completer_learns_new_tags(tag_completer, qtbot):
+    completer, line_edit = tag_completer
+    assert completer.add_tags(["Goblins", "Krenko Tribal", "krenko tribal"]) == 1
+    qtbot.keyClicks(line_edit, "tribal")
+    assert completer.model().stringList() == ["Krenko Tribal"]
@@ -0,0 +1,106 @@
+import os
+import pytest
+
+from src.ui.image_cache import CardImageCache, resolve_card_image, select_image_size
+
+@pytest.fixture
+def image_cache(tmp_path, qapp):
+    return CardImageCache(directory=str(tmp_path), max_pixmaps=2)
+
+def test_resolve_card_image():
+    """Test URL and key lookup for single- and double-faced cards."""
+    single = {"id": "abc", "image_uris": {"normal": "http://x/a.jpg", "png": "http://x/a.png"}}
+    dfc = {"id": "dfc", "card_faces": [{"image_uris": {"png": "http://x/f.png"}}, {"image_uris": {"png": "http://x/b.png"}}]}
+    assert resolve_card_image(single) == (("abc", 0, "png"), "http://x/a.png")
+    assert resolve_card_image(single, size="normal") == (("abc", 0, "normal"), "http://x/a.jpg")
+    assert resolve_card_image(dfc, 1) == (("dfc", 1, "png"), "http://x/b.png")
+    assert resolve_card_image({"name": "No image"}) == (None, None)
+
+def test_resolve_card_image_falls_back_to_available_size():
+    """Test that missing sizes resolve to the next larger, then to a smaller one."""
+    card = {"id": "abc", "image_uris": {"small": "http://x/s.jpg", "large": "http://x/l.jpg"}}
+    assert resolve_card_image(card, size="normal")[0] == ("abc", 0, "large")
+    assert resolve_card_image(card, size="png")[0] == ("abc", 0, "large")
+    without_id = {"image_uris": {"png": "http://x/a.png"}}
+    assert resolve_card_image(without_id) == resolve_card_image(dict(without_id))
+
+def test_select_image_size():
+    """Test that the smallest size covering the target height is chosen."""
+    assert select_image_size(150) == "small"
+    assert select_image_size(533) == "normal"
+    assert select_image_size(900) == "large"
+    assert select_image_size(2000) == "png"
+
+def test_load_bytes_downloads_once_and_keeps_original(image_cache, mock_image_download, png_bytes, tmp_path):
+    """Test that the original file is written to the disk tier and reused."""
+    assert image_cache.load_bytes(("abc", 0, "png"), "http://x/a.png") == png_bytes
+    assert image_cache.load_bytes(("abc", 0, "png"), "http://x/a.png") == png_bytes
+    mock_image_download.assert_called_once()
+    assert (tmp_path / "abc-0-png.png").read_bytes() == png_bytes
+
+def test_pixmap_decodes_from_memory(image_cache, png_bytes):
+    """Test that pixmaps are decoded from bytes without touching the disk."""
+    pixmap = image_cache.pixmap(("abc", 0, "png"), png_bytes)
+    assert not pixmap.isNull()
+    assert image_cache.pixmap(("abc", 0, "png")) is pixmap
+    assert image_cache.load_bytes(("abc", 0, "png"), "http://x/a.png") is None # Still decoded in memory
+
+def test_pixmap_lru_eviction_falls_back_to_disk(image_cache, mock_image_download):
+    """Test that evicted pixmaps are re-decoded from the disk tier."""
+    for card_id in ("a", "b"):
+        data = image_cache.load_bytes((card_id, 0, "png"), f"http://x/{card_id}.png")
+        image_cache.pixmap((card_id, 0, "png"), data)
+    image_cache.pixmap(("a", 0, "png")) # "a" becomes the most recently used
+    data = image_cache.load_bytes(("c", 0, "png"), "http://x/c.png")
+    image_cache.pixmap(("c", 0, "png"), data)
+
+    assert image_cache.has_pixmap(("a", 0, "png"))
+    assert not image_cache.has_pixmap(("b", 0, "png"))
+    assert not image_cache.pixmap(("b", 0, "png")).isNull()
+
+def test_pixmap_unknown_key(image_cache):
+    assert image_cache.pixmap(("missing", 0, "png")) is None
+
+def test_disk_tier_is_pruned(tmp_path, mock_image_download, png_bytes, qapp):
+    """Test that the disk tier is bounded."""
+    (tmp_path / "old-0.png").write_bytes(b"x" * 1000)
+    os.utime(tmp_path / "old-0.png", (0, 0))
+    cache = CardImageCache(directory=str(tmp_path), max_disk_bytes=len(png_bytes))
+    cache.load_bytes(("new", 0, "png"), "http://x/new.png")
+    assert not (tmp_path / "old-0.png").exists()
+    assert (tmp_path / "new-0-png.png").exists()
+
+def test_disk_tier_is_pruned_during_session(tmp_path, mock_image_download, png_bytes, qapp):
+    """Test that the disk tier is pruned again whenever the session's downloads outgrow it."""
+    cache = CardImageCache(directory=str(tmp_path), max_disk_bytes=2 * len(png_bytes))
+    for number, card_id in enumerate(["a", "b", "c"]):
+        cache.load_bytes((card_id, 0, "png"), f"http://x/{card_id}.png")
+        os.utime(tmp_path / f"{card_id}-0-png.png", (number, number))
+    cache.load_bytes(("d", 0, "png"), "http://x/d.png")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["c-0-png.png", "d-0-png.png"]
+
+def test_disk_tier_read_marks_file_as_used(tmp_path, mock_image_download, png_bytes, qapp):
+    """Test that pruning keeps recently read images, whatever the file system does with atime."""
+    cache = CardImageCache(directory=str(tmp_path), max_disk_bytes=2 * len(png_bytes))
+    for number, card_id in enumerate(["a", "b"]):
+        cache.load_bytes((card_id, 0, "png"), f"http://x/{card_id}.png")
+        os.utime(tmp_path / f"{card_id}-0-png.png", (10 ** 9, number))
+    assert cache.load_bytes(("a", 0, "png"), "http://x/a.png") == png_bytes
+    cache.load_bytes(("c", 0, "png"), "http://x/c.png")
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a-0-png.png", "c-0-png.png"]
+
+def test_scaled_pixmap_cache_reuses_smooth_scales(qapp):
+    """Test that smooth scaling is done once per (image, height)."""
+    from PyQt5.QtGui import QPixmap
+    from src.ui.image_cache import ScaledPixmapCache
+    cache = ScaledPixmapCache(max_entries=2)
+    pixmap = QPixmap(20, 40)
+
+    first = cache.scaled(pixmap, 20)
+    assert first.height() == 20
+    assert cache.scaled(pixmap, 20) is first
+    assert cache.scaled(pixmap, 10) is not first
+    assert cache.scaled(pixmap, 10, smooth=False).height() == 10
+
+    cache.scaled(pixmap, 30) # Evicts height 20, the least recently used entry
+    assert cache.scaled(pixmap, 20) is not first
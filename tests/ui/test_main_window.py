@@ -4,22 +4,25 @@ from unittest.mock import MagicMock, patch
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
 
-from src.ui.main_window import MainWindow
-from src.config.constants import (
-    COMMANDER_IMG_PATH, COMMANDER_FRONT_IMG_PATH, COMMANDER_BACK_IMG_PATH,
-    PARTNER_IMG_PATH, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
-)
+from src.scraping.decklist import DeckEntry, Decklist
+from src.ui.main_window import MainWindow, SearchError
+from src.config.constants import DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH
 
 # Helper to clean up files created by tests
 @pytest.fixture(autouse=True)
 def cleanup_temp_files():
     yield
-    for f in [COMMANDER_IMG_PATH, COMMANDER_FRONT_IMG_PATH, COMMANDER_BACK_IMG_PATH,
-              PARTNER_IMG_PATH, DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH,
-              "debug_screenshot_moxfield.png", "debug_screenshot_archidekt.png"]:
+    for f in [DEBUG_SCREENSHOT_UNEXPECTED_ERROR_PATH, "debug_screenshot_moxfield.png", "debug_screenshot_archidekt.png"]:
         if os.path.exists(f):
             os.remove(f)
 
+@pytest.fixture(autouse=True)
+def driver_pool(mocker):
+    """Keeps searches from pre-starting a real browser."""
+    pool = MagicMock()
+    mocker.patch("src.ui.main_window.get_driver_pool", return_value=pool)
+    return pool
+
 @pytest.fixture
 def main_window(qtbot):
     """Fixture to create a MainWindow instance for testing."""
@@ -62,32 +65,53 @@ def test_build_scryfall_query(main_window):
     query = main_window._build_scryfall_query()
     assert "Teferi is:commander game:paper o:partner" in query # Should not duplicate
 
-def test_download_and_display_card_image_single_faced(main_window, mock_urllib_urlretrieve, mock_qpixmap, qtbot):
-    """Test image download for a single-faced card."""
-    card_data = {"name": "Test Commander", "image_uris": {"png": "http://example.com/test.png"}}
-    result = main_window._download_and_display_card_image(card_data)
-    assert result is True
-    mock_urllib_urlretrieve.assert_called_with("http://example.com/test.png", COMMANDER_IMG_PATH)
-    mock_qpixmap.assert_called_with(COMMANDER_IMG_PATH)
+def test_load_card_images_single_faced(main_window, mock_image_download, qtbot):
+    """Test image loading for a single-faced card."""
+    card_data = {"id": "abc", "name": "Test Commander", "image_uris": {"png": "http://example.com/test.png"}}
+    images = main_window._load_card_images(card_data)
+    assert [key for key, _ in images] == [("abc", 0, "png")]
+    mock_image_download.assert_called_once_with("http://example.com/test.png")
+
+    main_window._display_card_images(images)
+    assert not main_window.original_commander_pixmap.isNull()
     assert not main_window.commanderImageFlip.isVisible()
+    assert not os.path.exists("commander.png") # No temp files in the working directory anymore
 
-def test_download_and_display_card_image_double_faced(main_window, mock_urllib_urlretrieve, mock_qpixmap):
-    """Test image download for a double-faced card."""
+def test_load_card_images_double_faced(main_window, mock_image_download):
+    """Test image loading for a double-faced card."""
     card_data = {
+        "id": "dfc",
         "name": "Test DFC",
         "card_faces": [
             {"image_uris": {"png": "http://example.com/front.png"}},
             {"image_uris": {"png": "http://example.com/back.png"}}
         ]
     }
-    result = main_window._download_and_display_card_image(card_data)
-    assert result is True
-    mock_urllib_urlretrieve.call_args_list[0].args == ("http://example.com/front.png", COMMANDER_FRONT_IMG_PATH)
-    mock_urllib_urlretrieve.call_args_list[1].args == ("http://example.com/back.png", COMMANDER_BACK_IMG_PATH)
-    mock_qpixmap.assert_called_with(COMMANDER_FRONT_IMG_PATH)
+    images = main_window._load_card_images(card_data)
+    assert [key for key, _ in images] == [("dfc", 0, "png"), ("dfc", 1, "png")]
+    assert mock_image_download.call_args_list[0].args == ("http://example.com/front.png",)
+    assert mock_image_download.call_args_list[1].args == ("http://example.com/back.png",)
+
+    main_window._display_card_images(images)
+    assert main_window.original_commander_pixmap is main_window.image_cache.pixmap(("dfc", 0, "png"))
     assert main_window.commanderImageFlip.isEnabled()
 
-def test_search_success(main_window, mock_requests_get, mock_urllib_urlretrieve, mock_qpixmap, qtbot):
+def test_load_card_images_uses_disk_tier(main_window, mock_image_download):
+    """Test that a card image is only downloaded once, even after a restart."""
+    card_data = {"id": "abc", "name": "Test Commander", "image_uris": {"png": "http://example.com/test.png"}}
+    main_window._load_card_images(card_data)
+
+    restarted = MainWindow()
+    images = restarted._load_card_images(card_data)
+    assert images[0][1] is not None
+    mock_image_download.assert_called_once()
+
+def test_download_card_images_missing(main_window):
+    """Test that a card without any image is reported as a search error."""
+    with pytest.raises(SearchError, match="No image found for Imageless"):
+        main_window._load_card_images({"name": "Imageless"})
+
+def test_search_success(main_window, mock_requests_get, mock_image_download, qtbot):
     """Test a successful commander search."""
     mock_requests_get.json.return_value = {
         'data': [{'name': 'Test Commander', 'image_uris': {'png': 'http://example.com/test.png'}}]
@@ -97,7 +121,7 @@ def test_search_success(main_window, mock_requests_get, mock_urllib_urlretrieve,
     qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=500)
 
     assert main_window.data['commander']['name'] == 'Test Commander'
-    mock_urllib_urlretrieve.assert_called_once()
+    mock_image_download.assert_called_once()
     assert main_window.errorLabel.text() == "Commander found."
 
 def test_search_no_commander_found(main_window, mock_requests_get, qtbot):
@@ -110,17 +134,17 @@ def test_search_no_commander_found(main_window, mock_requests_get, qtbot):
     assert main_window.errorLabel.text() == "Commander not found."
     assert "red" in main_window.errorLabel.styleSheet()
 
-def test_search_random_success(main_window, mock_requests_get, mock_urllib_urlretrieve, mock_qpixmap, qtbot):
+def test_search_random_success(main_window, mock_requests_get, mock_image_download, qtbot):
     """Test a successful random commander search."""
     mock_requests_get.json.return_value = {'name': 'Random Commander', 'image_uris': {'png': 'http://example.com/random.png'}}
     main_window.search_random()
     qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=500)
 
     assert main_window.data['commander']['name'] == 'Random Commander'
-    mock_urllib_urlretrieve.assert_called_once()
+    mock_image_download.assert_called_once()
     assert main_window.errorLabel.text() == "Commander found."
 
-def test_handle_partner_search_success(main_window, mocker, mock_urllib_urlretrieve, mock_qpixmap, qtbot):
+def test_handle_partner_search_success(main_window, mocker, mock_image_download, qtbot):
     """Test successful partner search."""
     commander_data = {
         "name": "Kydele, Chosen of Kruphix",
@@ -133,12 +157,11 @@ def test_handle_partner_search_success(main_window, mocker, mock_urllib_urlretri
     }
 
     # Mock EDHRec page for partner list
-    mock_get = mocker.patch("src.ui.main_window.requests.get")
+    mock_get = mocker.patch("network.http_client.get")
     mock_get.side_effect = [
         MagicMock(json=lambda: {'data': [commander_data]}, raise_for_status=lambda: None), # 1. The search() method's own Scryfall call
-        # 2. _handle_partner_search's call to the EDHRec link to get the slug by following the redirect
-        MagicMock(url="http://edhrec.com/commanders/kydele-chosen-of-kruphix", raise_for_status=lambda: None), # This mock is for the redirect
-        # 3. The actual call to the partners page, which we mock to return the partner name
+        # 2. The EDHRec slug is computed from the card name, so the next call is
+        # the actual call to the partners page, which we mock to return the partner name
         MagicMock(text='<html><body><div class="cardlist"><span><span class="Card_name">Ravos, Soultender</span></span></div></body></html>', raise_for_status=lambda: None), # This mock is for the partners page
         MagicMock(json=lambda: {'data': [partner_data]}, raise_for_status=lambda: None), # Scryfall for partner
     ]
@@ -151,10 +174,10 @@ def test_handle_partner_search_success(main_window, mocker, mock_urllib_urlretri
 
     assert main_window.data['partner']['name'] == 'Ravos, Soultender'
     # Check that both images were downloaded
-    assert mock_urllib_urlretrieve.call_count == 2
+    assert mock_image_download.call_count == 2
     assert main_window.errorLabel.text().startswith("Most popular partner: Ravos, Soultender.")
 
-def test_flip_image(main_window, qtbot, mock_urllib_urlretrieve, mock_qpixmap):
+def test_flip_image(main_window, qtbot, mock_image_download):
     """Test the flip image functionality."""
     card_data = {
         "name": "Test DFC",
@@ -163,7 +186,8 @@ def test_flip_image(main_window, qtbot, mock_urllib_urlretrieve, mock_qpixmap):
             {"image_uris": {"png": "http://example.com/back.png"}}
         ]
     }
-    main_window._download_and_display_card_image(card_data) # Setup DFC
+    main_window._display_card_images(main_window._load_card_images(card_data)) # Setup DFC
+    front, back = (main_window.image_cache.pixmap(key) for key in main_window.commander_face_keys)
     qtbot.wait(10)
     
     assert main_window.times_clicked_flip == 0
@@ -171,7 +195,284 @@ def test_flip_image(main_window, qtbot, mock_urllib_urlretrieve, mock_qpixmap):
     main_window.flip_image()
     qtbot.wait(10)
     assert main_window.times_clicked_flip == 1
+    assert main_window.original_commander_pixmap is back
 
     main_window.flip_image()
     qtbot.wait(10)
     assert main_window.times_clicked_flip == 2
+    assert main_window.original_commander_pixmap is front
+    assert mock_image_download.call_count == 2 # Flipping never downloads or reads from disk again
+
+def test_search_loads_small_image_first_then_png(main_window, mock_requests_get, mock_image_download, qtbot):
+    """Test that the smallest fitting image is shown first and the PNG is swapped in afterwards."""
+    mock_requests_get.json.return_value = {'data': [{
+        'id': 'prog', 'name': 'Progressive',
+        'image_uris': {'small': 'http://example.com/s.jpg', 'normal': 'http://example.com/n.jpg',
+                       'png': 'http://example.com/p.png'}
+    }]}
+    main_window.resize(800, 800)
+    main_window.searchText.setText("Progressive")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.commander_face_keys == [("prog", 0, "png")], timeout=1000)
+
+    downloaded = [call.args[0] for call in mock_image_download.call_args_list]
+    assert downloaded == ['http://example.com/n.jpg', 'http://example.com/p.png']
+    assert main_window.original_commander_pixmap is main_window.image_cache.pixmap(("prog", 0, "png"))
+    assert main_window._pending_image_size is None
+
+def test_resize_scales_fast_then_smooth_once(main_window, mocker, qtbot):
+    """Test that resize ticks use fast scaling and a single smooth pass follows once resizing settles."""
+    from PyQt5.QtGui import QPixmap
+    main_window.original_commander_pixmap = QPixmap(20, 40)
+    scaled = mocker.spy(main_window.scaled_cache, "scaled")
+    main_window.show()
+
+    for height in (820, 840, 860):
+        main_window.resize(800, height)
+        qtbot.wait(5)
+    assert scaled.call_count >= 1
+    assert all(call.args[2] is False for call in scaled.call_args_list)
+
+    qtbot.waitUntil(lambda: any(call.args[2] is True for call in scaled.call_args_list), timeout=1000)
+    assert sum(call.args[2] is True for call in scaled.call_args_list) == 1
+
+def test_search_does_not_block_gui_thread(main_window, mocker, mock_image_download, qtbot):
+    """Test that the Scryfall request runs on a pool thread, not the GUI thread."""
+    from PyQt5.QtCore import QThread
+    gui_thread = QThread.currentThread()
+    request_threads = []
+
+    def fake_get(*args, **kwargs):
+        request_threads.append(QThread.currentThread())
+        return MagicMock(json=lambda: {'data': [{'name': 'Threaded', 'image_uris': {'png': 'http://example.com/t.png'}}]},
+                         raise_for_status=lambda: None)
+
+    mocker.patch("network.http_client.get", side_effect=fake_get)
+    main_window.searchText.setText("Threaded")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=1000)
+
+    assert request_threads and request_threads[0] is not gui_thread
+
+def test_search_drops_superseded_results(main_window, mocker, mock_image_download, qtbot):
+    """Test that a slower, older search cannot overwrite the result of a newer one."""
+    import threading
+    release_first = threading.Event()
+
+    def fake_get(url, params=None, **kwargs):
+        name = params["q"].split()[0]
+        if name == "Slow":
+            release_first.wait(2)
+        return MagicMock(json=lambda: {'data': [{'name': name, 'image_uris': {'png': 'http://example.com/x.png'}}]},
+                         raise_for_status=lambda: None)
+
+    mocker.patch("network.http_client.get", side_effect=fake_get)
+    main_window.searchText.setText("Slow")
+    main_window.search()
+    main_window.searchText.setText("Fast")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=1000)
+    release_first.set()
+    main_window.request_pipeline.wait_for_done(2000)
+    qtbot.wait(50)
+
+    assert main_window.data['commander']['name'] == "Fast"
+
+def test_fetch_top_decklists_scrapes_concurrently(main_window, mocker, qtbot):
+    """Test that the top N matching decks are scraped in parallel and streamed into the list."""
+    import threading
+    deck_table = [
+        {"urlhash": f"hash{i}", "price": 50 + i, "tags": ["tokens"], "salt": 20.0} for i in range(4)
+    ]
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=deck_table)
+    # Every scrape waits until three of them run at the same time, so a serial pipeline would time out.
+    barrier = threading.Barrier(3, timeout=2)
+
+    def fake_scrape(deck_page, progress):
+        barrier.wait()
+        return Decklist([DeckEntry(1, "Sol Ring", "CMM", "410")], deck_page)
+
+    mocker.patch.object(MainWindow, "_fetch_and_scrape_deck", side_effect=fake_scrape)
+    copy = mocker.patch("pyperclip.copy")
+
+    main_window.data['commander'] = {"name": "Test"}
+    main_window.deckCount.setValue(3)
+    main_window.get_TopDecks.click()
+
+    qtbot.waitUntil(lambda: main_window.errorLabel.text().startswith("Fetched"), timeout=3000)
+    assert main_window.errorLabel.text().startswith("Fetched 3 of 3 decklists")
+    assert main_window.deckList.count() == 3
+    assert all(main_window.deckList.item(row).text().endswith("ready") for row in range(3))
+
+    main_window.copy_deck_from_list(main_window.deckList.item(1))
+    copy.assert_called_once_with("1 Sol Ring (CMM) 410")
+
+    main_window.exportFormat.setCurrentIndex(main_window.exportFormat.findData("mtgo"))
+    main_window.copy_deck_from_list(main_window.deckList.item(1))
+    copy.assert_called_with("1 Sol Ring")
+
+def test_fetch_top_decklists_marks_failed_decks(main_window, mocker, qtbot):
+    deck_table = [{"urlhash": "ok", "price": 50, "tags": [], "salt": 20.0},
+                  {"urlhash": "bad", "price": 60, "tags": [], "salt": 20.0}]
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=deck_table)
+
+    def fake_scrape(deck_page, progress):
+        if deck_page.endswith("bad"):
+            raise SearchError("Unsupported site for scraping: https://tappedout.net")
+        return Decklist([DeckEntry(1, "Sol Ring")])
+
+    mocker.patch.object(MainWindow, "_fetch_and_scrape_deck", side_effect=fake_scrape)
+    main_window.data['commander'] = {"name": "Test"}
+    main_window.fetch_top_decklists()
+
+    qtbot.waitUntil(lambda: main_window.errorLabel.text().startswith("Fetched"), timeout=3000)
+    assert main_window.errorLabel.text().startswith("Fetched 1 of 2 decklists")
+    assert "failed: Unsupported site" in main_window.deckList.item(1).text()
+
+def test_fetch_top_decklists_requires_commander(main_window):
+    main_window.fetch_top_decklists()
+    assert main_window.errorLabel.text() == "Please search for a commander first."
+
+COMMANDER_SEARCH_RESULT = {'data': [{'id': 'c1', 'name': 'Prefetched', 'image_uris': {'png': 'http://example.com/p.png'}}]}
+
+def test_deck_table_prefetched_after_search(main_window, mock_requests_get, mock_image_download, mocker, qtbot):
+    """Test that the deck table is fetched right after a search and reused by "Get Decklist"."""
+    deck_table = [{"urlhash": "h1", "price": 500, "tags": [], "salt": 20.0}]
+    fetch = mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=deck_table)
+    mock_requests_get.json.return_value = COMMANDER_SEARCH_RESULT
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window._deck_prefetch is not None and main_window._deck_prefetch.done, timeout=1000)
+    fetch.assert_called_once()
+
+    main_window.price_limit.setText("100")
+    main_window.fetch_first_decklist_in_budget()
+    assert main_window.errorLabel.text() == "No decks found matching your filters."
+    assert main_window.get_Decklist.isEnabled()
+    fetch.assert_called_once()
+
+def test_get_decklist_waits_for_running_prefetch(main_window, mock_requests_get, mock_image_download, mocker, qtbot):
+    """Test that a click during the prefetch waits for it instead of fetching the table again."""
+    import threading
+    release = threading.Event()
+
+    def slow_fetch(commander, partner, progress):
+        release.wait(2)
+        return [{"urlhash": "h1", "price": 500, "tags": [], "salt": 20.0}]
+
+    fetch = mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", side_effect=slow_fetch)
+    mock_requests_get.json.return_value = COMMANDER_SEARCH_RESULT
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window._deck_prefetch is not None, timeout=1000)
+
+    main_window.price_limit.setText("100")
+    main_window.fetch_first_decklist_in_budget()
+    assert main_window.errorLabel.text() == "Fetching decks from EDHRec..."
+    release.set()
+
+    qtbot.waitUntil(lambda: main_window.errorLabel.text() == "No decks found matching your filters.", timeout=1000)
+    assert fetch.call_count == 1
+
+def test_new_search_cancels_prefetch(main_window, mock_requests_get, mock_image_download, mocker, qtbot):
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=[])
+    mock_requests_get.json.return_value = COMMANDER_SEARCH_RESULT
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window._deck_prefetch is not None, timeout=1000)
+    prefetch = main_window._deck_prefetch
+    qtbot.waitUntil(lambda: prefetch.done, timeout=1000)
+    cancel = mocker.spy(main_window.request_pipeline, "cancel")
+
+    main_window.search()
+    assert main_window._deck_prefetch is None
+    # The prefetch is done already, so there is nothing left to cancel
+    cancel.assert_called_once_with(prefetch.worker)
+    assert cancel.spy_return is False
+    qtbot.waitUntil(lambda: main_window._deck_prefetch is not None, timeout=1000)
+    main_window.request_pipeline.wait_for_done(2000)
+
+def test_prefetch_for_other_commander_is_not_used(main_window, mocker, qtbot):
+    """Test that a prefetched table is only used for the commander it was fetched for."""
+    from src.ui.main_window import DeckTablePrefetch
+    fetch = mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=[])
+    main_window._deck_prefetch = DeckTablePrefetch(("other", None))
+    main_window._deck_prefetch.table = [{"urlhash": "h1", "price": 1, "tags": [], "salt": 1.0}]
+    main_window.data['commander'] = {"id": "c1", "name": "Test"}
+
+    main_window.fetch_first_decklist_in_budget()
+    qtbot.waitUntil(lambda: fetch.call_count == 1, timeout=1000)
+
+def test_search_answered_from_offline_index(main_window, mock_bulk_download, mock_image_download, mocker, qtbot):
+    """Test that with the offline index enabled, plain name searches never reach the Scryfall API."""
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=[])
+    main_window.useLocalIndex.setChecked(True)
+    qtbot.waitUntil(lambda: main_window.errorLabel.text().startswith("Offline card index ready"), timeout=2000)
+    assert main_window.errorLabel.text() == "Offline card index ready (6 commanders)."
+
+    api_calls = mock_bulk_download["get"].call_count
+    main_window.searchText.setText("krenko")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=1000)
+
+    assert main_window.data['commander']['name'] == "Krenko, Mob Boss"
+    assert mock_bulk_download["get"].call_count == api_calls
+
+def test_unsupported_query_falls_back_to_api(main_window, mock_bulk_download, mock_image_download, mocker, qtbot):
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=[])
+    main_window.useLocalIndex.setChecked(True)
+    qtbot.waitUntil(lambda: main_window.errorLabel.text().startswith("Offline card index ready"), timeout=2000)
+
+    mock_bulk_download["get"].side_effect = None
+    mock_bulk_download["get"].return_value = MagicMock(
+        json=lambda: {'data': [{'name': 'From API', 'image_uris': {'png': 'http://example.com/api.png'}}]},
+        raise_for_status=lambda: None)
+    main_window.searchText.setText("pow>=3")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=1000)
+    assert main_window.data['commander']['name'] == "From API"
+
+def test_name_completion_uses_offline_index(main_window, mock_bulk_download, qtbot):
+    """Test that commander names are completed from the offline index once it is built."""
+    assert main_window.nameCompleter._source is None
+    main_window.useLocalIndex.setChecked(True)
+    qtbot.waitUntil(lambda: main_window.errorLabel.text().startswith("Offline card index ready"), timeout=2000)
+    assert main_window.nameCompleter._source is not None
+
+    main_window.nameCompleter.update_suggestions("kr")
+    qtbot.waitUntil(lambda: main_window.nameCompleter.name_index is not None, timeout=1000)
+    main_window.nameCompleter.update_suggestions("kr")
+    assert main_window.nameCompleter.model().stringList() == ["Krenko, Mob Boss", "Kraum, Ludevic's Opus"]
+
+    main_window.useLocalIndex.setChecked(False)
+    assert main_window.nameCompleter._source is None
+    assert main_window.nameCompleter.name_index is None
+
+def test_tags_of_fetched_decks_are_completed(main_window, mocker, qtbot):
+    """Test that tags found in a fetched deck table become available for tag completion."""
+    deck_table = [{"urlhash": "h1", "price": 50, "tags": ["goblins", "Krenko Tribal"], "salt": 20.0}]
+    mocker.patch.object(MainWindow, "_fetch_edhrec_deck_table", return_value=deck_table)
+    mocker.patch.object(MainWindow, "start_decklist_scraping")
+    main_window.data['commander'] = {"id": "c1", "name": "Krenko, Mob Boss"}
+    assert "krenko tribal" not in main_window.tagCompleter.tag_index
+
+    main_window.fetch_first_decklist_in_budget()
+    qtbot.waitUntil(lambda: "krenko tribal" in main_window.tagCompleter.tag_index, timeout=1000)
+    main_window.tagCompleter.update_suggestions("tribal")
+    assert main_window.tagCompleter.model().stringList()[0] == "Krenko Tribal"
+
+@pytest.mark.parametrize("bot_check, prewarmed", [(False, False), (True, True)])
+def test_browser_prewarmed_after_bot_check(main_window, mock_requests_get, mock_image_download, driver_pool,
+                                           mocker, qtbot, bot_check, prewarmed):
+    """A browser is only pre-started once a site required one in this session."""
+    mocker.patch("src.ui.main_window.bot_challenge_seen", return_value=bot_check)
+    mock_requests_get.json.return_value = {
+        'data': [{'name': 'Test Commander', 'image_uris': {'png': 'http://example.com/test.png'}}]
+    }
+    main_window.searchText.setText("Test Commander")
+    main_window.search()
+    qtbot.waitUntil(lambda: main_window.data.get('commander') is not None, timeout=1000)
+    assert driver_pool.prewarm_in_background.called == prewarmed
+
+def test_browser_prewarm_runs_once_at_a_time(main_window, driver_pool):
+    driver_pool.prewarm_in_background.return_value.is_alive.return_value = True
+    main_window._prewarm_browser()
+    main_window._prewarm_browser()  # Ignored while the first one runs
+    driver_pool.prewarm_in_background.assert_called_once()
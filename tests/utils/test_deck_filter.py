@@ -1,5 +1,5 @@
 import pytest
-from src.utils.deck_filter import filter_decks
+from src.utils.deck_filter import filter_decks, find_matching_decks, compile_filter, DeckTable
 
 @pytest.fixture
 def sample_decks():
@@ -86,4 +86,95 @@ def test_filter_decks_all_parameters(sample_decks):
     assert filter_decks(sample_decks, "50-80", "budget,control", "<45") == sample_decks[0]
     assert filter_decks(sample_decks, "<200", "aggro", "<30") == sample_decks[1]
     assert filter_decks(sample_decks, "<300", "voltron", "<30") == sample_decks[4]
-    assert filter_decks(sample_decks, "<300", "atogatog", "<40") is None
\ No newline at end of file
+    assert filter_decks(sample_decks, "<300", "atogatog", "<40") is None
+
+def test_find_matching_decks_keeps_table_order(sample_decks):
+    assert find_matching_decks(sample_decks, "<100", "budget", "") == [sample_decks[0], sample_decks[2], sample_decks[4]]
+
+def test_find_matching_decks_limit(sample_decks):
+    assert find_matching_decks(sample_decks, "<100", "", "", limit=2) == [sample_decks[0], sample_decks[2]]
+    assert find_matching_decks(sample_decks, "", "", "", limit=10) == sample_decks
+    assert find_matching_decks(sample_decks, ">300", "", "", limit=3) == []
+
+def test_compiled_filter_reused_across_tables(sample_decks):
+    """Test that a filter compiled once can be evaluated against several tables."""
+    deck_filter = compile_filter("<100", "budget", "<40")
+    assert deck_filter.all(DeckTable(sample_decks)) == [sample_decks[0], sample_decks[2], sample_decks[4]]
+    assert deck_filter.first(DeckTable(sample_decks[1:])) == sample_decks[2]
+    assert deck_filter.first(DeckTable([])) is None
+
+def test_first_match_stops_scanning(sample_decks):
+    """Test that the first-match path does not look at the decks after the first hit."""
+    class RecordingColumn(list):
+        def __getitem__(self, row):
+            seen.append(row)
+            return list.__getitem__(self, row)
+
+    seen = []
+    table = DeckTable(sample_decks)
+    table.prices = RecordingColumn(table.prices)
+    assert filter_decks(table, "<100", "", "") == sample_decks[0]
+    assert seen == [0]
+
+def test_iter_rows_matches_column_passes(sample_decks):
+    table = DeckTable(sample_decks)
+    for queries in [("<100", "budget", "<45"), ("", "aggro,control", ""), (">30", "", ">20"), ("", "", "")]:
+        deck_filter = compile_filter(*queries)
+        assert list(deck_filter.iter_rows(table)) == deck_filter.matching_rows(table)
+
+def test_compile_filter_rejects_malformed_queries():
+    with pytest.raises(ValueError):
+        compile_filter("cheap", "", "")
+    with pytest.raises(ValueError):
+        compile_filter("", "", "10-20-30")
+
+def test_deck_table_defaults_and_lowercases():
+    """Test that missing prices and salt scores get their defaults and tags are matched case-insensitively."""
+    table = DeckTable([{"name": "No data", "tags": ["cEDH"]}, {"name": "Cheap", "price": 10, "salt": None}])
+    assert list(table.prices) == [float('inf'), 10.0]
+    assert list(table.salts) == [30.0, 30.0]
+    assert filter_decks(table, "", "cedh", "") == table.decks[0]
+    assert filter_decks(table, "50", "", "<30") == table.decks[1]
+
+@pytest.fixture
+def dated_decks(sample_decks):
+    dates = ["2024-01-05", "2024-03-01", "2023-12-24", "2024-02-10", "2022-07-01"]
+    return [dict(deck, savedate=date) for deck, date in zip(sample_decks, dates)]
+
+@pytest.mark.parametrize("sort_order, expected", [
+    ("edhrec", ["Deck A", "Deck B", "Deck C"]),
+    ("cheapest", ["Deck E", "Deck A", "Deck C"]),
+    ("lowest_salt", ["Deck E", "Deck B", "Deck C"]),
+    ("most_recent", ["Deck B", "Deck D", "Deck A"]),
+])
+def test_find_matching_decks_ranked(dated_decks, sort_order, expected):
+    matches = find_matching_decks(dated_decks, "", "", "", limit=3, sort_order=sort_order)
+    assert [deck["name"] for deck in matches] == expected
+
+def test_rank_closest_to_ceiling(sample_decks):
+    """Test that the decks using most of the budget come first and decks without a price last."""
+    decks = sample_decks + [{"name": "No price", "tags": [], "salt": 10.0}]
+    matches = find_matching_decks(decks, "100", "", "", limit=2, sort_order="closest_to_ceiling")
+    assert [deck["name"] for deck in matches] == ["Deck C", "Deck A"]
+    matches = find_matching_decks(decks, "", "", "", sort_order="closest_to_ceiling")
+    assert [deck["name"] for deck in matches][-1] == "No price"
+
+def test_rank_most_tag_overlap():
+    """Test that decks matching more tags of the query rank first, ties in table order."""
+    decks = [
+        {"name": "One", "tags": ["Tokens"]},
+        {"name": "Three", "tags": ["Tokens", "+1/+1 Counters", "Charge Counters"]},
+        {"name": "Two", "tags": ["Tokens", "Charge Counters"]},
+        {"name": "Also one", "tags": ["Tokens", "Voltron"]},
+    ]
+    matches = find_matching_decks(decks, "", "tokens", "", sort_order="most_tag_overlap")
+    assert [deck["name"] for deck in matches] == ["One", "Three", "Two", "Also one"]
+    matches = find_matching_decks(decks, "", "tokens, counters", "", sort_order="most_tag_overlap")
+    assert [deck["name"] for deck in matches] == ["Three", "Two"]
+
+def test_filter_decks_sort_order(sample_decks):
+    assert filter_decks(sample_decks, "<100", "", "", sort_order="cheapest") == sample_decks[4]
+
+def test_unknown_sort_order(sample_decks):
+    with pytest.raises(ValueError):
+        find_matching_decks(sample_decks, "", "", "", limit=1, sort_order="alphabetical")
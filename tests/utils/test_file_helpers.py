@@ -39,3 +39,24 @@ def test_resource_path_pyinstaller_mode(mocker):
     mocker.patch('sys._MEIPASS', mock_meipass, create=True)
     expected_path = os.path.join(mock_meipass, "assets", "flash-cards.png")
     assert resource_path(os.path.join("assets", "flash-cards.png")) == expected_path
+
+def test_user_cache_dir_env_override(monkeypatch, tmp_path):
+    """
+    Test that the cache directory can be redirected with an environment variable
+    and that subdirectories are created on demand.
+    """
+    from src.config.constants import CACHE_DIR_ENV_VAR
+    from src.utils.file_helpers import user_cache_dir
+    monkeypatch.setenv(CACHE_DIR_ENV_VAR, str(tmp_path))
+    path = user_cache_dir("http")
+    assert path == os.path.join(str(tmp_path), "http")
+    assert os.path.isdir(path)
+
+def test_user_cache_dir_xdg(monkeypatch, tmp_path, mocker):
+    """Test the Linux default location below XDG_CACHE_HOME."""
+    from src.config.constants import CACHE_DIR_ENV_VAR, APP_NAME
+    from src.utils.file_helpers import user_cache_dir
+    monkeypatch.delenv(CACHE_DIR_ENV_VAR, raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    mocker.patch.object(sys, 'platform', "linux")
+    assert user_cache_dir() == os.path.join(str(tmp_path), APP_NAME)
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from src.utils.next_data import find_next_data, load_next_data, json_value_at, next_data_value
+
+NEXT_DATA = {
+    "buildId": "abc",
+    "props": {
+        "pageProps": {
+            "header": "Decks with \"quotes\" and } braces ]",
+            "stats": [1, 2.5, -3e2, True, False, None, {"nested": ["a", {"b": "}"}]}],
+            "data": {"table": [{"urlhash": "h1", "price": 50}, {"urlhash": "h2", "price": 70}], "url": "https://moxfield.com/decks/x"},
+        }
+    }
+}
+PAGE = (
+    '<html><head><script src="app.js"></script></head><body><div id="root"></div>'
+    f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(NEXT_DATA, indent=1)}</script>'
+    '<script>window.after = 1;</script></body></html>'
+)
+
+def test_find_next_data_str_and_bytes():
+    """Test that the JSON is sliced out of str and of undecoded bytes alike."""
+    assert json.loads(find_next_data(PAGE)) == NEXT_DATA
+    assert json.loads(find_next_data(PAGE.encode("utf-8"))) == NEXT_DATA
+
+def test_find_next_data_missing():
+    assert find_next_data("<html><script>var x = 1;</script></html>") is None
+    assert load_next_data(b"<html></html>") is None
+
+def test_load_next_data():
+    assert load_next_data(PAGE) == NEXT_DATA
+
+@pytest.mark.parametrize("path, expected", [
+    (("props", "pageProps", "data", "table"), NEXT_DATA["props"]["pageProps"]["data"]["table"]),
+    (("props", "pageProps", "data", "url"), "https://moxfield.com/decks/x"),
+    (("props", "pageProps", "data", "table", 1, "urlhash"), "h2"),
+    (("props", "pageProps", "stats", 6, "nested", 1), {"b": "}"}),
+    (("buildId",), "abc"),
+])
+def test_json_value_at(path, expected):
+    text = find_next_data(PAGE)
+    assert json_value_at(text, path) == expected
+
+@pytest.mark.parametrize("path", [
+    ("props", "missing"),
+    ("props", "pageProps", "data", "table", 5),
+    ("props", "pageProps", "header", "x"),
+    ("buildId", 0),
+])
+def test_json_value_at_missing_path(path):
+    assert json_value_at(find_next_data(PAGE), path, "default") == "default"
+
+def test_json_value_at_escaped_key():
+    assert json_value_at('{"a\\"b": 1, "c\\u0064": 2}', ("cd",)) == 2
+
+def test_next_data_value():
+    assert next_data_value(PAGE.encode("utf-8"), ("props", "pageProps", "data", "url")) == "https://moxfield.com/decks/x"
+    assert next_data_value("<html></html>", ("props",), []) == []
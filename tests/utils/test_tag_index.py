@@ -0,0 +1,32 @@
+from src.utils.tag_index import TagIndex
+
+
+def test_known_tags_get_distinct_bits():
+    index = TagIndex(["Tokens", "Counters", "Budget"])
+    assert len(index) == 3
+    assert {index.add("tokens"), index.add("Counters"), index.add("BUDGET")} == {1, 2, 4}
+
+def test_unknown_tags_are_added():
+    index = TagIndex(["Tokens"])
+    mask = index.mask(["Tokens", "Goblins"])
+    assert "goblins" in index
+    assert index.tags(mask) == ["tokens", "goblins"]
+
+def test_fragment_mask_matches_substrings():
+    """Test that a fragment selects every tag containing it."""
+    index = TagIndex(["+1/+1 Counters", "Charge Counters", "Tokens"])
+    assert index.tags(index.fragment_mask("counter")) == ["+1/+1 counters", "charge counters"]
+    assert index.fragment_mask("Tok") == index.add("tokens")
+    assert index.fragment_mask("atog") == 0
+
+def test_fragment_mask_updated_for_new_tags():
+    """Test that cached fragment masks include tags added after they were computed."""
+    index = TagIndex(["Tokens"])
+    assert index.tags(index.fragment_mask("en")) == ["tokens"]
+    index.add("Enchantress")
+    assert index.tags(index.fragment_mask("en")) == ["tokens", "enchantress"]
+
+def test_default_index_contains_edhrec_tags():
+    index = TagIndex()
+    assert "cedh" in index
+    assert index.fragment_mask("voltron")
@@ -0,0 +1,53 @@
+import pytest
+
+from src.config.constants import EDHREC_TAGS
+from src.utils.trigram_index import TrigramIndex, trigrams
+
+
+@pytest.fixture
+def index():
+    return TrigramIndex(EDHREC_TAGS)
+
+def test_trigrams_mark_word_starts():
+    assert trigrams("elf") == {"  e", " el", "elf", "lf "}
+    assert trigrams("elf", partial=True) == {"  e", " el", "elf"}
+    assert trigrams("card dr", partial=True) == {"  c", " ca", "car", "ard", "rd ", "  d", " dr"}
+
+@pytest.mark.parametrize("query, expected", [
+    ("goblins", ["Goblins"]),
+    ("GOB", ["Goblins"]),
+    ("draw", ["Card Draw", "Impulse Draw"]),
+    ("card d", ["Card Draw"]),
+    ("+1/+1", ["+1/+1 Counters"]),
+    ("goblns", ["Goblins"]),
+    ("zombeis", ["Zombies"]),
+    ("qqqq", []),
+    ("", []),
+])
+def test_search(index, query, expected):
+    assert index.search(query, limit=len(expected) or 1) == expected
+
+def test_ranking(index):
+    """Test that prefix matches beat word-start matches, which beat matches inside a word."""
+    results = index.search("count")
+    assert results[0] == "Counters"
+    assert results.index("Counters") < results.index("+1/+1 Counters")
+    assert index.search("ounter")[:2] == ["Counters", "Oil Counters"]
+
+def test_short_queries_match_word_starts(index):
+    results = index.search("el")
+    assert results[:3] == ["Elves", "Elders", "Eldrazi"]
+    assert all(" el" in f" {tag.lower()}" for tag in results)
+
+def test_limit(index):
+    assert len(index.search("s", limit=5)) == 5
+
+def test_add_dynamic_terms(index):
+    size = len(index)
+    assert index.add("Kenrith Toolbox")
+    assert not index.add("goblins")
+    assert not index.add("  ")
+    assert len(index) == size + 1
+    assert "kenrith toolbox" in index
+    assert index.search("kenr") == ["Kenrith Toolbox"]
+    assert index.search("tool")[:2] == ["Toolbox", "Kenrith Toolbox"]